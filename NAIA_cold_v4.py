@@ -29,6 +29,9 @@ from core.search_result_model import SearchResultModel
 from core.autocomplete_manager import AutoCompleteManager
 from core.tag_data_manager import TagDataManager
 from core.wildcard_manager import WildcardManager
+from core.wildcard_watcher import WildcardWatcher
+from core.kr_tag_lookup import KRTagLookup
+from core.startup_tracer import get_startup_tracer
 from core.prompt_generation_controller import PromptGenerationController
 from utils.load_generation_params import GenerationParamsManager
 from ui.img2img_popup import Img2ImgPopup
@@ -288,16 +291,22 @@ class ModernMainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("NAIA v2.0.0 Dev")
+        # 시작 단계별 소요 시간 기록 (save/startup_trace.json)
+        self.startup_tracer = get_startup_tracer()
+        tracer = self.startup_tracer
         
-        # 스케일링 매니저 초기화 (UI 생성 전에 먼저 초기화)
-        self.scaling_manager = get_scaling_manager()
-        
-        self.set_initial_window_size()
-        self.kr_tags_df = self._load_kr_tags()
-        self.params_expanded = False
-        
-        # 동적 테마 적용
-        self.apply_dynamic_styles()
+        with tracer.phase("window: scaling & styles"):
+            # 스케일링 매니저 초기화 (UI 생성 전에 먼저 초기화)
+            self.scaling_manager = get_scaling_manager()
+            
+            self.set_initial_window_size()
+            # KR 태그 정보는 백그라운드에서 지연 로드 (우클릭 메뉴/자동완성 툴팁에서 공유)
+            self.kr_tag_lookup = KRTagLookup()
+            self.kr_tag_lookup.start_background_load()
+            self.params_expanded = False
+            
+            # 동적 테마 적용
+            self.apply_dynamic_styles()
         
         # 새로 추가: 파라미터 확장 상태 추적
         self.params_expanded = False
@@ -311,15 +320,23 @@ class ModernMainWindow(QMainWindow):
         self.last_image_generation_time = 0
 
         #  검색 결과를 저장할 변수 및 컨트롤러 초기화
-        self.search_results = SearchResultModel()
-        self.search_controller = SearchController()
+        with tracer.phase("search model & controller"):
+            self.search_results = SearchResultModel()
+            self.search_controller = SearchController()
         # 검색 컨트롤러 시그널 연결은 MainController에서 처리됩니다
 
         self.image_window = None 
         # [신규] 데이터 및 와일드카드 관리자 초기화
-        self.tag_data_manager = TagDataManager()
-        self.wildcard_manager = WildcardManager()
-        self.app_context = AppContext(self, self.wildcard_manager, self.tag_data_manager)
+        with tracer.phase("data managers & AppContext"):
+            with tracer.phase("TagDataManager"):
+                self.tag_data_manager = TagDataManager()
+            with tracer.phase("WildcardManager"):
+                self.wildcard_manager = WildcardManager()
+            with tracer.phase("AppContext"):
+                self.app_context = AppContext(self, self.wildcard_manager, self.tag_data_manager, self.kr_tag_lookup)
+            # 와일드카드 파일 변경 시 바뀐 파일만 백그라운드에서 다시 읽음
+            self.wildcard_watcher = WildcardWatcher(self.wildcard_manager, self)
+            self.app_context.wildcard_watcher = self.wildcard_watcher
 
         self.img2img_panel = Img2ImgPanel(self)
 
@@ -327,37 +344,39 @@ class ModernMainWindow(QMainWindow):
         self.controller = MainController(self)
         self.scaling_manager.scaling_changed.connect(self.controller.on_scaling_changed)
 
-        self.init_ui()
+        with tracer.phase("init_ui"):
+            self.init_ui()
         
-        # MiddleSectionController가 모듈 인스턴스들을 가지고 있음
-        self.middle_section_controller.initialize_modules_with_context(self.app_context)
-        self.generation_controller = GenerationController(
-            self.app_context,
-            self.middle_section_controller.module_instances
-        )
-        self.app_context.middle_section_controller = self.middle_section_controller
+        with tracer.phase("controllers"):
+            # MiddleSectionController가 모듈 인스턴스들을 가지고 있음
+            self.middle_section_controller.initialize_modules_with_context(self.app_context)
+            self.generation_controller = GenerationController(
+                self.app_context,
+                self.middle_section_controller.module_instances
+            )
+            self.app_context.middle_section_controller = self.middle_section_controller
 
-        self.prompt_gen_controller = PromptGenerationController(self.app_context)
-        
-        # 신호 연결 (UI 초기화 후)
-        self.controller.connect_signals()
-        # 🆕 메인 생성 파라미터 모드 관리자 추가
-        self.generation_params_manager = GenerationParamsManager(self)
-        
-        # AppContext에 모드 변경 이벤트 구독
-        self.app_context.subscribe_mode_swap(self.generation_params_manager.on_mode_changed)
+            self.prompt_gen_controller = PromptGenerationController(self.app_context)
+            
+            # 신호 연결 (UI 초기화 후)
+            self.controller.connect_signals()
         
-        # 초기 설정 로드 (NAI 모드)
-        self.generation_params_manager.load_mode_settings("NAI")
-
-        # [신규] 앱 시작 시 마지막 상태 로드
-        # self.load_generation_parameters()
-        self.load_last_search_state()
+        with tracer.phase("generation params"):
+            # 🆕 메인 생성 파라미터 모드 관리자 추가
+            self.generation_params_manager = GenerationParamsManager(self)
+            
+            # AppContext에 모드 변경 이벤트 구독
+            self.app_context.subscribe_mode_swap(self.generation_params_manager.on_mode_changed)
+            
+            # 초기 설정 로드 (NAI 모드)
+            self.generation_params_manager.load_mode_settings("NAI")
 
         # ✅ 2. AutoCompleteManager 초기화 방식 변경
+        # (설정 탭이 시작 직후 enable()/disable()을 호출하므로 창 표시 전에 생성)
         print("🔍 AutoCompleteManager 전역 인스턴스 요청 중...")
-        # 새로운 getter 패턴 사용
-        self.autocomplete_manager = get_autocomplete_manager(app_context=self.app_context)
+        with tracer.phase("autocomplete manager"):
+            # 새로운 getter 패턴 사용
+            self.autocomplete_manager = get_autocomplete_manager(app_context=self.app_context)
         self.workflow_manager = self.app_context.comfyui_workflow_manager
 
         self.main_prompt_textedit.installEventFilter(self)
@@ -370,6 +389,22 @@ class ModernMainWindow(QMainWindow):
         # 초기화 완료 후 splitter stretch factor 업데이트
         QTimer.singleShot(100, self.update_splitter_stretch_factors)
 
+        # [신규] 마지막 검색 상태 복원 등 화면 표시에 필요 없는 작업은
+        # 이벤트 루프가 시작된 뒤(창이 표시된 뒤)로 미룸
+        QTimer.singleShot(0, self._run_deferred_startup)
+
+    def _run_deferred_startup(self):
+        """창 표시 이후에 실행되는 지연 시작 단계"""
+        tracer = self.startup_tracer
+        tracer.mark("event loop started")
+        with tracer.phase("deferred: last search state"):
+            # [신규] 앱 시작 시 마지막 상태 로드
+            # self.load_generation_parameters()
+            self.load_last_search_state()
+        tracer.mark("deferred startup done")
+        tracer.print_summary()
+        tracer.dump()
+
     def apply_dynamic_styles(self):
         """동적 스타일시트 적용"""
         try:
@@ -2034,6 +2069,10 @@ class ModernMainWindow(QMainWindow):
             
         except Exception as e:
             print(f"❌ 설정 저장 중 오류: {e}")
+
+        # 훅 실행 시간 측정이 켜져 있으면 종료 시 요약 출력
+        if self.app_context.hook_profiler.enabled:
+            self.app_context.hook_profiler.print_summary()
         
         event.accept()
 
@@ -2290,11 +2329,11 @@ class ModernMainWindow(QMainWindow):
         tag_under_cursor, start_pos, end_pos = self._get_tag_at_cursor(cursor)
 
         # --- 2. Parquet 데이터 조회 및 커스텀 메뉴 생성 ---
-        if not self.kr_tags_df.empty and tag_under_cursor:
-            matching_rows = self.kr_tags_df[self.kr_tags_df['tag'] == tag_under_cursor]
+        if tag_under_cursor:
+            # 해시 인덱스 조회 (로드 중이면 None → 표준 메뉴만 표시)
+            data = self.kr_tag_lookup.lookup(tag_under_cursor)
 
-            if not matching_rows.empty:
-                data = matching_rows.iloc[0]
+            if data is not None:
                 
                 # 클릭 불가능한 정보 표시용 액션을 만드는 헬퍼 함수
                 def create_info_action(text, font_size, is_bold=False, word_wrap=False):
@@ -2383,21 +2422,6 @@ class ModernMainWindow(QMainWindow):
         cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
         cursor.insertText(new_tag)
 
-    def _load_kr_tags(self):
-        """data/KR_tags.parquet 파일을 로드하여 DataFrame으로 반환합니다."""
-        filepath = 'data/KR_tags.parquet'
-        if os.path.exists(filepath):
-            try:
-                print(f"🔍 '{filepath}' 파일 로딩 중...")
-                df = pd.read_parquet(filepath)
-                print(f"✅ '{filepath}' 로딩 완료. {len(df):,}개 태그.")
-                return df
-            except Exception as e:
-                print(f"❌ '{filepath}' 파일 로딩 실패: {e}")
-        else:
-            print(f"⚠️ '{filepath}' 파일을 찾을 수 없습니다.")
-        return pd.DataFrame() # 실패 시 빈 DataFrame 반환
-
     def save_all_current_settings(self):
         """현재 모든 설정을 저장하는 메서드"""
         try:
@@ -2717,6 +2741,7 @@ if __name__ == "__main__":
     window = ModernMainWindow()
 
     window.show()
+    get_startup_tracer().mark("window shown")
     sys.exit(app.exec())
 
 ## 생성형 AI 개발 가이드라인
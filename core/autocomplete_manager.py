@@ -1,7 +1,8 @@
 import re
-from PyQt6.QtCore import QObject, QEvent, Qt, QTimer
+from PyQt6.QtCore import QObject, QEvent, Qt, QTimer, QThread, pyqtSignal
 from PyQt6.QtWidgets import QApplication, QListWidget, QWidget, QLineEdit, QTextEdit
-from PyQt6.QtGui import QTextCursor, QKeyEvent
+from PyQt6.QtGui import QTextCursor, QKeyEvent, QInputMethodEvent
+from core.kr_tag_lookup import contains_hangul
 
 # ✅ 전역 인스턴스 (싱글턴 패턴 대체)
 _autocomplete_manager = None
@@ -47,6 +48,51 @@ def reset_autocomplete_manager():
         print("🔄 AutoCompleteManager 전역 인스턴스 리셋")
         _autocomplete_manager = None
 
+class AutoCompleteLookupWorker(QObject):
+    """
+    자동완성 매칭을 GUI 스레드 밖에서 수행하는 백그라운드 워커.
+    요청마다 세대 번호(generation)를 함께 받아, 더 새로운 요청이 들어온 경우
+    오래된 요청은 검색을 건너뛰고 결과도 내보내지 않습니다.
+    """
+    lookup_finished = pyqtSignal(int, object)  # generation, matches
+
+    def __init__(self, tag_data_manager=None, wildcard_manager=None, kr_tag_lookup=None):
+        super().__init__()
+        self.tag_data_manager = tag_data_manager
+        self.wildcard_manager = wildcard_manager
+        self.kr_tag_lookup = kr_tag_lookup
+        # GUI 스레드에서 갱신하는 최신 요청 세대 번호 (int 대입은 원자적)
+        self.latest_generation = 0
+
+    def run_lookup(self, generation: int, target_text: str):
+        """큐에 쌓인 요청 중 최신 요청만 실제로 검색합니다."""
+        if generation != self.latest_generation or not self.tag_data_manager:
+            return
+
+        additional_wildcards = None
+        if self.wildcard_manager:
+            additional_wildcards = getattr(self.wildcard_manager, 'wildcard_dict_tree', None)
+
+        try:
+            if self.kr_tag_lookup and contains_hangul(target_text):
+                # 🆕 한글 키워드/별칭 입력은 KR 태그 역색인으로 영문 태그를 찾음
+                matches = self.kr_tag_lookup.search_keywords(target_text)
+            else:
+                matches = self.tag_data_manager.find_top_matches(
+                    target_text,
+                    additional_wildcards=additional_wildcards
+                )
+        except Exception as e:
+            # 와일드카드 리로드 중 딕셔너리가 바뀌는 경우 등은 빈 결과로 처리
+            print(f"⚠️ 자동완성 검색 중 오류: {e}")
+            matches = []
+
+        # 검색하는 동안 새 요청이 들어왔다면 결과를 버림
+        if generation != self.latest_generation:
+            return
+        self.lookup_finished.emit(generation, matches)
+
+
 class AutoCompleteManager(QObject):
     """
     애플리케이션 전체의 텍스트 입력 위젯에 대한 자동완성 기능을 관리하는 클래스.
@@ -60,6 +106,9 @@ class AutoCompleteManager(QObject):
     3. 부모 위젯 이름을 ignored_parent_names에 추가
     """
 
+    # 워커 스레드로 검색 요청 전달 (generation, target_text)
+    lookup_requested = pyqtSignal(int, str)
+
     def __init__(self, app_context=None, main_window=None):
         # 🆕 QApplication 체크 추가 (빈 윈도우 방지)
         from PyQt6.QtWidgets import QApplication
@@ -77,6 +126,7 @@ class AutoCompleteManager(QObject):
         # 데이터 매니저 참조
         self.tag_data_manager = None
         self.wildcard_manager = None
+        self.kr_tag_lookup = None
         
         # 🆕 초기화 지연 (메인 윈도우가 완전히 준비된 후)
         self._initialized = False
@@ -102,6 +152,16 @@ class AutoCompleteManager(QObject):
         
         # 자동완성 활성화 상태
         self.enabled = True
+
+        # 🆕 비동기 검색 상태 (세대 번호로 오래된 결과 폐기)
+        self.lookup_thread = None
+        self.lookup_worker = None
+        self._lookup_generation = 0
+        self._pending_lookups = {}  # generation -> (widget, token_info)
+
+        # 🆕 IME 조합 중인 글자 (한글 입력 시 음절이 확정되기 전까지 위젯 텍스트에 반영되지 않음)
+        self._preedit_widget = None
+        self._preedit_text = ""
         
         # 🆕 지연 초기화 타이머
         self.init_timer = QTimer()
@@ -116,6 +176,7 @@ class AutoCompleteManager(QObject):
                 self.timer = QTimer()
                 self.timer.setSingleShot(True)
                 self._setup_data_managers()
+                self._setup_lookup_worker()
                 self._setup_event_filter()
                 self.timer.timeout.connect(self.show_completions)
                 self._initialized = True
@@ -129,12 +190,37 @@ class AutoCompleteManager(QObject):
             if self.app_context:
                 self.tag_data_manager = getattr(self.app_context, 'tag_data_manager', None)
                 self.wildcard_manager = getattr(self.app_context, 'wildcard_manager', None)
+                self.kr_tag_lookup = getattr(self.app_context, 'kr_tag_lookup', None)
             elif self.main_window:
                 self.tag_data_manager = getattr(self.main_window, 'tag_data_manager', None)
                 self.wildcard_manager = getattr(self.main_window, 'wildcard_manager', None)
+                self.kr_tag_lookup = getattr(self.main_window, 'kr_tag_lookup', None)
         except Exception as e:
             print(f"⚠️ AutoCompleteManager 데이터 매니저 설정 실패: {e}")
 
+    def _setup_lookup_worker(self):
+        """🆕 자동완성 검색용 워커 스레드 생성"""
+        self.lookup_thread = QThread()
+        self.lookup_worker = AutoCompleteLookupWorker(self.tag_data_manager, self.wildcard_manager, self.kr_tag_lookup)
+        self.lookup_worker.moveToThread(self.lookup_thread)
+
+        # 시그널 연결 (스레드 경계를 넘으므로 큐 연결로 동작)
+        self.lookup_requested.connect(self.lookup_worker.run_lookup)
+        self.lookup_worker.lookup_finished.connect(self._on_lookup_finished)
+        self.lookup_thread.finished.connect(self.lookup_worker.deleteLater)
+        self.lookup_thread.start()
+
+        app = QApplication.instance()
+        if app:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def shutdown(self):
+        """앱 종료 시 검색 워커 스레드 정리"""
+        if self.lookup_thread and self.lookup_thread.isRunning():
+            self.lookup_thread.quit()
+            self.lookup_thread.wait(1000)
+        self._pending_lookups.clear()
+
     def _setup_event_filter(self):
         """🆕 이벤트 필터 설정 - 안전하게 처리"""
         try:
@@ -201,7 +287,10 @@ class AutoCompleteManager(QObject):
         # 이벤트 타입에 따라 처리
         if event.type() == QEvent.Type.KeyRelease:
             self.on_key_release(watched, event)
+        elif event.type() == QEvent.Type.InputMethod:
+            self.on_input_method(watched, event)
         elif event.type() == QEvent.Type.FocusOut:
+            self._clear_preedit(watched)
             # 약간의 지연을 주어, 팝업 클릭 시 바로 닫히지 않도록 함
             QTimer.singleShot(100, lambda: self.popup.hide() if self.popup and not self.popup.hasFocus() else None)
 
@@ -259,6 +348,7 @@ class AutoCompleteManager(QObject):
         if not hasattr(self, 'enabled'):
             self.enabled = False
         self.enabled = False
+        self._cancel_pending_lookups()
         if self.popup and self.popup.isVisible():
             self.popup.hide()
         print("Autocomplete disabled.")
@@ -270,6 +360,18 @@ class AutoCompleteManager(QObject):
             self.current_widget = widget
             self.timer.start(200)
 
+    def on_input_method(self, widget: QWidget, event: QInputMethodEvent):
+        """IME 조합/확정 시에도 검색 예약 (조합 중인 글자는 위젯 텍스트에 없으므로 따로 보관)"""
+        self._preedit_widget = widget
+        self._preedit_text = event.preeditString()
+        self.current_widget = widget
+        self.timer.start(200)
+
+    def _clear_preedit(self, widget: QWidget = None):
+        if widget is None or widget is self._preedit_widget:
+            self._preedit_widget = None
+            self._preedit_text = ""
+
     def show_completions(self):
         """자동완성 목록을 표시하는 메서드"""
         if not self.current_widget or not self.enabled: 
@@ -282,37 +384,45 @@ class AutoCompleteManager(QObject):
         # 현재 활성 토큰 정보 가져오기
         token_info = self._get_active_token_info(self.current_widget)
         if not token_info or len(token_info['stripped_text']) < 1:
+            self._cancel_pending_lookups()
             self.popup.hide()
             return
             
-        self.active_token_info = token_info
-        target_text = token_info['stripped_text']
-        
-        # wildcard_manager가 있다면 추가 와일드카드도 전달
-        additional_wildcards = None
-        if self.wildcard_manager:
-            additional_wildcards = getattr(self.wildcard_manager, 'wildcard_dict_tree', None)
-        
-        # TagDataManager를 통해 매칭 결과 가져오기
-        try:
-            if not self.tag_data_manager:
-                print("⚠️ tag_data_manager가 없습니다")
-                self.popup.hide()
-                return
-                
-            matches = self.tag_data_manager.find_top_matches(
-                target_text, 
-                additional_wildcards=additional_wildcards
-            )
-        except Exception as e:
-            print(f"⚠️ 자동완성 검색 중 오류: {e}")
+        if not self.tag_data_manager or not self.lookup_worker:
+            print("⚠️ tag_data_manager가 없습니다")
             self.popup.hide()
             return
-        
+
+        # 🆕 검색은 워커 스레드에 맡기고, 세대 번호로 최신 요청만 반영
+        self._lookup_generation += 1
+        generation = self._lookup_generation
+        self._pending_lookups = {generation: (self.current_widget, token_info)}
+        self.lookup_worker.latest_generation = generation
+        self.lookup_requested.emit(generation, token_info['stripped_text'])
+
+    def _cancel_pending_lookups(self):
+        """진행 중인 검색 결과가 나중에 도착해도 팝업을 띄우지 않도록 무효화"""
+        self._lookup_generation += 1
+        self._pending_lookups.clear()
+        if self.lookup_worker:
+            self.lookup_worker.latest_generation = self._lookup_generation
+
+    def _on_lookup_finished(self, generation: int, matches):
+        """워커의 검색 결과를 받아 팝업을 갱신 (오래된 결과는 무시)"""
+        pending = self._pending_lookups.pop(generation, None)
+        if generation != self._lookup_generation or pending is None:
+            return
+
+        widget, token_info = pending
+        if widget is not self.current_widget or not self.enabled or self.popup is None:
+            return
+
         # 매칭 결과가 없으면 팝업 숨기기
         if not matches:
             self.popup.hide()
             return
+
+        self.active_token_info = token_info
             
         # 팝업에 결과 표시 (태그명 + count 포함)
         self.popup.clear()
@@ -352,8 +462,15 @@ class AutoCompleteManager(QObject):
             # 실제 태그명만 별도로 저장 (완성 시 사용)
             item.setData(Qt.ItemDataRole.UserRole, tag)
             
-            # 툴팁 설정
-            item.setToolTip(f"태그: {tag}\n사용 횟수: {count:,}")
+            # 툴팁 설정 (KR 태그 정보가 로드되어 있으면 카테고리/설명 추가)
+            tooltip = f"태그: {tag}\n사용 횟수: {count:,}"
+            kr_data = self.kr_tag_lookup.lookup(tag) if self.kr_tag_lookup else None
+            if kr_data is not None:
+                for label, key in (("카테고리", 'category'), ("설명", 'desc')):
+                    value = kr_data.get(key)
+                    if isinstance(value, str) and value:
+                        tooltip += f"\n{label}: {value}"
+            item.setToolTip(tooltip)
             
             self.popup.addItem(item)
 
@@ -382,6 +499,11 @@ class AutoCompleteManager(QObject):
             completion_text = completion_text.replace('(', r'\(').replace(')', r'\)')
         final_text = self._restore_brackets(completion_text, info['prefix'], info['suffix'])
 
+        # 조합 중인 글자는 버리고 완성 텍스트로 교체
+        if widget is self._preedit_widget and self._preedit_text:
+            QApplication.inputMethod().reset()
+            self._clear_preedit()
+
         if isinstance(widget, QTextEdit):
             cursor = widget.textCursor()
             cursor.setPosition(info['start'])
@@ -392,6 +514,7 @@ class AutoCompleteManager(QObject):
             new_text = current_text[:info['start']] + final_text + current_text[info['end']:]
             widget.setText(new_text)
         
+        self._cancel_pending_lookups()
         self.popup.hide()
         widget.setFocus() # 텍스트 완성 후 원래 위젯으로 포커스 복귀
 
@@ -420,15 +543,23 @@ class AutoCompleteManager(QObject):
             self.popup.setCurrentRow(min(self.popup.count() - 1, self.popup.currentRow() + 1))
             return True
         elif key == Qt.Key.Key_Escape:
+            self._cancel_pending_lookups()
             self.popup.hide()
             return True
         return False
         
     def _get_active_token_info(self, widget: QWidget) -> dict:
-        """현재 커서 위치의 단어(토큰), 괄호, 시작/끝 위치를 반환"""
+        """현재 커서 위치의 단어(토큰), 괄호, 시작/끝 위치를 반환 (IME 조합 중인 글자 포함)"""
         text = widget.toPlainText() if isinstance(widget, QTextEdit) else widget.text()
         pos = widget.textCursor().position() if isinstance(widget, QTextEdit) else widget.cursorPosition()
 
+        # 조합 중인 글자를 커서 위치에 넣은 텍스트로 토큰을 찾고, 시작/끝은 실제 텍스트 기준으로 되돌림
+        preedit = self._preedit_text if widget is self._preedit_widget else ""
+        if preedit:
+            text = text[:pos] + preedit + text[pos:]
+        real_pos = pos
+        pos += len(preedit)
+
         # 왼쪽 경계(콤마 또는 시작) 찾기
         start_pos = text.rfind(',', 0, pos)
         start_pos = 0 if start_pos == -1 else start_pos + 1
@@ -449,13 +580,16 @@ class AutoCompleteManager(QObject):
         token = text[start_pos:end_pos]
         stripped_token, prefix, suffix = self._strip_brackets(token)
 
+        if start_pos > real_pos:
+            start_pos = max(real_pos, start_pos - len(preedit))
+
         return {
             'text': token, 
             'stripped_text': stripped_token.strip(), 
             'prefix': prefix, 
             'suffix': suffix, 
             'start': start_pos, 
-            'end': end_pos
+            'end': end_pos - len(preedit)
         }
 
     def _strip_brackets(self, keyword: str) -> tuple[str, str, str]:
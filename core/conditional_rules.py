@@ -0,0 +1,683 @@
+# core/conditional_rules.py
+
+import re
+import heapq
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+from core.prompt_context import PromptContext
+
+_AND_SPLIT = re.compile(r'\s*&\s*')
+_OR_SPLIT = re.compile(r'\s*\|\s*')
+_RATINGS = frozenset(['e', 'q', 's', 'g'])
+# 부분 일치 검색용 문자열의 태그 구분자 (태그/조건 문자열에 나올 수 없는 문자, 일괄 모드와 공유)
+TAG_SEP = '\x00'
+
+class RuleEvaluationContext:
+    """
+    한 프롬프트의 조건 평가용 색인. 프롬프트마다 한 번 만들고 규칙들이 공유합니다.
+    - tag_counts: 태그별 개수 (정확 일치 검사, 같은 태그가 여러 개일 때 하나만 지워도 정확히 유지)
+    - joined: 태그를 구분자로 이은 문자열 (부분 일치 검사)
+    액션이 태그를 추가/제거하면 add_tags/remove_tag로 바뀐 부분만 반영합니다.
+    부분 일치 검사는 어느 태그에 들어 있는지만 보므로 joined 안의 태그 순서는 실제 리스트와 달라도 됩니다.
+    """
+    __slots__ = ('tag_counts', 'joined', 'rating', 'added')
+
+    def __init__(self, prefix_tags: List[str], main_tags: List[str], postfix_tags: List[str], source_row=None):
+        self.rating = source_row.get('rating', None) if source_row is not None else None
+        # 액션이 추가한 태그 기록 (RulePlan 실행 중에만 리스트로 설정되어 후보 규칙 활성화에 사용)
+        self.added: Optional[List[str]] = None
+        self.rebuild(prefix_tags, main_tags, postfix_tags)
+
+    def rebuild(self, prefix_tags: List[str], main_tags: List[str], postfix_tags: List[str]):
+        """태그 리스트 전체로 색인을 다시 만듭니다."""
+        all_tags = prefix_tags + main_tags + postfix_tags
+        counts = {}
+        for tag in all_tags:
+            counts[tag] = counts.get(tag, 0) + 1
+        self.tag_counts = counts
+        # 'needle in joined'는 태그 하나라도 needle을 포함할 때만 참 (needle에는 구분자가 없으므로)
+        self.joined = TAG_SEP + TAG_SEP.join(all_tags) + TAG_SEP
+
+    def add_tags(self, tags: List[str]):
+        if not tags:
+            return
+        counts = self.tag_counts
+        for tag in tags:
+            counts[tag] = counts.get(tag, 0) + 1
+        self.joined += TAG_SEP.join(tags) + TAG_SEP
+        if self.added is not None:
+            self.added.extend(tags)
+
+    def remove_tag(self, tag: str):
+        count = self.tag_counts.get(tag, 0)
+        if count <= 1:
+            self.tag_counts.pop(tag, None)
+        else:
+            self.tag_counts[tag] = count - 1
+        # 양 끝이 구분자이므로 '구분자+tag+구분자'는 정확히 태그 하나에 해당
+        self.joined = self.joined.replace(TAG_SEP + tag + TAG_SEP, TAG_SEP, 1)
+
+def _find_containing(tags: List[str], needle: str) -> int:
+    """
+    needle을 포함하는 첫 태그의 위치 (없으면 -1).
+    태그를 구분자로 이은 문자열에서 find 한 번으로 찾고, 앞쪽 구분자 개수로 위치를 계산합니다.
+    """
+    if not tags:
+        return -1
+    joined = TAG_SEP.join(tags)
+    position = joined.find(needle)
+    if position == -1:
+        return -1
+    return joined.count(TAG_SEP, 0, position)
+
+class CompiledRule:
+    """파싱된 규칙 하나: 원문, 조건/액션 정보와 컴파일된 조건 판정 함수"""
+    __slots__ = ('original', 'condition', 'action', 'predicate')
+
+    def __init__(self, original: str, condition: Dict, action: Dict, predicate: Callable[[RuleEvaluationContext], bool]):
+        self.original = original
+        self.condition = condition
+        self.action = action
+        self.predicate = predicate
+
+def _always_true(evaluation: RuleEvaluationContext) -> bool:
+    return True
+
+def _always_false(evaluation: RuleEvaluationContext) -> bool:
+    return False
+
+def _has_any_tag(evaluation: RuleEvaluationContext) -> bool:
+    return bool(evaluation.tag_counts)
+
+# 단일 조건(아톰) 종류
+RATING, NOT_RATING = 'rating', 'not_rating'
+EXACT, NOT_EXACT = 'exact', 'not_exact'
+CONTAINS, NOT_CONTAINS = 'contains', 'not_contains'
+
+def _parse_single_condition(condition: str) -> Tuple[str, str]:
+    """단일 조건을 (종류, 값)으로 분류"""
+    condition = condition.strip()
+
+    # 등급 조건
+    if condition in _RATINGS:
+        return RATING, condition
+    if condition[:1] == '~' and condition[1:] in _RATINGS:
+        return NOT_RATING, condition[1:]  # ~ 제거
+
+    if condition.startswith('~!'):
+        # 정확 불일치 조건 (~!tag)
+        return NOT_EXACT, condition[2:]
+    elif condition.startswith('~'):
+        # 불포함 조건 (~tag)
+        return NOT_CONTAINS, condition[1:]
+    elif condition.startswith('*'):
+        # 정확 일치 조건 (*tag)
+        return EXACT, condition[1:]
+    else:
+        # 포함 조건 (tag)
+        return CONTAINS, condition
+
+def _compile_single_condition(kind: str, value: str) -> Callable[[RuleEvaluationContext], bool]:
+    """분류된 단일 조건을 판정 함수로 변환 (등급 조건은 source_row의 rating이 없으면 항상 거짓)"""
+    if kind == RATING:
+        return lambda ev: ev.rating is not None and ev.rating == value
+    if kind == NOT_RATING:
+        return lambda ev: ev.rating is not None and ev.rating != value
+    if kind == NOT_EXACT:
+        return lambda ev: value not in ev.tag_counts
+    if kind == NOT_CONTAINS:
+        if not value:
+            return lambda ev: not ev.tag_counts
+        return lambda ev: value not in ev.joined
+    if kind == EXACT:
+        return lambda ev: value in ev.tag_counts
+    if not value:
+        return _has_any_tag
+    return lambda ev: value in ev.joined
+
+@lru_cache(maxsize=4096)
+def parse_expression(expression: str) -> Tuple[Tuple[Tuple[str, str], ...], ...]:
+    """'a & b | c' 형식의 논리 표현식을 AND 그룹(각각 OR로 묶인 단일 조건들)의 튜플로 분해 (&가 |보다 상위 레벨)"""
+    if not expression:
+        return ()
+    return tuple(
+        tuple(_parse_single_condition(or_part) for or_part in _OR_SPLIT.split(and_part))
+        for and_part in _AND_SPLIT.split(expression)
+    )
+
+def _compile_groups(groups) -> Callable[[RuleEvaluationContext], bool]:
+    if not groups:
+        return _always_true
+    compiled = tuple(tuple(_compile_single_condition(kind, value) for kind, value in group) for group in groups)
+    if len(compiled) == 1 and len(compiled[0]) == 1:
+        return compiled[0][0]
+
+    def predicate(ev: RuleEvaluationContext) -> bool:
+        # AND 그룹은 모두 참, 각 그룹 안의 OR 조건은 하나라도 참
+        for group in compiled:
+            for check in group:
+                if check(ev):
+                    break
+            else:
+                return False
+        return True
+    return predicate
+
+@lru_cache(maxsize=4096)
+def compile_expression(expression: str) -> Callable[[RuleEvaluationContext], bool]:
+    """논리 표현식을 판정 함수로 컴파일합니다."""
+    return _compile_groups(parse_expression(expression))
+
+def compile_condition(condition: Dict) -> Callable[[RuleEvaluationContext], bool]:
+    """parse_rules가 만든 조건 정보를 판정 함수로 변환"""
+    if condition.get('type') != 'logical':
+        return _always_false
+    return compile_expression(condition['expression'])
+
+def action_added_tags(action: Dict) -> List[str]:
+    """액션이 추가할 수 있는 태그 목록 (실행 계획과 일괄 모드에서 사용)"""
+    if action['type'] == 'replace':
+        return action.get('new_tag_list', [action.get('new_tag', '')])
+    if action['type'] == 'insert':
+        return action.get('tag_list', [action.get('new_tag', '')])
+    return action.get('tag_list', [action.get('tag', '')])
+
+class RulePlan:
+    """
+    컴파일된 규칙 목록과 실행 계획.
+
+    조건의 AND 그룹 중 긍정 태그 조건(*tag, tag)으로만 된 그룹을 규칙의 '가드'로 골라 두면,
+    가드 그룹의 조건이 하나도 참이 아닌 동안에는 규칙 전체가 참일 수 없으므로 평가를 건너뛸 수 있습니다.
+    - exact_index: 가드의 정확 일치 태그 -> 규칙 번호들.
+      프롬프트의 태그와 액션이 새로 추가한 태그로만 조회하므로, 후보를 찾는 비용이 규칙 수가 아닌 태그 수에 비례합니다.
+    - needle_guards: 가드의 부분 일치 문자열. 어떤 액션도 그 문자열을 포함하는 태그를 만들 수 없을 때만 가드로 쓰며,
+      처음 태그에 없으면 그 행에서는 불가능한 규칙으로 건너뜁니다.
+    - 등급 조건만으로 된 그룹은 행의 rating만으로 결정되므로 rating 값별로 차단 목록을 만들어 재사용합니다.
+    - always: 가드를 고를 수 없는 규칙 (부정 조건만 있는 규칙 등, 매번 평가)
+    """
+
+    def __init__(self, rules: Tuple[CompiledRule, ...]):
+        self.rules = rules
+        # 평가를 건너뛴(또는 조건 불일치) 규칙의 실행 결과와 로그 문자열 (읽기 전용으로 공유)
+        self.not_met_results = tuple({'rule': rule.original, 'met': False, 'description': None} for rule in rules)
+        self.not_met_logs = tuple(f"[Rule: {rule.original}] -> Condition Not Met." for rule in rules)
+
+        addable = set()
+        for rule in rules:
+            addable.update(action_added_tags(rule.action))
+        addable_joined = TAG_SEP + TAG_SEP.join(addable) + TAG_SEP
+
+        self.exact_index: Dict[str, List[int]] = {}
+        self.needle_guards: List[Tuple[int, Tuple[str, ...]]] = []
+        self.always: List[int] = []
+        self._rating_groups: List[Tuple[int, Callable[[RuleEvaluationContext], bool]]] = []
+        self._never = bytearray(len(rules))
+        self._blocked_cache: Dict[str, bytes] = {}
+
+        for index, rule in enumerate(rules):
+            if rule.condition.get('type') != 'logical':
+                self._never[index] = 1
+                continue
+            groups = parse_expression(rule.condition['expression'])
+
+            rating_groups = tuple(group for group in groups if all(kind in (RATING, NOT_RATING) for kind, _ in group))
+            if rating_groups:
+                self._rating_groups.append((index, _compile_groups(rating_groups)))
+
+            guard = self._choose_guard(groups, addable_joined)
+            if guard is None:
+                self.always.append(index)
+                continue
+            exact_tags, needles = guard
+            for tag in exact_tags:
+                self.exact_index.setdefault(tag, []).append(index)
+            if needles:
+                self.needle_guards.append((index, needles))
+
+    @staticmethod
+    def _choose_guard(groups, addable_joined: str):
+        """가드로 쓸 AND 그룹을 고릅니다. 정확 일치만으로 된 그룹을 우선합니다. (없으면 None)"""
+        best = None
+        for group in groups:
+            if not all(kind in (EXACT, CONTAINS) and value for kind, value in group):
+                continue
+            exact_tags = tuple(value for kind, value in group if kind == EXACT)
+            needles = tuple(value for kind, value in group if kind == CONTAINS)
+            # 액션이 만들 수 있는 태그에 들어 있는 문자열은 실행 도중 참이 될 수 있어 정적으로 판단 불가
+            if any(needle in addable_joined for needle in needles):
+                continue
+            if not needles:
+                return exact_tags, needles
+            if best is None:
+                best = (exact_tags, needles)
+        return best
+
+    def blocked_for(self, evaluation: RuleEvaluationContext) -> bytes:
+        """이 행에서 평가할 필요가 없는 규칙 표시 (조건 형식 오류, 등급 조건 불일치)"""
+        rating = evaluation.rating
+        cacheable = isinstance(rating, str) or rating is None
+        if cacheable and rating in self._blocked_cache:
+            return self._blocked_cache[rating]
+        blocked = bytearray(self._never)
+        for index, rating_check in self._rating_groups:
+            if not rating_check(evaluation):
+                blocked[index] = 1
+        blocked = bytes(blocked)
+        if cacheable:
+            self._blocked_cache[rating] = blocked
+        return blocked
+
+    def __len__(self):
+        return len(self.rules)
+
+    def __iter__(self):
+        return iter(self.rules)
+
+class ConditionalRuleEngine:
+    """
+    조건부 프롬프트(PromptListModifier) 규칙의 파싱/평가/적용 로직 (Qt 비의존).
+    등급 조건(e/q/s/g)은 위젯이나 AppContext 대신 호출자가 넘겨준 source_row로 판단하므로
+    GUI 모듈, GenerationController, 헤드리스 파이프라인이 같은 엔진을 공유합니다.
+    """
+
+    def __init__(self):
+        # 마지막으로 컴파일한 (규칙 텍스트, 실행 계획) - 텍스트가 바뀔 때만 다시 컴파일
+        self._compiled = ('', RulePlan(()))
+
+    def compile_rules(self, rules_text: str) -> RulePlan:
+        """규칙 텍스트를 파싱하고 조건을 판정 함수와 실행 계획으로 컴파일합니다. 같은 텍스트면 캐시를 재사용합니다."""
+        cached_text, cached_plan = self._compiled
+        if cached_text == rules_text:
+            return cached_plan
+        plan = RulePlan(tuple(
+            CompiledRule(rule['original'], rule['condition'], rule['action'], compile_condition(rule['condition']))
+            for rule in self.parse_rules(rules_text)
+        ))
+        self._compiled = (rules_text, plan)
+        return plan
+
+    def run_rules(self, plan: RulePlan, prefix_tags: List[str], main_tags: List[str],
+                  postfix_tags: List[str], source_row=None) -> tuple:
+        """
+        컴파일된 규칙을 순서대로 적용합니다. 태그 리스트는 제자리에서 수정될 수 있으므로 복사본을 넘겨야 합니다.
+        실행 계획에 따라 현재 태그로는 참이 될 수 없는 규칙은 평가하지 않고 '조건 불일치'로 기록합니다.
+        반환값: (prefix_tags, main_tags, postfix_tags, 규칙별 실행 결과 리스트)
+        """
+        return self._run_plan(plan, prefix_tags, main_tags, postfix_tags, source_row)[:4]
+
+    def _run_plan(self, plan: RulePlan, prefix_tags: List[str], main_tags: List[str],
+                  postfix_tags: List[str], source_row=None) -> tuple:
+        """run_rules 본체. 결과가 바뀐(조건 충족 또는 오류) 규칙 번호 목록을 함께 반환합니다."""
+        evaluation = RuleEvaluationContext(prefix_tags, main_tags, postfix_tags, source_row)
+        rules = plan.rules
+        rule_results = list(plan.not_met_results)
+        blocked = plan.blocked_for(evaluation)
+        exact_index = plan.exact_index
+        active = bytearray(len(rules))
+        pending = []
+
+        def activate(index: int):
+            if not active[index] and not blocked[index]:
+                active[index] = 1
+                heapq.heappush(pending, index)
+
+        # 처음 태그로 후보 규칙 찾기 (정확 일치 가드는 색인 조회, 부분 일치 가드는 문자열 검색)
+        for index in plan.always:
+            activate(index)
+        for tag in evaluation.tag_counts:
+            for index in exact_index.get(tag, ()):
+                activate(index)
+        joined = evaluation.joined
+        for index, needles in plan.needle_guards:
+            if any(needle in joined for needle in needles):
+                activate(index)
+
+        evaluation.added = []
+        changed = []
+        while pending:
+            index = heapq.heappop(pending)
+            rule = rules[index]
+            try:
+                if rule.predicate(evaluation):
+                    # 액션 실행 (평가용 색인은 바뀐 태그만 갱신)
+                    prefix_tags, main_tags, postfix_tags = self.execute_action(
+                        rule.action, prefix_tags, main_tags, postfix_tags, evaluation
+                    )
+                    rule_results[index] = {
+                        'rule': rule.original,
+                        'met': True,
+                        'description': rule.action['description']
+                    }
+                    changed.append(index)
+                    # 새로 생긴 태그를 가드로 가진 뒤쪽 규칙만 후보에 추가
+                    for tag in evaluation.added:
+                        for later in exact_index.get(tag, ()):
+                            if later > index:
+                                activate(later)
+                    evaluation.added.clear()
+                    
+            except Exception as e:
+                # 액션이 도중에 실패했을 수 있으므로 색인을 다시 맞추고, 남은 규칙은 모두 평가
+                evaluation.rebuild(prefix_tags, main_tags, postfix_tags)
+                evaluation.added.clear()
+                for later in range(index + 1, len(rules)):
+                    activate(later)
+                rule_results[index] = {
+                    'rule': rule.original,
+                    'met': False,
+                    'description': f"Error: {str(e)}",
+                    'error': str(e)
+                }
+                changed.append(index)
+        
+        return prefix_tags, main_tags, postfix_tags, rule_results, changed
+
+    def apply_rules(self, context: PromptContext, rules_text: str, logs: List[str], source_row=None) -> PromptContext:
+        """규칙을 적용하여 프롬프트 리스트를 수정"""
+        plan = self.compile_rules(rules_text)
+        
+        # 현재 태그 리스트 복사 후 규칙 실행
+        prefix_tags, main_tags, postfix_tags, rule_results, changed = self._run_plan(
+            plan, context.prefix_tags.copy(), context.main_tags.copy(), context.postfix_tags.copy(), source_row
+        )
+        
+        # 최상단에 규칙 실행 결과 추가 (조건 불일치 로그는 미리 만들어 둔 문자열 사용)
+        # logs.append("=== 규칙 실행 결과 ===")
+        rule_logs = list(plan.not_met_logs)
+        for index in changed:
+            result = rule_results[index]
+            if result['met']:
+                rule_logs[index] = f"[Rule: {result['rule']}] -> Condition Met -> {result['description']}"
+            else:
+                error_msg = result['description'] if result['description'] and "Error:" in result['description'] else "Condition Not Met."
+                rule_logs[index] = f"[Rule: {result['rule']}] -> {error_msg}"
+        logs.extend(rule_logs)
+        logs.append("")
+
+        # 수정된 태그 리스트를 컨텍스트에 적용
+        context.prefix_tags = prefix_tags
+        context.main_tags = main_tags
+        context.postfix_tags = postfix_tags
+        
+        return context
+
+    def _parse_tag_list(self, tag_text: str) -> List[str]:
+        """태그 문자열을 리스트로 파싱 (^ 구분자 또는 쉼표 구분자 지원) - 따옴표 완전 제거"""
+        tag_text = tag_text.strip()
+        
+        # 전체 문자열 양끝 따옴표 제거
+        if (tag_text.startswith('"') and tag_text.endswith('"')) or \
+        (tag_text.startswith("'") and tag_text.endswith("'")):
+            tag_text = tag_text[1:-1]
+        
+        if '^' in tag_text:
+            # ^ 구분자 사용
+            tags = [tag.strip() for tag in tag_text.split('^') if tag.strip()]
+        elif ',' in tag_text:
+            # 쉼표 구분자 사용
+            tags = [tag.strip() for tag in tag_text.split(',') if tag.strip()]
+        else:
+            # 단일 태그
+            tags = [tag_text] if tag_text else []
+        
+        # 각 개별 태그에서도 따옴표 제거
+        cleaned_tags = []
+        for tag in tags:
+            tag = tag.strip()
+            # 개별 태그의 양끝 따옴표 제거
+            if (tag.startswith('"') and tag.endswith('"')) or \
+            (tag.startswith("'") and tag.endswith("'")):
+                tag = tag[1:-1]
+            cleaned_tags.append(tag)
+        
+        return cleaned_tags
+
+    def parse_rules(self, rules_text: str) -> List[Dict]:
+        """규칙 텍스트를 파싱하여 구조화된 규칙 리스트 생성 - 따옴표 인식 개선"""
+        rules = []
+        
+        # 따옴표를 고려한 쉼표 분할
+        rule_parts = self._split_rules_with_quotes(rules_text)
+        
+        for rule_part in rule_parts:
+            try:
+                # (조건):실행문 형식으로 분리
+                match = re.match(r"\((.*?)\)\:(.*)", rule_part)
+                if not match:
+                    continue
+                    
+                condition_part, action_part = match.groups()
+                condition_part = condition_part.strip()
+                action_part = action_part.strip().strip('"')
+                
+                # 조건 파싱
+                condition = self._parse_condition(condition_part)
+                
+                # 액션 파싱
+                action = self._parse_action(action_part)
+                
+                rules.append({
+                    'condition': condition,
+                    'action': action,
+                    'original': rule_part
+                })
+                
+            except Exception as e:
+                print(f"규칙 파싱 오류: {rule_part} -> {e}")
+        
+        return rules
+    
+    def _split_rules_with_quotes(self, rules_text: str) -> List[str]:
+        """따옴표 내부의 쉼표는 무시하고 규칙을 분할 - 따옴표 없는 케이스도 지원, # 주석 처리"""
+        rules = []
+        current_rule = ""
+        in_quotes = False
+        quote_char = None
+        paren_count = 0
+        
+        i = 0
+        while i < len(rules_text):
+            char = rules_text[i]
+            
+            # 괄호 카운팅 (조건부 영역 추적)
+            if char == '(':
+                paren_count += 1
+            elif char == ')':
+                paren_count -= 1
+            
+            # 따옴표 처리
+            if char in ['"', "'"] and (i == 0 or rules_text[i-1] != '\\'):
+                if not in_quotes:
+                    in_quotes = True
+                    quote_char = char
+                elif char == quote_char:
+                    in_quotes = False
+                    quote_char = None
+            
+            # 쉼표 분할 조건
+            if char == ',' and not in_quotes and paren_count == 0:
+                # 따옴표 밖이고 조건부 괄호 밖의 쉼표를 발견하면 규칙 분할
+                if current_rule.strip():
+                    # # 주석 처리 - #로 시작하는 규칙은 무시
+                    rule_text = current_rule.strip()
+                    if not rule_text.startswith('#'):
+                        rules.append(rule_text)
+                current_rule = ""
+            else:
+                current_rule += char
+            
+            i += 1
+        
+        # 마지막 규칙 추가
+        if current_rule.strip():
+            rule_text = current_rule.strip()
+            if not rule_text.startswith('#'):
+                rules.append(rule_text)
+        
+        return rules
+
+    def _parse_condition(self, condition_text: str) -> Dict:
+        """조건 텍스트를 파싱 - 논리 연산자 지원"""
+        condition_text = condition_text.strip()
+        
+        return {
+            'type': 'logical',
+            'expression': condition_text
+        }
+
+    def _parse_action(self, action_text: str) -> Dict:
+        """액션 텍스트를 파싱 - 복수 태그 및 따옴표 선택사항 지원"""
+        action_text = action_text.strip()
+        
+        # 외부 따옴표 제거 (있는 경우) - 더 정확한 방식
+        action_text = self._remove_outer_quotes(action_text)
+        
+        if '+=' in action_text:
+            # 삽입/추가 액션 처리
+            parts = action_text.split('+=', 1)
+            if len(parts) == 2:
+                left_part = parts[0].strip()
+                right_part = parts[1].strip()
+                
+                # right_part를 태그 리스트로 변환
+                tag_list = self._parse_tag_list(right_part)
+                
+                # target_list+= 형태인지 확인
+                if left_part in ['prefix', 'main', 'postfix']:
+                    return {
+                        'type': 'append_to_list',
+                        'target_list': left_part,
+                        'tag_list': tag_list,
+                        'description': f'{tag_list} appended to {left_part}_tags.'
+                    }
+                else:
+                    # existing_tag+= 형태
+                    return {
+                        'type': 'insert',
+                        'existing_tag': left_part,
+                        'tag_list': tag_list,
+                        'description': f'{tag_list} inserted after "{left_part}".'
+                    }
+                    
+        elif '+:' in action_text:
+            # 추가 액션
+            if action_text.startswith(('prefix+:', 'main+:', 'postfix+:')):
+                target_list, tag_part = action_text.split('+:', 1)
+                target_list = target_list.strip()
+            else:
+                target_list = 'main'
+                tag_part = action_text.replace('+:', '', 1)
+            
+            tag_list = self._parse_tag_list(tag_part.strip())
+            
+            return {
+                'type': 'append',
+                'target_list': target_list,
+                'tag_list': tag_list,
+                'description': f'{tag_list} appended to {target_list}_tags.'
+            }
+            
+        elif '=' in action_text:
+            # 대체 액션
+            parts = action_text.split('=', 1)
+            if len(parts) == 2:
+                old_tag = parts[0].strip()
+                new_tag_part = parts[1].strip()
+                
+                # new_tag_part를 태그 리스트로 변환
+                new_tag_list = self._parse_tag_list(new_tag_part)
+                
+                return {
+                    'type': 'replace',
+                    'old_tag': old_tag,
+                    'new_tag_list': new_tag_list,
+                    'description': f'"{old_tag}" replaced with {new_tag_list}.'
+                }
+        
+        raise ValueError(f"Unknown action format: {action_text}")
+    
+    def _remove_outer_quotes(self, text: str) -> str:
+        """외부 따옴표만 제거하는 헬퍼 메서드"""
+        text = text.strip()
+        if len(text) >= 2:
+            if (text.startswith('"') and text.endswith('"')) or \
+               (text.startswith("'") and text.endswith("'")):
+                return text[1:-1]
+        return text
+
+    def check_condition(self, condition: Dict, prefix_tags: List[str], main_tags: List[str], postfix_tags: List[str],
+                        source_row=None) -> bool:
+        """조건 확인 - 논리 연산자 지원 (단건 평가용, 규칙 목록 실행은 run_rules 사용)"""
+        return compile_condition(condition)(RuleEvaluationContext(prefix_tags, main_tags, postfix_tags, source_row))
+    
+    def execute_action(self, action: Dict, prefix_tags: List[str], main_tags: List[str], postfix_tags: List[str],
+                       evaluation: Optional[RuleEvaluationContext] = None) -> tuple:
+        """
+        액션 실행 - 태그 리스트 처리 지원
+        evaluation을 넘기면 추가/제거된 태그를 색인에 반영하고, 대상 태그가 없는 삽입/대체는 검색 없이 건너뜁니다.
+        """
+        if action['type'] == 'append':
+            # 기존 추가 액션
+            target_list = action['target_list']
+            tag_list = action.get('tag_list', [action.get('tag', '')])
+            
+            if target_list == 'prefix':
+                prefix_tags.extend(tag_list)
+            elif target_list == 'postfix':
+                postfix_tags.extend(tag_list)
+            else:  # main (기본값)
+                main_tags.extend(tag_list)
+            if evaluation is not None:
+                evaluation.add_tags(tag_list)
+                
+        elif action['type'] == 'append_to_list':
+            # 리스트별 추가 액션 (prefix+=, main+=, postfix+=)
+            target_list = action['target_list']
+            tag_list = action.get('tag_list', [])
+            
+            if target_list == 'prefix':
+                prefix_tags.extend(tag_list)
+            elif target_list == 'postfix':
+                postfix_tags.extend(tag_list)
+            else:  # main
+                main_tags.extend(tag_list)
+            if evaluation is not None:
+                evaluation.add_tags(tag_list)
+                
+        elif action['type'] == 'insert':
+            # 삽입 액션 (기존 태그 검색)
+            existing_tag = action['existing_tag']
+            tag_list = action.get('tag_list', [action.get('new_tag', '')])
+            if evaluation is not None and existing_tag not in evaluation.joined:
+                return prefix_tags, main_tags, postfix_tags
+            
+            # prefix -> main -> postfix 순서로 검색, 찾은 태그 바로 뒤에 태그들을 한 번에 삽입
+            for tag_list_ref in [prefix_tags, main_tags, postfix_tags]:
+                i = _find_containing(tag_list_ref, existing_tag)
+                if i != -1:
+                    tag_list_ref[i + 1:i + 1] = tag_list
+                    if evaluation is not None:
+                        evaluation.add_tags(tag_list)
+                    return prefix_tags, main_tags, postfix_tags
+                        
+        elif action['type'] == 'replace':
+            # 대체 액션
+            old_tag = action['old_tag']
+            new_tag_list = action.get('new_tag_list', [action.get('new_tag', '')])
+            if evaluation is not None and old_tag not in evaluation.tag_counts:
+                return prefix_tags, main_tags, postfix_tags
+            
+            # prefix -> main -> postfix 순서로 검색하여 첫 번째 일치 항목 대체
+            for tag_list_ref in [prefix_tags, main_tags, postfix_tags]:
+                try:
+                    i = tag_list_ref.index(old_tag)
+                except ValueError:
+                    continue
+                # 기존 태그 자리를 새 태그들로 한 번에 교체
+                tag_list_ref[i:i + 1] = new_tag_list
+                if evaluation is not None:
+                    evaluation.remove_tag(old_tag)
+                    evaluation.add_tags(new_tag_list)
+                return prefix_tags, main_tags, postfix_tags
+        
+        return prefix_tags, main_tags, postfix_tags
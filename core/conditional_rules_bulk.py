@@ -0,0 +1,327 @@
+# core/conditional_rules_bulk.py
+
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.conditional_rules import (
+    ConditionalRuleEngine, RulePlan, parse_expression, action_added_tags, TAG_SEP,
+    RATING, EXACT, NOT_EXACT, CONTAINS, NOT_CONTAINS
+)
+
+# 검색 결과 전체(DataFrame)에 규칙 목록을 한 번에 적용하는 일괄 모드 (Qt 비의존).
+#
+# 행마다 규칙을 실행하는 대신, 조건 판정에 필요한 값만 '행 x 특성' 개수 행렬로 만들어 둡니다.
+# - 특성 0번: 행의 전체 태그 수 (빈 조건, 빈 태그 목록 판정)
+# - 정확 일치 특성: *tag / ~!tag 조건과 대체 액션의 old_tag 별 개수
+# - 부분 일치 특성: tag / ~tag 조건과 삽입 액션의 existing_tag 를 포함하는 태그 수
+# 규칙은 순서대로 NumPy 마스크로 평가하고, 조건을 만족한 행에만 액션이 추가/제거하는 태그의
+# 특성 변화를 더해 다음 규칙에 반영합니다. 결과는 행별 run_rules 실행과 같습니다.
+# 재작성된 프롬프트가 필요할 때만 실제로 액션이 실행된 행에서 액션을 순서대로 재생합니다.
+
+# 특성 행렬 한 청크의 최대 원소 수 (int32 기준 약 64MB)
+_MAX_FEATURE_CELLS = 16_000_000
+_TOTAL = 0
+
+class _FeatureSpace:
+    """규칙들이 참조하는 특성 번호 관리"""
+
+    def __init__(self):
+        self.exact: Dict[str, int] = {}
+        self.needles: Dict[str, int] = {'': _TOTAL}  # '' 부분 일치는 태그가 하나라도 있는지와 같음
+        self.size = 1
+
+    def exact_id(self, tag: str) -> int:
+        if tag not in self.exact:
+            self.exact[tag] = self.size
+            self.size += 1
+        return self.exact[tag]
+
+    def needle_id(self, needle: str) -> int:
+        if needle not in self.needles:
+            self.needles[needle] = self.size
+            self.size += 1
+        return self.needles[needle]
+
+    def tag_features(self, tag: str) -> List[int]:
+        """태그 하나가 추가/제거될 때 값이 바뀌는 특성 번호들 (모든 특성을 등록한 뒤 호출)"""
+        features = [_TOTAL]
+        if tag in self.exact:
+            features.append(self.exact[tag])
+        features.extend(index for needle, index in self.needles.items() if needle and needle in tag)
+        return features
+
+    def delta(self, added: Sequence[str], removed: Sequence[str] = ()) -> Tuple[Tuple[int, int], ...]:
+        """태그 추가/제거에 따른 (특성 번호, 증감) 목록"""
+        delta: Dict[int, int] = {}
+        for tag in added:
+            for index in self.tag_features(tag):
+                delta[index] = delta.get(index, 0) + 1
+        for tag in removed:
+            for index in self.tag_features(tag):
+                delta[index] = delta.get(index, 0) - 1
+        return tuple((index, value) for index, value in delta.items() if value)
+
+class _BulkRule:
+    """일괄 평가용 규칙: 조건 아톰은 특성 번호(등급은 값)로, 액션은 특성 증감으로 변환한 형태"""
+    __slots__ = ('groups', 'target', 'delta')
+
+    def __init__(self, groups, target: Optional[int]):
+        self.groups = groups  # None이면 항상 불일치 (조건 형식 오류)
+        self.target = target  # 삽입/대체 액션이 실제로 실행되려면 0보다 커야 하는 특성
+        self.delta: Tuple[Tuple[int, int], ...] = ()
+
+def _compile_bulk_rules(plan: RulePlan, space: _FeatureSpace) -> List[_BulkRule]:
+    bulk_rules = []
+    for rule in plan.rules:
+        groups = None
+        if rule.condition.get('type') == 'logical':
+            groups = []
+            for group in parse_expression(rule.condition['expression']):
+                atoms = []
+                for kind, value in group:
+                    if kind in (EXACT, NOT_EXACT):
+                        atoms.append((kind, space.exact_id(value)))
+                    elif kind in (CONTAINS, NOT_CONTAINS):
+                        atoms.append((kind, space.needle_id(value)))
+                    else:
+                        atoms.append((kind, value))
+                groups.append(tuple(atoms))
+
+        action = rule.action
+        target = None
+        if action['type'] == 'insert':
+            target = space.needle_id(action['existing_tag'])
+        elif action['type'] == 'replace':
+            target = space.exact_id(action['old_tag'])
+        bulk_rules.append(_BulkRule(groups, target))
+
+    # 모든 특성이 등록된 뒤에 액션별 특성 증감 계산
+    for rule, bulk_rule in zip(plan.rules, bulk_rules):
+        removed = [rule.action['old_tag']] if rule.action['type'] == 'replace' else []
+        bulk_rule.delta = space.delta(action_added_tags(rule.action), removed)
+    return bulk_rules
+
+def _code_feature_table(vocab_index: Dict[str, int], space: _FeatureSpace) -> Tuple[np.ndarray, np.ndarray]:
+    """태그 코드 -> 특성 번호들 (CSR 형식: ptr, features). 전체 태그 수(0번)는 제외"""
+    codes, features = [], []
+    vocab = list(vocab_index)
+    for tag, index in space.exact.items():
+        code = vocab_index.get(tag)
+        if code is not None:
+            codes.append(np.array([code], dtype=np.int64))
+            features.append(np.array([index], dtype=np.int64))
+
+    # 부분 일치: 어휘 전체를 구분자로 이은 문자열에서 find로 찾고 위치를 태그 코드로 변환
+    joined = TAG_SEP.join(vocab)
+    starts = np.zeros(len(vocab), dtype=np.int64)
+    if vocab:
+        starts[1:] = np.cumsum([len(tag) + 1 for tag in vocab[:-1]])
+    for needle, index in space.needles.items():
+        if not needle:
+            continue
+        positions = []
+        position = joined.find(needle)
+        while position != -1:
+            positions.append(position)
+            position = joined.find(needle, position + 1)
+        if positions:
+            matched = np.unique(np.searchsorted(starts, positions, side='right') - 1)
+            codes.append(matched)
+            features.append(np.full(len(matched), index, dtype=np.int64))
+
+    if codes:
+        codes = np.concatenate(codes)
+        features = np.concatenate(features)
+        order = np.argsort(codes, kind='stable')
+        codes, features = codes[order], features[order]
+    else:
+        codes = features = np.zeros(0, dtype=np.int64)
+    ptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=len(vocab)), out=ptr[1:])
+    return ptr, features
+
+def _feature_matrix(codes: np.ndarray, lengths: np.ndarray, ptr: np.ndarray, table: np.ndarray,
+                    base: np.ndarray) -> np.ndarray:
+    """청크의 (특성 수 x 행 수) 개수 행렬"""
+    rows = len(lengths)
+    size = len(base)
+    row_of_tag = np.repeat(np.arange(rows, dtype=np.int64), lengths)
+    degree = (ptr[1:] - ptr[:-1])[codes]
+    total = int(degree.sum())
+    if total:
+        first = np.repeat(ptr[codes], degree)
+        offset = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(degree) - degree, degree)
+        flat = table[first + offset] * rows + np.repeat(row_of_tag, degree)
+        matrix = np.bincount(flat, minlength=size * rows).astype(np.int32).reshape(size, rows)
+    else:
+        matrix = np.zeros((size, rows), dtype=np.int32)
+    matrix[_TOTAL] += lengths
+    matrix += base[:, None]
+    return matrix
+
+def _rating_mask(ratings: Optional[np.ndarray], kind: str, value: str, rows: int) -> np.ndarray:
+    """등급 조건 마스크 (행별 평가와 같이 rating이 None이면 항상 거짓, NaN은 불일치로 취급)"""
+    if ratings is None:
+        return np.zeros(rows, dtype=bool)
+    if kind == RATING:
+        return ratings == value
+    return (ratings != value) & np.not_equal(ratings, None)
+
+def apply_rules_bulk(engine: ConditionalRuleEngine, rules_text: str, df: pd.DataFrame,
+                     prefix_tags: Sequence[str] = (), postfix_tags: Sequence[str] = (),
+                     output_path: Optional[str] = None, chunk_size: int = 200_000,
+                     progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict:
+    """
+    검색 결과 DataFrame 전체에 규칙을 적용하고 규칙별 적중 수를 집계합니다.
+    각 행은 prefix_tags + 'general' 칸의 태그(main) + postfix_tags, 등급은 'rating' 칸으로 평가합니다.
+    output_path를 주면 원본 칸에 재작성된 프롬프트('prompt' 칸)를 더해 parquet으로 저장합니다.
+
+    반환값: {'rows', 'changed_rows', 'rules': [{'rule', 'met', 'applied'}], 'elapsed', 'output_path'}
+    - met: 조건을 만족한 행 수 / applied: 액션이 실제로 태그를 바꾼 행 수 (삽입/대체 대상이 없으면 제외)
+    """
+    start_time = time.perf_counter()
+    plan = engine.compile_rules(rules_text)
+    prefix_tags, postfix_tags = list(prefix_tags), list(postfix_tags)
+
+    space = _FeatureSpace()
+    bulk_rules = _compile_bulk_rules(plan, space)
+    base = np.zeros(space.size, dtype=np.int32)
+    for index, value in space.delta(prefix_tags + postfix_tags):
+        base[index] = value
+
+    total_rows = len(df)
+    general = df['general'].to_numpy(dtype=object) if 'general' in df.columns else np.full(total_rows, None, dtype=object)
+    ratings = df['rating'].to_numpy(dtype=object) if 'rating' in df.columns else None
+    chunk_rows = max(1, min(chunk_size, _MAX_FEATURE_CELLS // space.size))
+
+    # 1단계: 태그를 전체 어휘 기준 정수 코드로 변환
+    # 청크의 문자열을 콤마로 이어 한 번에 나누고, 공백 제거는 factorize로 얻은 고유 토큰에만 적용합니다.
+    vocab_index: Dict[str, int] = {}
+    chunks = []
+    for begin in range(0, total_rows, chunk_rows):
+        texts = [value if isinstance(value, str) else '' for value in general[begin:begin + chunk_rows]]
+        rows = len(texts)
+        token_counts = np.fromiter((text.count(',') for text in texts), dtype=np.int64, count=rows) + 1
+        token_codes, tokens = pd.factorize(np.array(','.join(texts).split(','), dtype=object))
+        # 빈 태그는 -1로 표시해 제외 (규칙 테스트의 general 분리와 같은 결과, 문자열이 아닌 칸은 태그 없음)
+        global_codes = np.fromiter(
+            (vocab_index.setdefault(tag, len(vocab_index)) if tag else -1 for tag in (token.strip() for token in tokens)),
+            dtype=np.int64, count=len(tokens)
+        )
+        codes = global_codes[token_codes]
+        kept = codes >= 0
+        row_of_token = np.repeat(np.arange(rows, dtype=np.int64), token_counts)
+        lengths = np.bincount(row_of_token[kept], minlength=rows).astype(np.int32)
+        chunks.append((begin, codes[kept], lengths))
+    ptr, table = _code_feature_table(vocab_index, space)
+    vocab = np.array(list(vocab_index), dtype=object) if output_path else None
+
+    # 2단계: 청크별 특성 행렬을 만들고 규칙을 순서대로 마스크로 평가
+    met_counts = np.zeros(len(bulk_rules), dtype=np.int64)
+    applied_counts = np.zeros(len(bulk_rules), dtype=np.int64)
+    changed_rows = 0
+    prompts = [] if output_path else None
+
+    for begin, codes, lengths in chunks:
+        rows = len(lengths)
+        matrix = _feature_matrix(codes, lengths, ptr, table, base)
+        rating_chunk = ratings[begin:begin + rows] if ratings is not None else None
+        rating_masks = {}
+        changed = np.zeros(rows, dtype=bool)
+        fired_rows, fired_rules = [], []
+
+        for rule_index, rule in enumerate(bulk_rules):
+            if rule.groups is None:
+                continue
+            met = np.ones(rows, dtype=bool)
+            for group in rule.groups:
+                satisfied = np.zeros(rows, dtype=bool)
+                for kind, value in group:
+                    if kind == EXACT or kind == CONTAINS:
+                        satisfied |= matrix[value] > 0
+                    elif kind == NOT_EXACT or kind == NOT_CONTAINS:
+                        satisfied |= matrix[value] == 0
+                    else:
+                        key = (kind, value)
+                        if key not in rating_masks:
+                            rating_masks[key] = _rating_mask(rating_chunk, kind, value, rows)
+                        satisfied |= rating_masks[key]
+                met &= satisfied
+                if not met.any():
+                    break
+            met_counts[rule_index] += int(met.sum())
+
+            applied = met if rule.target is None else met & (matrix[rule.target] > 0)
+            applied_rows = np.flatnonzero(applied)
+            if not len(applied_rows):
+                continue
+            applied_counts[rule_index] += len(applied_rows)
+            if rule.delta:
+                for feature, value in rule.delta:
+                    matrix[feature, applied_rows] += value
+                changed[applied_rows] = True
+            if prompts is not None:
+                fired_rows.append(applied_rows)
+                fired_rules.append(np.full(len(applied_rows), rule_index, dtype=np.int64))
+
+        changed_rows += int(changed.sum())
+        if prompts is not None:
+            prompts.extend(_replay_chunk(engine, plan, vocab[codes].tolist(), lengths, prefix_tags, postfix_tags,
+                                         fired_rows, fired_rules))
+        if progress_callback:
+            progress_callback(begin + rows, total_rows)
+
+    if output_path:
+        df.assign(prompt=prompts).to_parquet(output_path)
+
+    return {
+        'rows': total_rows,
+        'changed_rows': changed_rows,
+        'rules': [
+            {'rule': rule.original, 'met': int(met), 'applied': int(applied)}
+            for rule, met, applied in zip(plan.rules, met_counts, applied_counts)
+        ],
+        'elapsed': time.perf_counter() - start_time,
+        'output_path': output_path,
+    }
+
+def _replay_chunk(engine: ConditionalRuleEngine, plan: RulePlan, tags: List[str], lengths: np.ndarray,
+                  prefix_tags: List[str], postfix_tags: List[str],
+                  fired_rows: List[np.ndarray], fired_rules: List[np.ndarray]) -> List[str]:
+    """
+    액션이 실행된 행에서만 해당 액션들을 규칙 순서대로 재생해 최종 프롬프트를 만듭니다.
+    tags는 청크의 main 태그를 이어 붙인 목록이며, 행별 main_tags는 lengths로 잘라 얻습니다.
+    """
+    ends = np.cumsum(lengths).tolist()
+    starts = [0] + ends[:-1]
+    prompts = [', '.join(prefix_tags + tags[start:end] + postfix_tags) for start, end in zip(starts, ends)]
+    if not fired_rows:
+        return prompts
+    rows = np.concatenate(fired_rows)
+    rule_indices = np.concatenate(fired_rules)
+    order = np.lexsort((rule_indices, rows))
+    rows, rule_indices = rows[order].tolist(), rule_indices[order].tolist()
+
+    position = 0
+    while position < len(rows):
+        row = rows[position]
+        prefix, main, postfix = prefix_tags.copy(), tags[starts[row]:ends[row]], postfix_tags.copy()
+        while position < len(rows) and rows[position] == row:
+            prefix, main, postfix = engine.execute_action(plan.rules[rule_indices[position]].action, prefix, main, postfix)
+            position += 1
+        prompts[row] = ', '.join(prefix + main + postfix)
+    return prompts
+
+def format_bulk_report(report: Dict) -> List[str]:
+    """apply_rules_bulk 결과를 실행 로그 형식의 문자열 목록으로 변환"""
+    logs = [f"=== 전체 결과 적용: {report['rows']:,}행, {report['elapsed']:.2f}s ==="]
+    for result in report['rules']:
+        logs.append(f"[Rule: {result['rule']}] -> 조건 충족 {result['met']:,}행 / 적용 {result['applied']:,}행")
+    logs.append("")
+    logs.append(f"태그가 바뀐 행: {report['changed_rows']:,} / {report['rows']:,}")
+    if report.get('output_path'):
+        logs.append(f"저장 완료: {report['output_path']}")
+    return logs
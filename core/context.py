@@ -4,28 +4,39 @@ from interfaces.base_module import BaseMiddleModule
 from core.filter_data_manager import FilterDataManager
 from core.secure_token_manager import SecureTokenManager
 from core.wildcard_manager import WildcardManager
+from core.wildcard_state_store import WildcardStateStore
 from core.tag_data_manager import TagDataManager
+from core.kr_tag_lookup import KRTagLookup
 from core.prompt_context import PromptContext
 from core.mode_ware_manager import ModeAwareModuleManager
 from core.comfyui_workflow_manager import ComfyUIWorkflowManager
+import os
 import pandas as pd
+from types import MappingProxyType
+from core.hook_profiler import HookProfiler
+from core.pipeline_tracer import PipelineTracer
 from datetime import datetime 
 from pathlib import Path       
 
 if TYPE_CHECKING:
     from NAIA_cold_v4 import ModernMainWindow
     from core.middle_section_controller import MiddleSectionController
+    from core.wildcard_watcher import WildcardWatcher
     from interfaces.mode_aware_module import ModeAwareModule
 
 class AppContext:
     """애플리케이션의 공유 자원 및 상태를 관리하는 컨텍스트"""
-    def __init__(self, main_window: 'ModernMainWindow', wildcard_manager: WildcardManager, tag_data_manager: 'TagDataManager'):
+    def __init__(self, main_window: 'ModernMainWindow', wildcard_manager: WildcardManager, tag_data_manager: 'TagDataManager', kr_tag_lookup: Optional[KRTagLookup] = None):
         from core.api_service import APIService
         
         self.main_window = main_window
         self.wildcard_manager = wildcard_manager
         self.tag_data_manager = tag_data_manager
+        # KR_tags.parquet 조회 서비스 (태그 설명/카테고리/한글 키워드)
+        self.kr_tag_lookup = kr_tag_lookup
         self.middle_section_controller: Optional['MiddleSectionController'] = None
+        # wildcards/ 폴더 감시 및 백그라운드 증분 리로드 (GUI 실행 시 main_window에서 설정)
+        self.wildcard_watcher: Optional['WildcardWatcher'] = None
         self.api_service = APIService(self)
         self.comfyui_workflow_manager = ComfyUIWorkflowManager()
 
@@ -39,10 +50,20 @@ class AppContext:
         # [신규] 파이프라인 훅을 저장할 레지스트리
         # 구조: { 'PipelineName': { 'HookPoint': [(priority, module_instance), ...] } }
         self.pipeline_hooks = {}
+        # PromptProcessor가 매 프롬프트마다 조회하는 읽기 전용 훅 디스패치 테이블
+        # 구조: { ('PipelineName', 'HookPoint'): ((module_instance, title), ...) }
+        # register_pipeline_hook 호출 시에만 다시 만들어집니다.
+        self.hook_dispatch = MappingProxyType({})
+        # 훅별 실행 시간 통계 (NAIA_HOOK_TIMING=true 일 때만 기록)
+        self.hook_profiler = HookProfiler(enabled=os.environ.get("NAIA_HOOK_TIMING", "false").lower() == "true")
+        # PromptProcessor 단계 이벤트 (구독자가 없으면 비활성, HookerView 등이 사용)
+        self.pipeline_tracer = PipelineTracer()
         self.secure_token_manager = SecureTokenManager()
         self.filter_data_manager = FilterDataManager()
         self.current_source_row: Optional[pd.Series] = None
         self.current_prompt_context: Optional[PromptContext] = None
+        # 순차 와일드카드 카운터 영속화 (재시작 후 첫 컨텍스트에 복원)
+        self.wildcard_state_store = WildcardStateStore()
         session_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         self.session_save_path = Path("output") / session_timestamp
         self.session_save_path.mkdir(parents=True, exist_ok=True)
@@ -140,13 +161,24 @@ class AppContext:
         
         # 등록 후 우선순위에 따라 정렬
         self.pipeline_hooks[pipeline_name][hook_point].sort(key=lambda x: x[0])
+        self._rebuild_hook_dispatch()
         print(f"훅 등록 완료: [{pipeline_name}/{hook_point}] (priority: {priority}) - {module_instance.get_title()}")
 
+    def _rebuild_hook_dispatch(self):
+        """정렬된 훅 레지스트리로부터 디스패치 테이블을 새로 만들어 통째로 교체합니다."""
+        self.hook_dispatch = MappingProxyType({
+            (pipeline_name, hook_point): tuple((module_instance, module_instance.get_title()) for _, module_instance in hooks)
+            for pipeline_name, hook_points in self.pipeline_hooks.items()
+            for hook_point, hooks in hook_points.items()
+        })
+
     def get_pipeline_hooks(self, pipeline_name: str, hook_point: str) -> list['BaseMiddleModule']:
         """특정 파이프라인/훅 포인트에 등록된 모듈 인스턴스 목록을 반환합니다."""
-        hooks = self.pipeline_hooks.get(pipeline_name, {}).get(hook_point, [])
-        # 정렬된 튜플에서 모듈 인스턴스만 추출하여 반환
-        return [module_instance for priority, module_instance in hooks]
+        return [module_instance for module_instance, _ in self.hook_dispatch.get((pipeline_name, hook_point), ())]
+
+    def get_hook_stats(self) -> dict:
+        """훅별 실행 통계 복사본을 반환합니다. (hook_profiler가 활성화된 경우에만 채워짐)"""
+        return self.hook_profiler.snapshot()
     
     def register_settings_manager(self, settings_manager):
         """Settings 탭에서 설정 관리자를 등록"""
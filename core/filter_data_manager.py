@@ -1,5 +1,6 @@
 import os
-from typing import List
+import re
+from typing import FrozenSet, List, Optional, Pattern
 
 class FilterDataManager:
     """
@@ -12,6 +13,13 @@ class FilterDataManager:
         self.clothes_list: List[str] = []
         self.color_list: List[str] = []
         self.characteristic_list: List[str] = []
+
+        # 태그 필터링용 조회 구조 (load_all_filters에서 목록과 함께 다시 만듦)
+        # - 의상/캐릭터 특징: 정확 일치 검사용 frozenset
+        # - 색상: '색상 단어를 포함하는 태그' 검사용 정규식 하나 (any(color in tag ...)와 동일)
+        self.clothes_set: FrozenSet[str] = frozenset()
+        self.characteristic_set: FrozenSet[str] = frozenset()
+        self.color_pattern: Optional[Pattern[str]] = None
         
         # 클래스 생성 시 모든 파일을 로드
         self.load_all_filters()
@@ -38,4 +46,17 @@ class FilterDataManager:
         """정의된 모든 필터 파일을 로드합니다."""
         self.clothes_list = self._load_list_from_file('clothes_list.txt')
         self.color_list = self._load_list_from_file('color.txt')
-        self.characteristic_list = self._load_list_from_file('characteristic_list.txt')
\ No newline at end of file
+        self.characteristic_list = self._load_list_from_file('characteristic_list.txt')
+
+        self.clothes_set = frozenset(self.clothes_list)
+        self.characteristic_set = frozenset(self.characteristic_list)
+        self.color_pattern = self._compile_substring_pattern(self.color_list)
+
+    @staticmethod
+    def _compile_substring_pattern(words: List[str]) -> Optional[Pattern[str]]:
+        """단어 목록 중 하나라도 포함하는지 한 번에 검사하는 정규식 (목록이 비면 None)"""
+        if not words:
+            return None
+        # 긴 단어를 먼저 두어 겹치는 단어가 있어도 탐색이 빨리 끝나도록 정렬
+        alternatives = sorted(set(words), key=len, reverse=True)
+        return re.compile('|'.join(map(re.escape, alternatives)))
\ No newline at end of file
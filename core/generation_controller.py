@@ -6,6 +6,8 @@ import json
 import re, random
 from PyQt6.QtCore import QThread, QObject, pyqtSignal, QTimer
 import pandas as pd
+from core.prompt_context import PromptContext
+from core.wildcard_processor import WildcardProcessor
 
 class GenerationWorker(QObject):
     """API 호출을 담당하는 워커 클래스"""
@@ -19,11 +21,13 @@ class GenerationWorker(QObject):
         self.context = context
         self.params = None
         self.source_row = None
+        self.wildcard_record = {}
         
-    def set_generation_params(self, params: dict, source_row):
-        """생성 파라미터와 소스 행을 설정합니다."""
+    def set_generation_params(self, params: dict, source_row, wildcard_record: dict = None):
+        """생성 파라미터와 소스 행, 와일드카드 재현 정보(확장 전 입력, 시드)를 설정합니다."""
         self.params = params
         self.source_row = source_row
+        self.wildcard_record = wildcard_record or {}
         
     def run_generation(self):
         """별도 스레드에서 실행될 생성 작업"""
@@ -137,7 +141,8 @@ class GenerationWorker(QObject):
                 'negative_prompt': self.params.get('negative_prompt', ''),
                 'main_prompt': main_prompt_raw,  # 🆕 UI에서 가져온 원본 프롬프트 (\n\n 포함)
                 'source_tags': self.source_row.to_dict() if self.source_row is not None else {},
-                'wildcard_resolved': self.source_row is not None
+                'wildcard_resolved': self.source_row is not None,
+                **self.wildcard_record  # wildcard_template / wildcard_seed / wildcard_counters / wildcard_state (같은 프롬프트 재현용)
             }
             
             # API 메타데이터
@@ -180,6 +185,9 @@ class GenerationController:
         self.auto_retry_count = 0
         self.max_auto_retries = 3  # 자동 생성 시 최대 재시도 횟수
         self.retry_delay_ms = 2000  # 재시도 간격 (밀리초)
+
+        # 입력 프롬프트 와일드카드 확장용 (생성마다 새로 만들지 않고 재사용)
+        self.wildcard_processor = WildcardProcessor(self.context.wildcard_manager)
         
     def execute_generation_pipeline(self, overrides: dict = None):
         """7단계 생성 파이프라인을 실행합니다."""
@@ -262,8 +270,10 @@ class GenerationController:
                 params['workflow'] = final_workflow
 
             # --- 와일드카드 확장 처리 (API 호출 전) ---
+            wildcard_record = {}
             if 'input' in params and params['input']:
-                expanded_input = self._expand_wildcards_in_input(params['input'])
+                wildcard_record['wildcard_template'] = params['input']
+                expanded_input = self._expand_wildcards_in_input(params['input'], wildcard_record)
                 params['input'] = expanded_input
                 print(f"🎲 와일드카드 확장: '{params['input'][:50]}{'...' if len(params['input']) > 50 else ''}'")
                 
@@ -278,13 +288,13 @@ class GenerationController:
                     self.context.publish("prompt_generated", self.context.current_prompt_context)
             
             # --- 5. 스레드에서 API 호출 시작 ---
-            self._start_threaded_generation(params, source_row)
+            self._start_threaded_generation(params, source_row, wildcard_record)
 
         except Exception as e:
             self.context.main_window.status_bar.showMessage(f"❌ 생성 준비 오류: {e}")
             print(f"오류 발생: {e}")
     
-    def _start_threaded_generation(self, params: dict, source_row):
+    def _start_threaded_generation(self, params: dict, source_row, wildcard_record: dict = None):
         """별도 스레드에서 생성 작업을 시작합니다."""
         # 새 스레드와 워커 생성
         self.generation_thread = QThread()
@@ -306,7 +316,7 @@ class GenerationController:
         self.generation_thread.finished.connect(self._on_thread_finished)
         
         # 파라미터 설정 및 스레드 시작
-        self.generation_worker.set_generation_params(params, source_row)
+        self.generation_worker.set_generation_params(params, source_row, wildcard_record)
         self.generation_thread.start()
     
     def _on_generation_started(self):
@@ -431,8 +441,11 @@ class GenerationController:
             self.generation_worker.deleteLater()
             self.generation_worker = None
 
-    def _expand_wildcards_in_input(self, input_text: str) -> str:
-        """generation_controller 전용 와일드카드 처리 (_expand_recursive와 동일한 기능 지원)"""
+    def _expand_wildcards_in_input(self, input_text: str, wildcard_record: dict = None) -> str:
+        """
+        generation_controller 전용 와일드카드 처리 (_expand_recursive와 동일한 기능 지원)
+        wildcard_record를 주면 재현에 필요한 시드와 확장 직전의 카운터/상태를 기록합니다.
+        """
         if not input_text or not input_text.strip():
             return input_text
         
@@ -450,23 +463,36 @@ class GenerationController:
                     settings={}
                 )
                 prompt_context = self.context.current_prompt_context
-            
-            # WildcardProcessor를 사용하여 기존 처리 방식과 동일하게 처리
-            from core.wildcard_processor import WildcardProcessor
-            wildcard_processor = WildcardProcessor(self.context.wildcard_manager)
+                # 저장된 순차 카운터에서 이어서 진행
+                self.context.wildcard_state_store.restore_into(prompt_context)
+            
+            # 파이프라인이 이미 시드를 정한 컨텍스트는 다시 시드하지 않고, 이번 입력 확장 전용 컨텍스트를 만듦
+            # (순차 카운터/상태는 공유하여 계속 진행, 시드와 확장 직전 카운터는 이 컨텍스트에 한 번만 기록)
+            input_context = PromptContext(
+                source_row=prompt_context.source_row,
+                settings=prompt_context.settings,
+                sequential_counters=prompt_context.sequential_counters,
+                wildcard_state=prompt_context.wildcard_state,
+            )
+            self.wildcard_processor.seed_context(input_context)
+            if wildcard_record is not None:
+                for key in ('wildcard_seed', 'wildcard_counters', 'wildcard_state'):
+                    wildcard_record[key] = input_context.metadata[key]
             
             # 1. 전체 문자열을 콤마로 분해하여 태그 리스트 생성 (기존 방식과 동일)
             input_tags = [tag.strip() for tag in input_text.split(',') if tag.strip()]
             
             # 2. expand_tags 호출하여 완전한 와일드카드 확장 수행 (기존 방식과 동일)
-            expanded_tags = wildcard_processor.expand_tags(input_tags, prompt_context)
+            expanded_tags = self.wildcard_processor.expand_tags(input_tags, input_context)
+            
+            # 와일드카드 상태 모듈이 이번 선택도 표시하도록 공유 컨텍스트의 히스토리에 추가
+            for name, values in input_context.wildcard_history.items():
+                prompt_context.wildcard_history.setdefault(name, []).extend(values)
             
             # 3. global_append_tags가 있다면 뒤에 추가 (기존 방식과 동일)
             result_parts = expanded_tags.copy()
-            if prompt_context.global_append_tags:
-                result_parts.extend(prompt_context.global_append_tags)
-                # global_append_tags 소비 후 초기화
-                prompt_context.global_append_tags.clear()
+            if input_context.global_append_tags:
+                result_parts.extend(input_context.global_append_tags)
             
             # 4. 확장된 태그들을 콤마로 연결하여 단일 문자열로 반환
             expanded_result = ', '.join(result_parts) if result_parts else input_text
@@ -513,27 +539,18 @@ class GenerationController:
             main_tags = input_tags.copy()
             postfix_tags = []
             
-            # 조건부 프롬프트 규칙 적용
-            rules = conditional_module._parse_rules(rules_text)
-            
-            for rule in rules:
-                try:
-                    condition = rule['condition']
-                    action = rule['action']
-                    
-                    # 조건 확인
-                    condition_met = conditional_module._check_condition(condition, prefix_tags, main_tags, postfix_tags)
-                    
-                    if condition_met:
-                        # 액션 실행
-                        prefix_tags, main_tags, postfix_tags = conditional_module._execute_action(
-                            action, prefix_tags, main_tags, postfix_tags
-                        )
-                        print(f"  ✅ 규칙 적용: {rule['original']}")
-                        
-                except Exception as e:
-                    print(f"  ⚠️ 규칙 처리 오류: {e}")
-                    continue
+            # 조건부 프롬프트 규칙 적용 (모듈의 규칙 엔진이 컴파일해 둔 규칙을 공유)
+            rule_engine = conditional_module.rule_engine
+            rules = rule_engine.compile_rules(rules_text)
+            prefix_tags, main_tags, postfix_tags, rule_results = rule_engine.run_rules(
+                rules, prefix_tags, main_tags, postfix_tags, conditional_module._current_source_row()
+            )
+            
+            for result in rule_results:
+                if result['met']:
+                    print(f"  ✅ 규칙 적용: {result['rule']}")
+                elif 'error' in result:
+                    print(f"  ⚠️ 규칙 처리 오류: {result['error']}")
             
             # 결과를 다시 문자열로 결합
             result_tags = prefix_tags + main_tags + postfix_tags
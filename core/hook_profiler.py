@@ -0,0 +1,57 @@
+# core/hook_profiler.py
+
+from dataclasses import dataclass, asdict
+from typing import Dict
+
+@dataclass
+class HookStats:
+    """훅 하나(파이프라인/훅 포인트/모듈)의 누적 실행 통계"""
+    calls: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+class HookProfiler:
+    """
+    파이프라인 훅별 실행 횟수/누적 시간/최대 시간을 집계합니다.
+    enabled가 False이면 PromptProcessor가 시간을 재지 않으므로 비용이 없습니다.
+    (NAIA_HOOK_TIMING=true 환경 변수 또는 AppContext.hook_profiler.enabled = True 로 활성화)
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.stats: Dict[str, HookStats] = {}
+
+    def record(self, pipeline_name: str, hook_point: str, title: str, elapsed_ms: float, failed: bool = False):
+        key = f"{pipeline_name}/{hook_point}/{title}"
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = HookStats()
+        stats.calls += 1
+        stats.total_ms += elapsed_ms
+        if elapsed_ms > stats.max_ms:
+            stats.max_ms = elapsed_ms
+        if failed:
+            stats.errors += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """현재 통계의 복사본 ({'파이프라인/훅 포인트/모듈': {calls, errors, total_ms, max_ms, avg_ms}})"""
+        return {key: {**asdict(stats), 'avg_ms': stats.avg_ms} for key, stats in self.stats.items()}
+
+    def reset(self):
+        self.stats.clear()
+
+    def print_summary(self, limit: int = 10):
+        """누적 시간이 큰 순서로 상위 훅을 출력합니다."""
+        if not self.stats:
+            print("ℹ️ 기록된 훅 실행 통계가 없습니다.")
+            return
+        print("⏱️ 파이프라인 훅 실행 통계 (누적 시간 순)")
+        ranked = sorted(self.stats.items(), key=lambda item: item[1].total_ms, reverse=True)
+        for key, stats in ranked[:limit]:
+            print(f"  {key}: {stats.calls}회, 합계 {stats.total_ms:.1f}ms, "
+                  f"평균 {stats.avg_ms:.2f}ms, 최대 {stats.max_ms:.2f}ms, 오류 {stats.errors}회")
@@ -0,0 +1,189 @@
+# core/kr_tag_lookup.py
+
+import os
+import re
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+
+# --- 한글 자모 분해 (부분 입력 검색용) ---
+# 조합 중인 입력(예: '기' -> '긴' -> '긴 머')도 접두사로 일치하도록
+# 음절을 초성/중성/종성으로, 겹모음/겹받침은 낱자로 풀어서 비교합니다.
+_HANGUL_RE = re.compile('[\u1100-\u11ff\u3130-\u318f\uac00-\ud7a3]')
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONGSEONG = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+              "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+_COMPOUND_JAMO = {
+    'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ', 'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ', 'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ',
+    'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ', 'ㄽ': 'ㄹㅅ',
+    'ㄾ': 'ㄹㅌ', 'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ',
+}
+
+def contains_hangul(text: str) -> bool:
+    """문자열에 한글(음절 또는 자모)이 포함되어 있는지 확인합니다."""
+    return bool(text) and _HANGUL_RE.search(text) is not None
+
+def decompose_hangul(text: str) -> str:
+    """한글 음절을 낱자 자모열로 분해합니다. 공백은 제거하고 그 외 문자는 소문자로 유지합니다."""
+    result = []
+    for char in text:
+        code = ord(char) - 0xAC00
+        if 0 <= code < 11172:
+            result.append(_CHOSEONG[code // 588])
+            jung = _JUNGSEONG[(code % 588) // 28]
+            result.append(_COMPOUND_JAMO.get(jung, jung))
+            jong = _JONGSEONG[code % 28]
+            result.append(_COMPOUND_JAMO.get(jong, jong))
+        elif char.isspace():
+            continue
+        else:
+            result.append(_COMPOUND_JAMO.get(char, char.lower()))
+    return ''.join(result)
+
+class KRTagLookup:
+    """
+    data/KR_tags.parquet 조회 서비스.
+    파일은 백그라운드 스레드에서 지연 로드하고, 로드 시점에 태그 -> 행 오프셋
+    해시 인덱스를 만들어 두어 우클릭 메뉴/자동완성 툴팁 등에서 O(1)로 조회합니다.
+    keywords 컬럼으로는 자모 분해된 키워드 -> 태그 오프셋 역색인을 만들어
+    한글 키워드/별칭 입력을 영문 태그로 연결합니다.
+    """
+    DEFAULT_PATH = os.path.join('data', 'KR_tags.parquet')
+
+    def __init__(self, filepath: str = DEFAULT_PATH):
+        self.filepath = filepath
+        self.df = pd.DataFrame()
+        self._tag_index: Dict[str, int] = {}
+        # 역색인: 정렬된 자모 분해 키워드와 그에 대응하는 태그 오프셋 목록 (bisect 접두사 검색)
+        self._keyword_keys: List[str] = []
+        self._keyword_postings: List[Tuple[int, ...]] = []
+        self._counts: List[int] = []
+        self._loaded_event = threading.Event()
+        self._load_thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start_background_load(self):
+        """백그라운드 로드를 시작합니다. 이미 시작되었다면 아무것도 하지 않습니다."""
+        with self._lock:
+            if self._load_thread is not None:
+                return
+            self._load_thread = threading.Thread(target=self._load, name="KRTagLookupLoader", daemon=True)
+            self._load_thread.start()
+
+    def _load(self):
+        """parquet 파일을 읽고 태그 인덱스를 구축합니다. (백그라운드 스레드)"""
+        df = pd.DataFrame()
+        tag_index: Dict[str, int] = {}
+        keyword_keys: List[str] = []
+        keyword_postings: List[Tuple[int, ...]] = []
+        counts: List[int] = []
+        try:
+            if os.path.exists(self.filepath):
+                print(f"🔍 '{self.filepath}' 파일 로딩 중...")
+                df = pd.read_parquet(self.filepath)
+                # 중복 태그는 기존 동작(iloc[0])과 같이 첫 번째 행을 사용
+                for offset, tag in enumerate(df['tag'].tolist()):
+                    if isinstance(tag, str) and tag not in tag_index:
+                        tag_index[tag] = offset
+                keyword_keys, keyword_postings = self._build_keyword_index(df, tag_index)
+                if 'count' in df.columns:
+                    counts = [int(c) if pd.notna(c) else 0 for c in df['count'].tolist()]
+                else:
+                    counts = [0] * len(df)
+                print(f"✅ '{self.filepath}' 로딩 완료. {len(df):,}개 태그.")
+            else:
+                print(f"⚠️ '{self.filepath}' 파일을 찾을 수 없습니다.")
+        except Exception as e:
+            print(f"❌ '{self.filepath}' 파일 로딩 실패: {e}")
+            df, tag_index = pd.DataFrame(), {}
+            keyword_keys, keyword_postings, counts = [], [], []
+
+        # 인덱스가 완성된 뒤에 한 번에 교체하여 조회 스레드가 중간 상태를 보지 않도록 함
+        self.df = df
+        self._tag_index = tag_index
+        self._keyword_keys = keyword_keys
+        self._keyword_postings = keyword_postings
+        self._counts = counts
+        self._loaded_event.set()
+
+    @staticmethod
+    def _build_keyword_index(df: pd.DataFrame, tag_index: Dict[str, int]) -> Tuple[List[str], List[Tuple[int, ...]]]:
+        """
+        keywords 컬럼('<분류>, 키워드1, 키워드2')에서 역색인을 만듭니다.
+        각 키워드 전체와 키워드를 이루는 단어 각각을 자모 분해한 키로 등록하므로
+        '긴 머리'는 '긴머리', '긴', '머리' 어느 쪽으로 입력해도 찾을 수 있습니다.
+        """
+        if 'keywords' not in df.columns:
+            return [], []
+
+        postings: Dict[str, set] = {}
+        for tag, keywords in zip(df['tag'].tolist(), df['keywords'].tolist()):
+            offset = tag_index.get(tag)
+            if offset is None or not isinstance(keywords, str):
+                continue
+            for keyword in keywords.split(','):
+                keyword = keyword.strip().strip('<>').strip()
+                if not keyword:
+                    continue
+                for token in {keyword, *keyword.split()}:
+                    key = decompose_hangul(token)
+                    if key:
+                        postings.setdefault(key, set()).add(offset)
+
+        keys = sorted(postings)
+        return keys, [tuple(postings[key]) for key in keys]
+
+    def search_keywords(self, query: str, limit: int = 40) -> List[Tuple[str, int]]:
+        """
+        한글 키워드/별칭(부분 입력 포함)으로 영문 태그를 찾습니다.
+        자모 분해한 질의어를 정렬된 키 목록에서 bisect로 접두사 범위 검색한 뒤
+        사용 횟수 순으로 (tag, count) 목록을 반환합니다.
+        """
+        if not self.is_loaded() or not query:
+            return []
+        prefix = decompose_hangul(query.strip())
+        if not prefix:
+            return []
+
+        keys = self._keyword_keys
+        postings = self._keyword_postings
+        offsets = set()
+        position = bisect_left(keys, prefix)
+        while position < len(keys) and keys[position].startswith(prefix):
+            offsets.update(postings[position])
+            position += 1
+
+        if not offsets:
+            return []
+        tags = self.df['tag']
+        ranked = sorted(offsets, key=lambda offset: self._counts[offset], reverse=True)[:limit]
+        return [(tags.iat[offset], self._counts[offset]) for offset in ranked]
+
+    def is_loaded(self) -> bool:
+        """로드 완료 여부를 반환합니다."""
+        return self._loaded_event.is_set()
+
+    def wait_until_loaded(self, timeout: Optional[float] = None) -> bool:
+        """로드가 끝날 때까지 대기합니다. 로드를 시작하지 않았다면 먼저 시작합니다."""
+        self.start_background_load()
+        return self._loaded_event.wait(timeout)
+
+    def lookup(self, tag: str) -> Optional[pd.Series]:
+        """
+        태그에 해당하는 행(tag, count, category, desc, keywords)을 반환합니다.
+        아직 로드 중이거나 태그가 없으면 None을 반환합니다. (호출 스레드를 막지 않음)
+        """
+        if not tag or not self.is_loaded():
+            return None
+        offset = self._tag_index.get(tag)
+        if offset is None:
+            return None
+        return self.df.iloc[offset]
+
+    def __contains__(self, tag: str) -> bool:
+        return self.is_loaded() and tag in self._tag_index
+
+    def __len__(self) -> int:
+        return len(self._tag_index)
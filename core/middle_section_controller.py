@@ -2,9 +2,7 @@
 
 import os
 import glob
-import importlib.util
 import traceback
-from pathlib import Path
 from typing import Optional
 from PyQt6.QtWidgets import QVBoxLayout, QWidget
 from ui.collapsible import EnhancedCollapsibleBox  # 수정된 import
@@ -12,6 +10,8 @@ from ui.detached_window import DetachedWindow  # 추가 import
 from interfaces.base_module import BaseMiddleModule
 from interfaces.mode_aware_module import ModeAwareModule
 from core.context import AppContext 
+from core.startup_tracer import get_startup_tracer
+from core.module_discovery import ModuleDiscovery
 
 class MiddleSectionController:
     """
@@ -24,7 +24,12 @@ class MiddleSectionController:
         self.app_context = app_context
         self.parent_widget = parent
         self.module_classes = []
+        self.module_orders = {}  # 클래스 -> get_order() (매니페스트 캐시 값)
         self.module_instances = []
+        self.discovery = ModuleDiscovery(
+            modules_dir, "modules", "*_module.py", BaseMiddleModule,
+            lambda cls: {'order': cls().get_order()}
+        )
         
         # 분리된 모듈들을 추적하기 위한 딕셔너리
         self.detached_modules = {}  # {module_title: DetachedWindow}
@@ -78,27 +83,14 @@ class MiddleSectionController:
         
         print(f"📋 발견된 모듈 파일: {[os.path.basename(f) for f in module_files]}")
         
-        for path in module_files:
-            name = Path(path).stem
-            try:
-                spec = importlib.util.spec_from_file_location(name, path)
-                if spec and spec.loader:
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-                    
-                    # 모듈에서 BaseMiddleModule을 상속한 클래스 찾기
-                    for attr in dir(module):
-                        obj = getattr(module, attr)
-                        if (isinstance(obj, type) and 
-                            issubclass(obj, BaseMiddleModule) and 
-                            obj is not BaseMiddleModule):
-                            self.module_classes.append(obj)
-                            print(f"✅ 모듈 로드 성공: {name} -> {obj.__name__}")
-                            
-            except Exception as e:
-                print(f"❌ 모듈 로드 실패 ({name}): {e}")
-                traceback.print_exc()
+        # 정식 패키지 이름(modules.xxx)으로 import 하고, 탐색 결과는 mtime 기준 매니페스트에 캐시
+        for entry in self.discovery.discover():
+            cls = self.discovery.load_class(entry)
+            if cls is None:
                 continue
+            self.module_classes.append(cls)
+            self.module_orders[cls] = entry['order']
+            print(f"✅ 모듈 로드 성공: {entry['module']} -> {cls.__name__}")
 
     def initialize_modules_with_context(self, app_context):
         """모듈 인스턴스들에 컨텍스트를 주입하고 ModeAwareModule들을 등록합니다."""
@@ -144,8 +136,10 @@ class MiddleSectionController:
 
     def build_ui(self, layout: QVBoxLayout) -> None:
         """모듈들을 EnhancedCollapsibleBox로 감싸서 UI 구성"""
+        tracer = get_startup_tracer()
         if not self.module_classes:
-            self.load_modules()
+            with tracer.phase("middle modules: load"):
+                self.load_modules()
         
         # 모듈이 없으면 경고 메시지 표시
         if not self.module_classes:
@@ -166,8 +160,8 @@ class MiddleSectionController:
             layout.addWidget(fallback_widget)
             return
         
-        # 모듈들을 order 순서대로 정렬
-        sorted_classes = sorted(self.module_classes, key=lambda c: c().get_order())
+        # 모듈들을 order 순서대로 정렬 (정렬만을 위해 인스턴스를 만들지 않음)
+        sorted_classes = sorted(self.module_classes, key=lambda c: self.module_orders.get(c, 100))
         
         for cls in sorted_classes:
             try:
@@ -196,7 +190,8 @@ class MiddleSectionController:
                 box.module_detach_requested.connect(self.detach_module)
                 
                 # 6. 위젯 생성 및 박스에 추가
-                widget = module_instance.create_widget(parent=self.parent_widget)
+                with tracer.phase(f"module: {cls.__name__}"):
+                    widget = module_instance.create_widget(parent=self.parent_widget)
                 
                 # 위젯과 레이아웃이 유효한지 확인
                 if widget and widget.layout():
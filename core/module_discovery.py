@@ -0,0 +1,137 @@
+# core/module_discovery.py
+
+import os
+import sys
+import glob
+import json
+import importlib
+import traceback
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+class ModuleDiscovery:
+    """
+    modules/, tabs/ 처럼 플러그인 클래스가 들어있는 디렉토리를 탐색하는 헬퍼.
+
+    - 파일은 호출자가 넘긴 패키지 이름('modules', 'tabs')을 붙여 'tabs.web_view' 같은
+      정식 이름으로 import 하므로 (디렉토리가 절대 경로여도 무관)
+      __pycache__ 바이트코드가 재사용되고 sys.modules 에서 중복 로드되지 않습니다.
+    - 탐색 결과(모듈 이름, 클래스 이름, describe()가 돌려준 정렬/표시 정보)는
+      파일 mtime 목록(기반 클래스 파일 포함)과 함께 save/module_manifest.json 에 저장됩니다.
+      다음 실행에서 mtime이 모두 같으면 import 없이 매니페스트만으로 목록을 구성하고,
+      실제 클래스는 load_class()가 필요한 시점에 import 합니다.
+    """
+    MANIFEST_PATH = os.path.join('save', 'module_manifest.json')
+    MANIFEST_VERSION = 2
+    # 기반 클래스 파일의 mtime을 기록하는 시그니처 키 (기본 훅 변경 시 캐시 무효화)
+    BASE_CLASS_KEY = '__base_class__'
+
+    def __init__(self, directory: str, package: str, pattern: str, base_class: type,
+                 describe: Callable[[type], Dict[str, Any]],
+                 manifest_path: str = MANIFEST_PATH):
+        self.directory = directory
+        self.pattern = pattern
+        self.base_class = base_class
+        self.describe = describe
+        self.manifest_path = manifest_path
+        self.package = package
+        self._class_cache: Dict[str, type] = {}
+
+    def _file_signature(self) -> Dict[str, int]:
+        """탐색 대상 파일들의 mtime 목록 (매니페스트 유효성 판단 기준)"""
+        signature = {}
+        for path in sorted(glob.glob(os.path.join(self.directory, self.pattern))):
+            try:
+                signature[Path(path).stem] = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+        # should_defer_widget 같은 기본 훅이 바뀌면 describe() 결과도 바뀌므로 기반 클래스 파일도 포함
+        base_file = getattr(sys.modules.get(self.base_class.__module__), '__file__', None)
+        if base_file:
+            try:
+                signature[self.BASE_CLASS_KEY] = os.stat(base_file).st_mtime_ns
+            except OSError:
+                pass
+        return signature
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == self.MANIFEST_VERSION:
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return {'version': self.MANIFEST_VERSION, 'packages': {}}
+
+    def _write_manifest(self, signature: Dict[str, int], entries: List[Dict[str, Any]]):
+        manifest = self._read_manifest()
+        manifest['packages'][self.package] = {'files': signature, 'entries': entries}
+        try:
+            os.makedirs(os.path.dirname(self.manifest_path) or '.', exist_ok=True)
+            with open(self.manifest_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2, ensure_ascii=False)
+        except OSError as e:
+            print(f"⚠️ 모듈 매니페스트 저장 실패: {e}")
+
+    def discover(self) -> List[Dict[str, Any]]:
+        """
+        발견된 클래스 목록을 반환합니다.
+        각 항목은 {'module': ..., 'class': ...} 와 describe()가 반환한 정보를 담고 있습니다.
+        """
+        signature = self._file_signature()
+        cached = self._read_manifest()['packages'].get(self.package)
+        if cached and cached.get('files') == signature:
+            print(f"⚡ 매니페스트 캐시 사용: {self.package} ({len(cached['entries'])}개 클래스)")
+            return cached['entries']
+
+        print(f"🔍 모듈 탐색 시작: {self.directory}")
+        entries = []
+        has_error = False
+        for stem in signature:
+            if stem == self.BASE_CLASS_KEY:
+                continue
+            module_name = f"{self.package}.{stem}"
+            try:
+                module = importlib.import_module(module_name)
+            except Exception as e:
+                print(f"❌ 모듈 로드 실패 ({module_name}): {e}")
+                traceback.print_exc()
+                has_error = True
+                continue
+
+            for attr, obj in vars(module).items():
+                # 다른 파일에서 import 해 온 클래스는 제외 (정의된 모듈에서만 등록)
+                if (isinstance(obj, type) and issubclass(obj, self.base_class) and
+                        obj is not self.base_class and obj.__module__ == module.__name__):
+                    try:
+                        entry = {'module': module_name, 'class': obj.__name__}
+                        entry.update(self.describe(obj))
+                    except Exception as e:
+                        print(f"❌ 클래스 정보 수집 실패 ({obj.__name__}): {e}")
+                        traceback.print_exc()
+                        has_error = True
+                        continue
+                    self._class_cache[obj.__name__] = obj
+                    entries.append(entry)
+                    print(f"  -> 클래스 발견: {module_name}.{obj.__name__}")
+
+        # 로드 실패가 있었다면 다음 실행에서 다시 탐색하도록 캐시하지 않음
+        if not has_error:
+            self._write_manifest(signature, entries)
+        return entries
+
+    def load_class(self, entry: Dict[str, Any]) -> Optional[type]:
+        """매니페스트 항목의 클래스를 import 하여 반환합니다."""
+        class_name = entry['class']
+        if class_name in self._class_cache:
+            return self._class_cache[class_name]
+        try:
+            module = importlib.import_module(entry['module'])
+            cls = getattr(module, class_name)
+        except Exception as e:
+            print(f"❌ 클래스 로드 실패 ({entry['module']}.{class_name}): {e}")
+            traceback.print_exc()
+            return None
+        self._class_cache[class_name] = cls
+        return cls
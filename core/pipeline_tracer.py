@@ -0,0 +1,146 @@
+# core/pipeline_tracer.py
+
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from core.prompt_context import PromptContext
+
+# 단계 이벤트가 변화를 추적하는 태그 리스트
+TRACED_TAG_LISTS = ('prefix_tags', 'main_tags', 'postfix_tags', 'removed_tags')
+
+# 실행마다 처음 발행되는 기준 이벤트의 단계 이름 (빈 리스트 대비 초기 태그 전체)
+INPUT_STAGE = 'input'
+
+@dataclass(frozen=True)
+class TagListDiff:
+    """
+    한 태그 리스트의 단계 전후 변화: before[start:end]가 inserted로 바뀌었음을 뜻합니다.
+    앞뒤 공통 구간을 잘라낸 한 구간만 기록하므로 계산이 O(n)이고, apply()로 이후 리스트를 정확히 복원할 수 있습니다.
+    """
+    start: int
+    end: int
+    deleted: Tuple[str, ...]
+    inserted: Tuple[str, ...]
+
+    @classmethod
+    def between(cls, before: Tuple[str, ...], after: Tuple[str, ...]) -> Optional['TagListDiff']:
+        """두 리스트의 차이 (같으면 None)"""
+        if before == after:
+            return None
+        limit = min(len(before), len(after))
+        start = 0
+        while start < limit and before[start] == after[start]:
+            start += 1
+        suffix = 0
+        while suffix < limit - start and before[-1 - suffix] == after[-1 - suffix]:
+            suffix += 1
+        end = len(before) - suffix
+        return cls(start, end, before[start:end], after[start:len(after) - suffix])
+
+    @property
+    def added(self) -> List[str]:
+        """새로 생긴 태그 (순서만 바뀐 태그 제외)"""
+        return list((Counter(self.inserted) - Counter(self.deleted)).elements())
+
+    @property
+    def removed(self) -> List[str]:
+        """사라진 태그 (순서만 바뀐 태그 제외)"""
+        return list((Counter(self.deleted) - Counter(self.inserted)).elements())
+
+    def apply(self, tags: List[str]) -> List[str]:
+        return tags[:self.start] + list(self.inserted) + tags[self.end:]
+
+@dataclass(frozen=True)
+class StageEvent:
+    """PromptProcessor 한 단계의 실행 결과. diffs에는 바뀐 태그 리스트만 들어 있습니다."""
+    pipeline: str
+    stage: str
+    run_id: int
+    elapsed_ms: float
+    diffs: Dict[str, TagListDiff]
+
+    def apply(self, tag_lists: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        """이전 단계의 태그 리스트들에 이 단계의 변화를 적용한 새 딕셔너리"""
+        return {name: (self.diffs[name].apply(tags) if name in self.diffs else tags)
+                for name, tags in tag_lists.items()}
+
+def _snapshot(context: PromptContext) -> Tuple[Tuple[str, ...], ...]:
+    return tuple(tuple(getattr(context, name)) for name in TRACED_TAG_LISTS)
+
+def _diff(before, after) -> Dict[str, TagListDiff]:
+    diffs = {}
+    for name, old, new in zip(TRACED_TAG_LISTS, before, after):
+        diff = TagListDiff.between(old, new)
+        if diff is not None:
+            diffs[name] = diff
+    return diffs
+
+class PipelineTracer:
+    """
+    PromptProcessor 단계 추적기.
+    - subscribe(listener): 단계마다 StageEvent(태그 리스트 변화만 포함)를 받습니다.
+      실행마다 먼저 INPUT_STAGE 이벤트(빈 리스트 대비 초기 태그)가 오므로, 이벤트만으로 단계별 태그 리스트를 복원할 수 있습니다.
+    - add_stage_hook(stage, hook): 해당 단계 직후 hook(context) -> context 를 실행합니다. (변화는 그 단계 이벤트에 포함)
+    구독자와 단계 훅이 모두 없으면 enabled가 False이며, PromptProcessor는 스냅샷/비교 없이 기존 경로로 실행합니다.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._listeners: List[Callable[[StageEvent], None]] = []
+        self._stage_hooks: Dict[str, List[Callable[[PromptContext], PromptContext]]] = {}
+        self._run_id = 0
+
+    def _update_enabled(self):
+        self.enabled = bool(self._listeners or self._stage_hooks)
+
+    def subscribe(self, listener: Callable[[StageEvent], None]):
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+        self._update_enabled()
+
+    def unsubscribe(self, listener: Callable[[StageEvent], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+        self._update_enabled()
+
+    def add_stage_hook(self, stage: str, hook: Callable[[PromptContext], PromptContext]):
+        self._stage_hooks.setdefault(stage, []).append(hook)
+        self._update_enabled()
+
+    def remove_stage_hook(self, stage: str, hook: Callable[[PromptContext], PromptContext]):
+        hooks = self._stage_hooks.get(stage)
+        if hooks and hook in hooks:
+            hooks.remove(hook)
+            if not hooks:
+                del self._stage_hooks[stage]
+        self._update_enabled()
+
+    def run(self, pipeline: str, steps, context: PromptContext) -> PromptContext:
+        """(단계 이름, 단계 함수) 목록을 순서대로 실행하며 단계 훅 실행과 이벤트 발행을 처리합니다."""
+        self._run_id += 1
+        run_id = self._run_id
+        listeners = tuple(self._listeners)
+        before = _snapshot(context)
+        if listeners:
+            empty = ((),) * len(TRACED_TAG_LISTS)
+            self._emit(listeners, StageEvent(pipeline, INPUT_STAGE, run_id, 0.0, _diff(empty, before)))
+
+        for stage, step in steps:
+            start = time.perf_counter()
+            context = step(context)
+            for hook in tuple(self._stage_hooks.get(stage, ())):
+                context = hook(context)
+            if listeners:
+                elapsed_ms = (time.perf_counter() - start) * 1000.0
+                after = _snapshot(context)
+                self._emit(listeners, StageEvent(pipeline, stage, run_id, elapsed_ms, _diff(before, after)))
+                before = after
+        return context
+
+    def _emit(self, listeners, event: StageEvent):
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                print(f"⚠️ 파이프라인 추적 이벤트 처리 중 오류 ({event.stage}): {e}")
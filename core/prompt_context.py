@@ -1,9 +1,12 @@
 # core/prompt_context.py
 
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
 import pandas as pd
 
+if TYPE_CHECKING:
+    from .wildcard_processor import BatchSampler
+
 @dataclass
 class PromptContext:
     """
@@ -33,6 +36,10 @@ class PromptContext:
     # 순차/종속 와일드카드의 현재 상태(n/m)를 기록
     wildcard_state: Dict[str, Dict[str, int]] = field(default_factory=dict)
 
+    # 이번 생성 전용 와일드카드 인덱스 샘플러 (WildcardProcessor.seed_context로 설정,
+    # 시드는 metadata['wildcard_seed'], 그 시점의 카운터/상태는 metadata['wildcard_counters'/'wildcard_state'])
+    wildcard_sampler: Optional['BatchSampler'] = field(default=None, repr=False, compare=False)
+
     # --- 처리 결과 ---
     removed_tags: List[str] = field(default_factory=list)
     final_prompt: Optional[str] = None
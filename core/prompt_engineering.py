@@ -0,0 +1,174 @@
+# core/prompt_engineering.py
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+from core.prompt_context import PromptContext
+
+# 프롬프트 엔지니어링 모듈의 태그 가공 로직 (Qt 비의존).
+# GUI에서는 PromptEngineeringModule 훅이, 헤드리스 파이프라인에서는 HeadlessPromptEngine이
+# 같은 함수를 호출하므로 두 경로의 결과가 항상 같습니다.
+
+# "랜덤 프롬프트의 장소와 배경색을 제거" 옵션이 제거하는 태그 목록
+LOCATION_TAGS = frozenset(['indoors', 'outdoors', 'airplane interior', 'airport', 'apartment', 'arena', 'armory', 'bar', 'barn', 'bathroom', 'bathtub', 'bedroom', 'bell tower', 'billiard room', 'book store', 'bowling alley', 'bunker', 'bus interior', 'butcher shop', 'cafe', 'cafeteria', 'car interior', 'casino', 'castle', 'catacomb', 'changing room', 'church', 'classroom', 'closet', 'construction site', 'convenience store', 'convention hall', 'court', 'dining room', 'drugstore', 'ferris wheel', 'flower shop', 'gym', 'hangar', 'hospital', 'hotel room', 'hotel', 'infirmary', 'izakaya', 'kitchen', 'laboratory', 'library', 'living room', 'locker room', 'mall', 'messy room', 'mosque', 'movie theater', 'museum', 'nightclub', 'office', 'onsen', 'ovservatory', 'phone booth', 'planetarium', 'pool', 'prison', 'refinery', 'restaurant', 'restroom', 'rural', 'salon', 'school', 'sex shop', 'shop', 'shower room', 'skating rink', 'snowboard shop', 'spacecraft interior', 'staff room', 'stage', 'supermarket', 'throne', 'train station', 'tunnel', 'airfield', 'alley', 'amphitheater', 'aqueduct', 'bamboo forest', 'beach', 'blizzard', 'bridge', 'bus stop', 'canal', 'canyon', 'carousel', 'cave', 'cliff', 'cockpit', 'conservatory', 'cross walk', 'desert', 'dust storm', 'flower field', 'forest', 'garden', 'gas staion', 'gazebo', 'geyser', 'glacier', 'graveyard', 'harbor', 'highway', 'hill', 'island', 'jungle', 'lake', 'market', 'meadow', 'nuclear powerplant', 'oasis', 'ocean bottom', 'ocean', 'pagoda', 'parking lot', 'playground', 'pond', 'poolside', 'railroad', 'rainforest', 'rice paddy', 'roller coster', 'rooftop', 'rope bridge', 'running track', 'savannah', 'shipyard', 'shirine', 'skyscraper', 'soccor field', 'space elevator', 'stair', 'starry sky', 'swamp', 'tidal flat', 'volcano', 'waterfall', 'waterpark', 'wheat field', 'zoo', 'white background', 'simple background', 'grey background', 'gradient background', 'blue background', 'black background', 'yellow background', 'pink background', 'red background', 'brown background', 'green background', 'purple background', 'orange background'])
+
+PREPROCESSING_OPTION_KEYS = (
+    "remove_author", "remove_work_title", "remove_character_name",
+    "remove_character_features", "remove_clothes", "remove_color",
+    "remove_location_and_background_color",
+)
+
+def split_tag_text(text: str) -> list:
+    """콤마로 구분된 입력창 텍스트를 태그 리스트로 변환 (빈 항목 제외)"""
+    return [tag.strip() for tag in (text or "").split(',') if tag.strip()]
+
+def options_from_settings(settings: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    저장된 모드 설정(save/PromptEngineeringModule_{mode}.json의 값)을
+    PromptEngineeringModule.get_parameters()와 같은 형식으로 변환합니다.
+    """
+    saved_options = settings.get("preprocessing_options", {}) or {}
+    return {
+        "pre_prompt": split_tag_text(settings.get("pre_prompt", "")),
+        "post_prompt": split_tag_text(settings.get("post_prompt", "")),
+        "auto_hide": split_tag_text(settings.get("auto_hide_prompt", "")),
+        "preprocessing_options": {key: bool(saved_options.get(key, False)) for key in PREPROCESSING_OPTION_KEYS},
+    }
+
+def _auto_hide_substring(item: str) -> Optional[str]:
+    """
+    자동 숨김 항목의 부분 일치 패턴을 실제 검색 문자열로 변환 (패턴이 아니면 None)
+    - __x__ : 밑줄을 모두 지운 x를 포함하는 태그
+    - _x_   : 밑줄을 공백으로 바꾼 ' x '를 포함하는 태그
+    - _x    : 첫 밑줄을 공백으로 바꾼 ' x'를 포함하는 태그
+    - x_    : 끝 밑줄을 뗀 x를 포함하는 태그
+    """
+    if item.startswith("__") and item.endswith("__"):
+        return item.replace("_", "")
+    if item.startswith("_") and item.endswith("_"):
+        return item.replace("_", " ")
+    if item.startswith("_"):
+        return item.replace("_", " ", 1)
+    if item.endswith("_"):
+        return (" " + item.rstrip("_") + " ").strip()
+    return None
+
+class AutoHideMatcher:
+    """
+    자동 숨김 목록을 컴파일한 결과.
+    정확 일치 항목은 frozenset, 부분 일치 패턴들은 하나의 정규식으로 묶어
+    main_tags를 한 번만 훑어 제거할 수 있게 합니다. ('~'로 시작하는 항목은 무시)
+    """
+    __slots__ = ('exact', 'pattern')
+
+    def __init__(self, items: Iterable[str]):
+        items = [item for item in items if not item.startswith('~')]
+        self.exact = frozenset(items)
+        substrings = {s for s in map(_auto_hide_substring, items) if s is not None}
+        # 긴 문자열을 먼저 두어 겹치는 패턴이 있어도 탐색이 빨리 끝나도록 정렬
+        self.pattern = re.compile('|'.join(map(re.escape, sorted(substrings, key=len, reverse=True)))) if substrings else None
+
+    def remove_from(self, main_tags: List[str], removed_tags: List[str]) -> List[str]:
+        """
+        자동 숨김 대상을 removed_tags로 옮기고 남은 태그 목록을 반환합니다.
+        정확 일치 태그는 모두 제거하고, 부분 일치 태그는 같은 태그가 여러 번 있어도 첫 번째만 제거합니다.
+        """
+        exact, pattern = self.exact, self.pattern
+        if not exact and pattern is None:
+            return main_tags
+        search = pattern.search if pattern is not None else None
+        kept = []
+        matched = set()
+        for keyword in main_tags:
+            if keyword in exact:
+                removed_tags.append(keyword)
+            elif search is not None and keyword not in matched and search(keyword) is not None:
+                matched.add(keyword)
+                removed_tags.append(keyword)
+            else:
+                kept.append(keyword)
+        return kept
+
+@lru_cache(maxsize=32)
+def compile_auto_hide(items: tuple) -> AutoHideMatcher:
+    """자동 숨김 목록(튜플)별로 매처를 한 번만 만들어 재사용합니다."""
+    return AutoHideMatcher(items)
+
+def _drop_tags(main_tags: list, removed_tags: list, should_remove) -> list:
+    """main_tags를 한 번 훑어 should_remove에 해당하는 태그를 removed_tags로 옮기고 남은 목록을 반환"""
+    kept = []
+    for keyword in main_tags:
+        if should_remove(keyword):
+            removed_tags.append(keyword)
+        else:
+            kept.append(keyword)
+    return kept
+
+def apply_prompt_engineering(context: PromptContext, options: Dict[str, Any], filter_manager) -> PromptContext:
+    """
+    선행/후행 프롬프트 추가와 자동 숨김/전처리 옵션에 따른 태그 제거를 수행합니다.
+    options는 PromptEngineeringModule.get_parameters() 형식,
+    filter_manager는 FilterDataManager(의상/색상/캐릭터 특징 목록)입니다.
+    """
+    # 1. 선행/후행 프롬프트 추가
+    _prefix_tags = options["pre_prompt"]
+    _postfix_tags = options["post_prompt"]
+    
+    # context의 태그 리스트 앞/뒤에 추가
+    prefix_tags = _prefix_tags + context.prefix_tags
+    postfix_tags = context.postfix_tags + _postfix_tags
+    main_tags = context.main_tags
+    removed_tags = context.removed_tags
+    source_row = context.source_row
+    
+    # 2. 자동 태그 제거 옵션 처리
+    checkbox_options = options["preprocessing_options"]
+
+    # "remove_work_title"
+    if not checkbox_options.get("remove_work_title"):
+        copyright = source_row.get("copyright")
+        if copyright: prefix_tags.insert(0, copyright)
+
+    # "remove_author"
+    if not checkbox_options.get("remove_author"):
+        artist = source_row.get("artist")
+        if artist: prefix_tags.insert(0, artist)
+
+    # "remove_character_name"
+    if not checkbox_options.get("remove_character_name"):
+        character = source_row.get("character")
+        if character: prefix_tags.insert(0, character)
+
+    # 자동숨김프롬프트 처리 (목록이 바뀔 때만 컴파일되는 매처로 한 번에 제거)
+    # GUI 훅은 텍스트가 바뀔 때만 다시 만든 매처를 넘기고, 그 외(헤드리스/일괄 모드)는 목록 내용으로 캐시된 매처를 사용
+    matcher = options.get("auto_hide_matcher") or compile_auto_hide(tuple(options["auto_hide"]))
+    main_tags = matcher.remove_from(main_tags, removed_tags)
+    # 로그는 호출자(GUI 모듈)가 출력하도록 기록만 함 (헤드리스 대량 생성에서 프롬프트마다 출력하지 않도록)
+    context.metadata['auto_hide_removed_tags'] = list(removed_tags)
+
+    # 전처리 옵션별 태그 제거: 조회는 frozenset/정규식, 제거는 목록을 한 번 훑어 나누는 방식
+    # "remove_character_features"
+    if checkbox_options.get("remove_character_features"):
+        characteristics = filter_manager.characteristic_set
+        main_tags = _drop_tags(main_tags, removed_tags, lambda keyword: keyword in characteristics)
+
+    # "remove_clothes"
+    if checkbox_options.get("remove_clothes"):
+        clothes = filter_manager.clothes_set
+        main_tags = _drop_tags(main_tags, removed_tags, lambda keyword: keyword in clothes)
+
+    # "remove_color"
+    if checkbox_options.get("remove_color") and filter_manager.color_pattern is not None:
+        color_search = filter_manager.color_pattern.search
+        main_tags = _drop_tags(main_tags, removed_tags, lambda keyword: color_search(keyword) is not None)
+
+    # "remove_location_and_background_color"
+    if checkbox_options.get("remove_location_and_background_color"):
+        main_tags = _drop_tags(main_tags, removed_tags, lambda keyword: keyword in LOCATION_TAGS)
+    
+    # 수정된 context를 다음 훅 또는 파이프라인으로 전달
+    context.prefix_tags = prefix_tags
+    context.postfix_tags = postfix_tags
+    context.main_tags = main_tags
+
+    return context
@@ -0,0 +1,80 @@
+# core/prompt_formatter.py
+
+from itertools import chain
+from types import MappingProxyType
+from typing import Iterable, List
+
+from core.prompt_context import PromptContext
+
+# 최종 포맷팅에 쓰이는 고정 테이블. 모듈 로드 시 한 번만 만들어지며 읽기 전용입니다.
+
+# prefix / main / postfix 구역 사이에 들어가는 구분자 (중복 제거 대상이 아님)
+SECTION_BREAK = "\n\n"
+
+# 인물 태그 -> 정렬 그룹 (boys -> girls -> others)
+PERSON_TAG_GROUPS = MappingProxyType({
+    tag: group
+    for group, kind in enumerate(("boy", "girl", "other"))
+    for tag in (f"1{kind}", f"2{kind}s", f"3{kind}s", f"4{kind}s", f"5{kind}s", f"6+{kind}s")
+})
+
+# 태그 자동 변환 (main 태그에만 적용)
+TAG_CONVERSIONS = MappingProxyType({
+    'v': 'peace sign', 'double v': 'double peace', '|_|': 'bar eyes',
+    '\\||/': 'open \\m/', ':|': 'neutral face', ';|': 'neutral face',
+    'eyepatch bikini': 'square bikini', 'tachi-e': 'character image'
+})
+
+# main 태그 분류표: 인물 태그 -> 그룹 번호(int), 변환 대상 -> 변환된 태그(str)
+# 대부분의 태그는 어느 쪽에도 없으므로 태그당 조회 한 번으로 끝납니다.
+# (조회가 잦아 MappingProxyType 대신 내부 전용 dict 사용)
+_MAIN_TAG_TABLE = {**TAG_CONVERSIONS, **PERSON_TAG_GROUPS}
+
+def _emit(tags: Iterable[str], seen: set, output: List[str]):
+    """
+    중복을 제거하면서 태그를 output에 추가합니다.
+    - 줄바꿈 구분자가 들어있는 태그는 seen에 넣지 않으므로 항상 유지됩니다.
+    - '#'으로 시작하는 태그(주석/섹션 표시)는 앞뒤로 줄바꿈을 넣어 단독 줄로 만듭니다.
+    """
+    append = output.append
+    for tag in tags:
+        if tag in seen:
+            continue
+        if SECTION_BREAK not in tag:
+            seen.add(tag)
+        append(f"\n{tag.strip()}\n" if tag.startswith('#') else tag)
+
+def format_final_prompt(context: PromptContext) -> str:
+    """
+    PromptProcessor의 최종 포맷팅 단계.
+    1. global_append_tags를 main 태그 뒤에 붙이고
+    2. main 태그에서 인물 태그(1girl 등)를 분리하여 boys -> girls -> others 순으로 prefix 앞에 두고
+    3. 나머지 main 태그에 자동 변환을 적용한 뒤
+    4. prefix / main / postfix 순으로 중복 제거와 포맷팅을 하며 한 번에 이어 붙입니다.
+    context.prefix_tags / main_tags는 2~3의 결과로 갱신됩니다. (구분자는 넣지 않음)
+    """
+    lookup = _MAIN_TAG_TABLE.get
+    person_buckets = ([], [], [])
+    main_tags = []
+    append_main = main_tags.append
+    for tag in chain(context.main_tags, context.global_append_tags):
+        entry = lookup(tag)
+        if entry is None:
+            append_main(tag)
+        elif entry.__class__ is int:
+            person_buckets[entry].append(tag)
+        else:
+            append_main(entry)
+
+    prefix_tags = person_buckets[0] + person_buckets[1] + person_buckets[2] + context.prefix_tags
+    context.prefix_tags = prefix_tags
+    context.main_tags = main_tags
+
+    seen = set()
+    output = []
+    _emit(prefix_tags, seen, output)
+    output.append(SECTION_BREAK)
+    _emit(main_tags, seen, output)
+    output.append(SECTION_BREAK)
+    _emit(context.postfix_tags, seen, output)
+    return ', '.join(output)
@@ -4,6 +4,8 @@ from core.search_result_model import SearchResultModel
 from core.prompt_processor import PromptProcessor
 from core.context import AppContext
 from core.prompt_context import PromptContext
+from core.wildcard_processor import WildcardProcessor
+from core.prompt_pipeline import build_main_tags
 
 class PromptGenerationController(QObject):
     """UI와 PromptProcessor를 중재하고 프롬프트 생성을 관리 (단순화됨)"""
@@ -16,6 +18,8 @@ class PromptGenerationController(QObject):
         super().__init__()
         self.app_context = app_context
         self.processor = PromptProcessor(self.app_context)
+        # 생성마다 바뀐 순차 카운터를 save/wildcard_state.jsonl 에 기록
+        self.app_context.subscribe("prompt_generated", self._persist_wildcard_counters)
         # 비동기 처리가 필요하다면 Worker/Thread 로직은 유지할 수 있습니다.
 
     def _create_initial_context(self, source_row: pd.Series, settings: dict) -> PromptContext:
@@ -31,15 +35,24 @@ class PromptGenerationController(QObject):
         
         context = PromptContext(source_row=source_row, settings=settings)
         
-        # 기존 순차 카운터와 상태 복원
-        context.sequential_counters = existing_sequential_counters
-        context.wildcard_state = existing_wildcard_state
+        # 기존 순차 카운터와 상태 복원 (앱 시작 후 첫 생성이면 저장된 카운터에서 이어서 진행)
+        if self.app_context.current_prompt_context:
+            context.sequential_counters = existing_sequential_counters
+            context.wildcard_state = existing_wildcard_state
+        else:
+            self.app_context.wildcard_state_store.restore_into(context)
+
+        # 생성마다 와일드카드 시드를 새로 정하고 기록 (settings에 시드가 있으면 그대로 재현)
+        WildcardProcessor.seed_context(context, settings.get('wildcard_seed'))
         
-        general_str = source_row.get('general', '')
-        if pd.notna(general_str) and isinstance(general_str, str):
-            context.main_tags = [tag.strip() for tag in general_str.split(',')]
+        context.main_tags = build_main_tags(source_row)
         return context
 
+    def _persist_wildcard_counters(self, context: PromptContext):
+        """prompt_generated 이벤트 구독자: 순차 카운터/상태를 상태 파일에 기록"""
+        if context:
+            self.app_context.wildcard_state_store.record(context.sequential_counters, context.wildcard_state)
+
     def _handle_processed_context(self, context):
         """처리된 컨텍스트를 받아 시그널과 이벤트를 발생시키는 공통 핸들러"""
         if context:
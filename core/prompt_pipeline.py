@@ -0,0 +1,378 @@
+# core/prompt_pipeline.py
+"""
+Qt에 의존하지 않는 헤드리스 프롬프트 생성 파이프라인.
+
+GUI의 PromptProcessor는 훅을 통해 위젯 상태(텍스트 입력창, 체크박스)를 직접 읽기 때문에
+GUI 스레드에서만 실행할 수 있습니다. 여기서는 위젯 상태를 PipelineSnapshot(불변)으로
+한 번만 수집해 두고, HeadlessPromptEngine이 같은 단계를 순수 Python으로 실행합니다.
+
+    해상도 감지 -> 프롬프트 엔지니어링 -> 와일드카드 확장 -> 조건부 프롬프트 -> 최종 포맷
+
+스냅샷만 있으면 되므로 스레드/프로세스 풀에서 병렬로 돌릴 수 있고,
+QApplication 없이 CLI나 스크립트에서도 실행할 수 있습니다.
+
+    python -m core.prompt_pipeline --input rows.parquet --count 100 --seed 42 --workers 4 --processes
+
+스냅샷에 포함되지 않는 외부 훅(사용자 Hooker 스크립트 등)은 헤드리스 실행에서 적용되지 않습니다.
+"""
+
+import os
+import sys
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.prompt_context import PromptContext
+from core.wildcard_processor import WildcardProcessor, new_wildcard_seed
+from core.prompt_engineering import apply_prompt_engineering, options_from_settings
+from core.conditional_rules import ConditionalRuleEngine
+from core.prompt_formatter import format_final_prompt
+
+# ---- PromptProcessor와 공유하는 파이프라인 단계 ----
+
+def build_main_tags(source_row: pd.Series) -> List[str]:
+    """source_row의 general 문자열을 main_tags 리스트로 변환"""
+    general_str = source_row.get('general', '')
+    if pd.notna(general_str) and isinstance(general_str, str):
+        return [tag.strip() for tag in general_str.split(',')]
+    return []
+
+def fit_resolution(context: PromptContext) -> PromptContext:
+    """해상도 자동 맞춤: source_row의 이미지 크기를 metadata['detected_resolution']에 기록"""
+    settings = context.settings
+    source_row = context.source_row
+
+    if not settings.get('auto_fit_resolution', False) or settings.get('wildcard_standalone', False):
+        return context
+
+    if 'image_width' not in source_row or 'image_height' not in source_row:
+        return context
+
+    try:
+        width = int(source_row['image_width'])
+        height = int(source_row['image_height'])
+        if width > 0 and height > 0:
+            # 처리 결과를 context의 metadata에 저장합니다.
+            context.metadata['detected_resolution'] = (width, height)
+    except (ValueError, TypeError):
+        pass
+
+    return context
+
+def expand_wildcards(context: PromptContext, wildcard_processor: WildcardProcessor) -> PromptContext:
+    """prefix/postfix 태그의 와일드카드를 실제 태그로 치환"""
+    context.prefix_tags = wildcard_processor.expand_tags(context.prefix_tags, context)
+    context.postfix_tags = wildcard_processor.expand_tags(context.postfix_tags, context)
+    return context
+
+# ---- 설정 스냅샷 ----
+
+def _load_mode_settings(base_filename: str, mode: str) -> Dict[str, Any]:
+    """ModeAwareModule이 저장한 save/{base_filename}_{mode}.json 에서 해당 모드 설정을 읽습니다."""
+    path = os.path.join('save', f'{base_filename}_{mode}.json')
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get(mode, {}) or {}
+    except (OSError, ValueError):
+        return {}
+
+@dataclass(frozen=True)
+class PipelineSnapshot:
+    """
+    헤드리스 파이프라인 실행에 필요한 설정의 불변 스냅샷.
+    - settings: PromptContext.settings (auto_fit_resolution, wildcard_standalone 등)
+    - prompt_engineering: PromptEngineeringModule.get_parameters() 형식 (None이면 단계 생략)
+    - conditional_rules: 조건부 프롬프트 규칙 텍스트 (None/빈 문자열이면 단계 생략)
+    - sequential_counters / wildcard_state: 순차·종속 와일드카드의 시작 상태
+    """
+    settings: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+    prompt_engineering: Optional[Mapping[str, Any]] = None
+    conditional_rules: Optional[str] = None
+    sequential_counters: Mapping[str, int] = field(default_factory=lambda: MappingProxyType({}))
+    wildcard_state: Mapping[str, Mapping[str, Any]] = field(default_factory=lambda: MappingProxyType({}))
+
+    def __post_init__(self):
+        # 호출자가 넘긴 dict를 나중에 수정해도 스냅샷이 바뀌지 않도록 복사 후 읽기 전용으로 고정
+        object.__setattr__(self, 'settings', MappingProxyType(dict(self.settings)))
+        object.__setattr__(self, 'sequential_counters', MappingProxyType(dict(self.sequential_counters)))
+        object.__setattr__(self, 'wildcard_state', MappingProxyType(
+            {name: MappingProxyType(dict(state)) for name, state in self.wildcard_state.items()}))
+        if self.prompt_engineering is not None:
+            options = dict(self.prompt_engineering)
+            options['pre_prompt'] = tuple(options.get('pre_prompt', ()))
+            options['post_prompt'] = tuple(options.get('post_prompt', ()))
+            options['auto_hide'] = tuple(options.get('auto_hide', ()))
+            options['preprocessing_options'] = MappingProxyType(dict(options.get('preprocessing_options', {})))
+            object.__setattr__(self, 'prompt_engineering', MappingProxyType(options))
+        if self.conditional_rules is not None:
+            object.__setattr__(self, 'conditional_rules', self.conditional_rules.strip() or None)
+
+    def __reduce__(self):
+        # MappingProxyType은 pickle되지 않으므로 프로세스 풀 전달 시 일반 dict로 직렬화
+        pe = None
+        if self.prompt_engineering is not None:
+            pe = dict(self.prompt_engineering)
+            pe['preprocessing_options'] = dict(pe['preprocessing_options'])
+        return (PipelineSnapshot, (dict(self.settings), pe, self.conditional_rules,
+                                   dict(self.sequential_counters),
+                                   {name: dict(state) for name, state in self.wildcard_state.items()}))
+
+    @classmethod
+    def from_app(cls, app_context, settings: Dict[str, Any]) -> 'PipelineSnapshot':
+        """
+        GUI 스레드에서 현재 위젯 상태를 한 번 읽어 스냅샷을 만듭니다.
+        이후의 생성은 위젯에 접근하지 않으므로 다른 스레드/프로세스에서 실행할 수 있습니다.
+        """
+        controller = app_context.middle_section_controller
+        engineering_module = controller.get_module_instance("PromptEngineeringModule")
+        rule_module = controller.get_module_instance("PromptListModifierModule")
+
+        prompt_engineering = engineering_module.get_parameters() if engineering_module else None
+        rule_params = rule_module.get_parameters() if rule_module else {}
+
+        current = app_context.current_prompt_context
+        if current:
+            counters, state = current.sequential_counters, current.wildcard_state
+        else:
+            store = app_context.wildcard_state_store
+            counters, state = store.counters, store.state
+
+        return cls(settings=settings,
+                   prompt_engineering=prompt_engineering,
+                   conditional_rules=rule_params.get('rules') if rule_params.get('enabled') else None,
+                   sequential_counters=counters,
+                   wildcard_state=state)
+
+    @classmethod
+    def from_saved_settings(cls, mode: str = 'NAI', settings: Optional[Dict[str, Any]] = None,
+                            restore_counters: bool = True) -> 'PipelineSnapshot':
+        """save/ 폴더의 모드별 모듈 설정 파일로 스냅샷을 만듭니다. (GUI 없이 실행할 때 사용)"""
+        engineering_settings = _load_mode_settings("PromptEngineeringModule", mode)
+        rule_settings = _load_mode_settings("PromptListModifierModule", mode)
+
+        counters, state = {}, {}
+        if restore_counters:
+            from core.wildcard_state_store import WildcardStateStore
+            store = WildcardStateStore()
+            counters, state = store.counters, store.state
+
+        return cls(settings=settings or {},
+                   prompt_engineering=options_from_settings(engineering_settings) if engineering_settings else None,
+                   conditional_rules=rule_settings.get('rules') if rule_settings.get('enabled') else None,
+                   sequential_counters=counters,
+                   wildcard_state=state)
+
+# ---- 엔진 ----
+
+class HeadlessPromptEngine:
+    """
+    PipelineSnapshot과 source_row만으로 최종 프롬프트를 만드는 엔진.
+    순차 와일드카드 카운터는 엔진이 이어서 관리하며(GUI의 current_prompt_context와 같은 역할),
+    generate()는 카운터를 명시적으로 넘겨받으면 엔진 상태를 건드리지 않으므로 여러 스레드에서 호출할 수 있습니다.
+    """
+
+    def __init__(self, snapshot: PipelineSnapshot, wildcard_manager, filter_data_manager=None):
+        self.snapshot = snapshot
+        self.wildcard_manager = wildcard_manager
+        self.filter_data_manager = filter_data_manager
+        self.wildcard_processor = WildcardProcessor(wildcard_manager)
+        self.rule_engine = ConditionalRuleEngine()
+        self.sequential_counters: Dict[str, int] = dict(snapshot.sequential_counters)
+        self.wildcard_state: Dict[str, Dict[str, Any]] = {
+            name: dict(state) for name, state in snapshot.wildcard_state.items()}
+
+    def _options(self) -> Optional[Dict[str, Any]]:
+        options = self.snapshot.prompt_engineering
+        if options is None or self.filter_data_manager is None:
+            return None
+        # 태그 가공 함수가 리스트를 이어 붙이므로 매 호출마다 새 리스트로 전달
+        return {
+            'pre_prompt': list(options['pre_prompt']),
+            'post_prompt': list(options['post_prompt']),
+            'auto_hide': list(options['auto_hide']),
+            'preprocessing_options': options['preprocessing_options'],
+        }
+
+    def generate(self, source_row: pd.Series, seed: Optional[int] = None,
+                 sequential_counters: Optional[Dict[str, int]] = None,
+                 wildcard_state: Optional[Dict[str, Dict[str, Any]]] = None) -> PromptContext:
+        """
+        source_row 하나로 프롬프트를 생성합니다.
+        sequential_counters/wildcard_state를 생략하면 엔진의 카운터를 사용하고 생성 후 갱신합니다.
+        """
+        use_engine_state = sequential_counters is None
+        context = PromptContext(source_row=source_row, settings=dict(self.snapshot.settings))
+        if use_engine_state:
+            context.sequential_counters = dict(self.sequential_counters)
+            context.wildcard_state = {name: dict(state) for name, state in self.wildcard_state.items()}
+        else:
+            context.sequential_counters = dict(sequential_counters)
+            context.wildcard_state = {name: dict(state) for name, state in (wildcard_state or {}).items()}
+
+        WildcardProcessor.seed_context(context, seed)
+        context.main_tags = build_main_tags(source_row)
+
+        context = fit_resolution(context)
+        options = self._options()
+        if options is not None:
+            context = apply_prompt_engineering(context, options, self.filter_data_manager)
+        context = expand_wildcards(context, self.wildcard_processor)
+        if self.snapshot.conditional_rules:
+            context = self.rule_engine.apply_rules(context, self.snapshot.conditional_rules, [], source_row)
+        context.final_prompt = format_final_prompt(context)
+
+        if use_engine_state:
+            self.sequential_counters = context.sequential_counters
+            self.wildcard_state = context.wildcard_state
+        return context
+
+    def generate_many(self, rows, seed: Optional[int] = None, workers: int = 1,
+                      use_processes: bool = False) -> List[PromptContext]:
+        """
+        여러 source_row(DataFrame 또는 Series 목록)로 프롬프트를 생성합니다. 결과는 입력 순서와 같습니다.
+
+        - 행마다의 와일드카드 시드는 seed에서 SeedSequence로 파생하므로 workers 수와 관계없이 결과가 같습니다.
+        - workers > 1 이면 첫 행을 먼저 생성해 한 프롬프트가 순차 카운터를 얼마나 진행시키는지 측정하고,
+          i번째 행은 '시작 카운터 + i × 진행량'에서 시작합니다. 생성 후 각 행이 끝낸 카운터가 다음 행의
+          시작 카운터와 같은지 확인하여, 조건부/중첩 순차 와일드카드처럼 진행량이 달라진 행이 있으면
+          그 다음 행부터는 실제 카운터를 이어받아 순서대로 다시 생성합니다. (결과는 항상 workers=1과 같음)
+        - use_processes=True 이면 프로세스 풀을 사용합니다. 각 프로세스는 현재 작업 폴더의
+          wildcards/, data/ 를 직접 읽어 매니저를 만듭니다.
+        """
+        row_list = [row for _, row in rows.iterrows()] if isinstance(rows, pd.DataFrame) else list(rows)
+        if not row_list:
+            return []
+
+        base_seed = new_wildcard_seed() if seed is None else seed
+        seeds = [int(s) for s in np.random.SeedSequence(base_seed).generate_state(len(row_list), np.uint64) >> np.uint64(1)]
+
+        if workers <= 1:
+            results = [self.generate(row, row_seed) for row, row_seed in zip(row_list, seeds)]
+            for context in results:
+                context.metadata['batch_seed'] = base_seed
+            return results
+
+        base_counters = dict(self.sequential_counters)
+        base_state = {name: dict(state) for name, state in self.wildcard_state.items()}
+        first = self.generate(row_list[0], seeds[0], base_counters, base_state)
+        stride = {name: value - base_counters.get(name, 0) for name, value in first.sequential_counters.items()}
+
+        def counters_for(index: int) -> Dict[str, int]:
+            counters = dict(base_counters)
+            for name, step in stride.items():
+                counters[name] = counters.get(name, 0) + step * index
+            return counters
+
+        tasks = [(row_list[i], seeds[i], counters_for(i), base_state) for i in range(1, len(row_list))]
+        if use_processes:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_process_worker,
+                                     initargs=(self.snapshot,)) as pool:
+                rest = list(pool.map(_generate_in_process, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                rest = list(pool.map(lambda task: self.generate(*task), tasks))
+
+        results = [first] + rest
+        self._resume_mismatched_counters(results, row_list, seeds, counters_for)
+        # 마지막 행까지 진행한 카운터/상태를 엔진에 반영 (다음 호출이 이어서 진행)
+        self.sequential_counters = results[-1].sequential_counters
+        self.wildcard_state = results[-1].wildcard_state
+        for context in results:
+            context.metadata['batch_seed'] = base_seed
+        return results
+
+    def _resume_mismatched_counters(self, results: List[PromptContext], row_list, seeds, counters_for):
+        """
+        병렬 생성 결과 검증: i번째 행이 끝낸 카운터가 i+1번째 행에 넘긴 시작 카운터와 다르면
+        (진행량이 행마다 다른 템플릿) 그 이후 행들을 실제 카운터를 이어받아 순서대로 다시 생성합니다.
+        """
+        for index, context in enumerate(results[:-1]):
+            if context.sequential_counters == counters_for(index + 1):
+                continue
+            print(f"⚠️ {index}번째 행의 순차 와일드카드 진행량이 달라 이후 {len(results) - index - 1}개 행을 순서대로 다시 생성합니다.")
+            counters, state = context.sequential_counters, context.wildcard_state
+            for next_index in range(index + 1, len(results)):
+                results[next_index] = self.generate(row_list[next_index], seeds[next_index], counters, state)
+                counters = results[next_index].sequential_counters
+                state = results[next_index].wildcard_state
+            return
+
+# ---- 프로세스 풀 워커 ----
+
+_process_engine: Optional[HeadlessPromptEngine] = None
+
+def _init_process_worker(snapshot: PipelineSnapshot):
+    """워커 프로세스마다 한 번: 와일드카드/필터 데이터를 읽어 엔진을 만듭니다."""
+    global _process_engine
+    from core.wildcard_manager import WildcardManager
+    from core.filter_data_manager import FilterDataManager
+    _process_engine = HeadlessPromptEngine(snapshot, WildcardManager(), FilterDataManager())
+
+def _generate_in_process(task) -> PromptContext:
+    context = _process_engine.generate(*task)
+    # 난수 생성기는 결과 전달에 필요 없으므로 직렬화 전에 제거 (시드는 metadata에 기록됨)
+    context.wildcard_sampler = None
+    return context
+
+# ---- CLI ----
+
+def _read_rows(path: str) -> pd.DataFrame:
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    if path.endswith('.csv'):
+        return pd.read_csv(path)
+    raise ValueError(f"지원하지 않는 입력 형식입니다: {path} (.parquet 또는 .csv)")
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="NAIA 헤드리스 프롬프트 생성기")
+    parser.add_argument('--input', help="source_row로 사용할 .parquet/.csv 파일 (생략 시 와일드카드 단독 모드)")
+    parser.add_argument('--count', type=int, default=10, help="생성할 프롬프트 수 (입력 파일이 있으면 행 수를 넘지 않음)")
+    parser.add_argument('--seed', type=int, default=None, help="배치 시드 (같은 시드면 같은 결과)")
+    parser.add_argument('--mode', default='NAI', help="읽어올 모듈 설정 모드 (NAI/WEBUI)")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--processes', action='store_true', help="스레드 대신 프로세스 풀 사용")
+    parser.add_argument('--random', action='store_true', help="입력 행을 무작위로 섞어서 사용")
+    parser.add_argument('--output', help="결과를 저장할 .jsonl 파일 (생략 시 표준 출력)")
+    args = parser.parse_args(argv)
+
+    if args.input:
+        df = _read_rows(args.input)
+        if args.random:
+            df = df.sample(frac=1.0, random_state=args.seed)
+        rows = df.head(args.count)
+        settings = {'wildcard_standalone': False}
+    else:
+        empty_data = {'general': None, 'character': None, 'copyright': None, 'artist': None, 'meta': None}
+        rows = [pd.Series(empty_data, name="wildcard_standalone") for _ in range(args.count)]
+        settings = {'wildcard_standalone': True}
+
+    from core.wildcard_manager import WildcardManager
+    from core.filter_data_manager import FilterDataManager
+    snapshot = PipelineSnapshot.from_saved_settings(args.mode, settings)
+    engine = HeadlessPromptEngine(snapshot, WildcardManager(), FilterDataManager())
+    results = engine.generate_many(rows, seed=args.seed, workers=args.workers, use_processes=args.processes)
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for index, context in enumerate(results):
+            if args.output:
+                out.write(json.dumps({'index': index, 'prompt': context.final_prompt,
+                                      'wildcard_seed': context.metadata.get('wildcard_seed'),
+                                      'wildcard_counters': context.metadata.get('wildcard_counters')},
+                                     ensure_ascii=False) + '\n')
+            else:
+                out.write(f"[{index}] {context.final_prompt}\n\n")
+    finally:
+        if args.output:
+            out.close()
+            print(f"✅ {len(results)}개 프롬프트 저장: {args.output}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
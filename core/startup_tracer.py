@@ -0,0 +1,84 @@
+# core/startup_tracer.py
+
+import os
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+class StartupTracer:
+    """
+    앱 시작 과정의 단계별 소요 시간(wall time)을 기록하는 트레이서.
+    phase() 컨텍스트 매니저로 구간을 감싸면 시작 시각/소요 시간/중첩 깊이가 기록되고,
+    dump()로 save/startup_trace.json 에 저장하여 실행 간 비교할 수 있습니다.
+    """
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self._depth = 0
+        self.phases: List[Dict[str, Any]] = []
+        self.marks: List[Dict[str, Any]] = []
+
+    def _elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._origin) * 1000.0
+
+    @contextmanager
+    def phase(self, name: str):
+        """구간 시간을 측정합니다. 예외가 발생해도 기록은 남깁니다."""
+        start_ms = self._elapsed_ms()
+        record = {'name': name, 'start_ms': round(start_ms, 2), 'duration_ms': None, 'depth': self._depth}
+        self.phases.append(record)
+        self._depth += 1
+        try:
+            yield record
+        finally:
+            self._depth -= 1
+            record['duration_ms'] = round(self._elapsed_ms() - start_ms, 2)
+
+    def mark(self, name: str):
+        """특정 시점(예: 창 표시 완료)을 기록합니다."""
+        self.marks.append({'name': name, 'at_ms': round(self._elapsed_ms(), 2)})
+
+    def get_mark(self, name: str) -> Optional[float]:
+        """기록된 시점의 경과 시간(ms)을 반환합니다."""
+        for mark in self.marks:
+            if mark['name'] == name:
+                return mark['at_ms']
+        return None
+
+    def print_summary(self):
+        """단계별 소요 시간을 콘솔에 출력합니다."""
+        print("⏱️ 시작 단계별 소요 시간:")
+        for record in self.phases:
+            duration = record['duration_ms']
+            duration_text = f"{duration:8.1f} ms" if duration is not None else "  (진행 중)"
+            print(f"  {'  ' * record['depth']}- {record['name']}: {duration_text}")
+        for mark in self.marks:
+            print(f"  ● {mark['name']} @ {mark['at_ms']:.1f} ms")
+
+    def dump(self, file_path: str = os.path.join('save', 'startup_trace.json')):
+        """기록을 JSON 파일로 저장합니다."""
+        try:
+            os.makedirs(os.path.dirname(file_path) or '.', exist_ok=True)
+            data = {
+                'timestamp': datetime.now().isoformat(),
+                'total_ms': round(self._elapsed_ms(), 2),
+                'phases': self.phases,
+                'marks': self.marks,
+            }
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            print(f"✅ 시작 프로파일 저장: {file_path}")
+        except Exception as e:
+            print(f"⚠️ 시작 프로파일 저장 실패: {e}")
+
+
+_startup_tracer = None
+
+def get_startup_tracer() -> StartupTracer:
+    """StartupTracer 싱글톤 인스턴스 반환 (최초 호출 시점이 측정 기준점)"""
+    global _startup_tracer
+    if _startup_tracer is None:
+        _startup_tracer = StartupTracer()
+    return _startup_tracer
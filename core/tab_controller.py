@@ -1,15 +1,15 @@
 import os
-import glob
-import importlib.util
 import traceback
-from pathlib import Path
-from typing import Type, List, Dict, Optional
+from typing import Any, Type, List, Dict, Optional
 
-from PyQt6.QtWidgets import QTabWidget, QWidget, QPushButton, QTabBar
+from PyQt6.QtWidgets import QTabWidget, QWidget, QPushButton, QTabBar, QVBoxLayout, QLabel
+from PyQt6.QtCore import Qt
 from PyQt6.QtCore import pyqtSignal
 
 from interfaces.base_tab_module import BaseTabModule
 from core.context import AppContext
+from core.startup_tracer import get_startup_tracer
+from core.module_discovery import ModuleDiscovery
 from ui.theme import DARK_STYLES
 
 class TabController(QWidget):
@@ -28,9 +28,16 @@ class TabController(QWidget):
         self.app_context = app_context
         self.tab_widget = tab_widget  # UI 제어를 위해 RightView의 QTabWidget을 직접 참조
 
-        self.module_classes: List[Type[BaseTabModule]] = []
+        self.module_classes: List[Type[BaseTabModule]] = []  # 지금까지 import 된 탭 클래스
+        self.tab_entries: List[Dict[str, Any]] = []  # 매니페스트 항목 (order 순)
         self.module_instances: Dict[str, BaseTabModule] = {}
         self.tab_index_map: Dict[str, int] = {}  # tab_id -> index 매핑
+        self.tab_pages: Dict[str, QWidget] = {}  # tab_id -> QTabWidget에 추가된 위젯
+        # 아직 인스턴스/위젯이 생성되지 않은 탭: tab_id -> 자리표시 컨테이너
+        self.deferred_tabs: Dict[str, QWidget] = {}
+        self.discovery = ModuleDiscovery(tabs_dir, "tabs", "*.py", BaseTabModule, self._describe_tab_class)
+
+        self.tab_widget.currentChanged.connect(self._on_current_tab_changed)
         
         if not os.path.exists(tabs_dir):
             os.makedirs(tabs_dir)
@@ -38,70 +45,152 @@ class TabController(QWidget):
 
     def initialize_tabs(self):
         """모든 탭 모듈을 로드하고 UI를 구성하는 메인 메서드"""
-        self._load_tab_modules()
-        
-        # 모듈들을 order 순서대로 정렬
-        sorted_classes = sorted(self.module_classes, key=lambda c: c().get_tab_order())
+        tracer = get_startup_tracer()
+        with tracer.phase("tabs: discovery"):
+            # 매니페스트의 order로 정렬 (정렬만을 위해 인스턴스를 만들지 않음)
+            self.tab_entries = sorted(self.discovery.discover(), key=lambda e: e['order'])
 
-        for cls in sorted_classes:
+        for entry in self.tab_entries:
+            tab_id = entry['tab_id']
             try:
-                # 1. 모듈 인스턴스 생성
-                temp_instance = cls()
-                if temp_instance.get_tab_type() != 'core':
-                    print(f"  -> 동적 탭 '{temp_instance.get_tab_title()}'은 시작 시 로드하지 않습니다.")
+                if entry['type'] != 'core':
+                    print(f"  -> 동적 탭 '{entry['title']}'은 시작 시 로드하지 않습니다.")
                     continue
-                instance = cls()
-                tab_id = instance.tab_id
-
-                # 2. 컨텍스트 주입
-                instance.initialize_with_context(self.app_context)
-                
-                # 3. UI 위젯 생성
-                widget = instance.create_widget(parent=self.tab_widget)
-                
-                # 4. 탭 위젯에 추가
+
+                # 지연 로드 탭: 자리표시 컨테이너만 추가하고 클래스 import/인스턴스 생성은 첫 활성화 시 수행
+                if entry['deferred']:
+                    container = self._create_deferred_container(entry['title'])
+                    tab_index = self.tab_widget.addTab(container, entry['title'])
+                    self.tab_index_map[tab_id] = tab_index
+                    self.tab_pages[tab_id] = container
+                    self.deferred_tabs[tab_id] = container
+                    print(f"  -> 탭 '{entry['title']}'은 첫 활성화 시 생성합니다.")
+                    continue
+
+                with tracer.phase(f"tab: {entry['class']}"):
+                    # 1. 모듈 인스턴스 생성 및 컨텍스트 주입
+                    instance = self._create_instance(entry)
+                    if instance is None:
+                        continue
+
+                    # 2. UI 위젯 생성
+                    widget = instance.create_widget(parent=self.tab_widget)
+
+                # 3. 탭 위젯에 추가
                 tab_index = self.tab_widget.addTab(widget, instance.get_tab_title())
 
-                # 5. 인스턴스 및 정보 저장
+                # 4. 인스턴스 및 정보 저장
                 self.module_instances[tab_id] = instance
                 self.tab_index_map[tab_id] = tab_index
-                
-                # 6. 닫기 가능한 탭에 닫기 버튼 추가
+                self.tab_pages[tab_id] = widget
+
+                # 5. 닫기 가능한 탭에 닫기 버튼 추가
                 if instance.can_close_tab():
                     self._add_close_button_to_tab(tab_index, tab_id)
-                
-                # 7. 초기화 완료 후 on_initialize 호출
+
+                # 6. 초기화 완료 후 on_initialize 호출
                 instance.on_initialize()
-                
+
                 self.tab_added.emit(tab_id, instance)
                 print(f"✅ 탭 '{instance.get_tab_title()}' UI 생성 및 초기화 완료.")
 
             except Exception as e:
-                print(f"❌ 탭 '{cls.__name__}' 생성 중 오류 발생: {e}")
+                print(f"❌ 탭 '{entry['class']}' 생성 중 오류 발생: {e}")
                 traceback.print_exc()
 
-    def _load_tab_modules(self):
-        """'tabs/' 디렉토리에서 *.py 파일들을 찾아 클래스를 로드합니다."""
-        print(f"🔍 탭 모듈 로드 시작: {self.tabs_dir}")
-        pattern = os.path.join(self.tabs_dir, "*.py")
-        module_files = glob.glob(pattern)
+        # 시작 시 현재 탭이 지연 탭이라면 바로 생성
+        self._on_current_tab_changed(self.tab_widget.currentIndex())
 
-        for path in module_files:
-            name = Path(path).stem
-            try:
-                spec = importlib.util.spec_from_file_location(name, path)
-                if spec and spec.loader:
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-                    
-                    for attr in dir(module):
-                        obj = getattr(module, attr)
-                        if isinstance(obj, type) and issubclass(obj, BaseTabModule) and obj is not BaseTabModule:
-                            self.module_classes.append(obj)
-                            print(f"  -> 탭 모듈 클래스 발견: {obj.__name__}")
-            except Exception as e:
-                print(f"❌ 탭 모듈 로드 실패 ({name}): {e}")
-                traceback.print_exc()
+    @staticmethod
+    def _describe_tab_class(cls: Type[BaseTabModule]) -> Dict[str, Any]:
+        """매니페스트에 저장할 탭 정보 (캐시 미스 시에만 인스턴스를 만들어 수집)"""
+        probe = cls()
+        try:
+            return {
+                'tab_id': probe.tab_id,
+                'title': probe.get_tab_title(),
+                'order': probe.get_tab_order(),
+                'type': probe.get_tab_type(),
+                'deferred': probe.should_defer_widget(),
+            }
+        finally:
+            probe.deleteLater()
+
+    def _find_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """tab_id 또는 클래스 이름으로 매니페스트 항목을 찾습니다."""
+        return next((e for e in self.tab_entries if e['tab_id'] == key or e['class'] == key), None)
+
+    def _create_instance(self, entry: Dict[str, Any]) -> Optional[BaseTabModule]:
+        """항목의 클래스를 import 하여 인스턴스를 만들고 컨텍스트를 주입합니다."""
+        cls = self.discovery.load_class(entry)
+        if cls is None:
+            return None
+        if cls not in self.module_classes:
+            self.module_classes.append(cls)
+        instance = cls()
+        instance.initialize_with_context(self.app_context)
+        return instance
+
+    def get_tab_title(self, tab_id: str) -> Optional[str]:
+        """탭 제목을 반환합니다. 아직 생성되지 않은 지연 탭도 매니페스트 정보로 응답합니다."""
+        instance = self.module_instances.get(tab_id)
+        if instance is not None:
+            return instance.get_tab_title()
+        entry = self._find_entry(tab_id)
+        return entry['title'] if entry else None
+
+    def _create_deferred_container(self, title: str) -> QWidget:
+        """실제 위젯이 생성될 때까지 탭 자리를 차지하는 컨테이너를 만듭니다."""
+        container = QWidget()
+        layout = QVBoxLayout(container)
+        layout.setContentsMargins(0, 0, 0, 0)
+        loading_label = QLabel(f"{title} 불러오는 중...")
+        loading_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(loading_label)
+        return container
+
+    def _on_current_tab_changed(self, index: int):
+        """지연 탭이 처음 활성화되면 실제 위젯을 생성합니다."""
+        if not self.deferred_tabs:
+            return
+        container = self.tab_widget.widget(index)
+        for tab_id, deferred_container in self.deferred_tabs.items():
+            if deferred_container is container:
+                self.ensure_tab_widget(tab_id)
+                break
+
+    def ensure_tab_widget(self, tab_id: str):
+        """
+        지연 탭의 인스턴스와 실제 위젯을 생성하여 자리표시 컨테이너 안에 넣습니다.
+        컨테이너를 그대로 재사용하므로 탭 인덱스/가시성/현재 탭 상태가 유지됩니다.
+        """
+        container = self.deferred_tabs.pop(tab_id, None)
+        entry = self._find_entry(tab_id)
+        if container is None or entry is None:
+            return
+
+        try:
+            with get_startup_tracer().phase(f"tab (deferred): {entry['class']}"):
+                instance = self._create_instance(entry)
+                if instance is None:
+                    return
+
+                layout = container.layout()
+                while layout.count():
+                    item = layout.takeAt(0)
+                    if item.widget():
+                        item.widget().deleteLater()
+
+                widget = instance.create_widget(parent=container)
+                layout.addWidget(widget)
+                self.module_instances[tab_id] = instance
+                instance.on_initialize()
+
+            self.tab_added.emit(tab_id, instance)
+            print(f"✅ 지연 탭 '{instance.get_tab_title()}' UI 생성 및 초기화 완료.")
+        except Exception as e:
+            print(f"❌ 지연 탭 '{tab_id}' 생성 중 오류 발생: {e}")
+            traceback.print_exc()
 
     def _add_close_button_to_tab(self, tab_index: int, tab_id: str):
         """특정 탭에 닫기 버튼을 추가합니다."""
@@ -149,6 +238,8 @@ class TabController(QWidget):
         # 매핑 정보 제거
         del self.module_instances[tab_id]
         del self.tab_index_map[tab_id]
+        self.tab_pages.pop(tab_id, None)
+        self.deferred_tabs.pop(tab_id, None)
         
         # 인덱스 매핑 재조정
         self._rebuild_index_mapping()
@@ -159,12 +250,10 @@ class TabController(QWidget):
     def _rebuild_index_mapping(self):
         """탭 인덱스 매핑을 재구축합니다."""
         self.tab_index_map.clear()
-        for i in range(self.tab_widget.count()):
-            widget = self.tab_widget.widget(i)
-            for tab_id, instance in self.module_instances.items():
-                if hasattr(instance, 'widget') and instance.widget == widget:
-                    self.tab_index_map[tab_id] = i
-                    break
+        for tab_id, page in self.tab_pages.items():
+            index = self.tab_widget.indexOf(page)
+            if index != -1:
+                self.tab_index_map[tab_id] = index
 
     def get_tab_instance(self, tab_id: str) -> Optional[BaseTabModule]:
         """탭 ID로 탭 인스턴스를 반환합니다."""
@@ -182,17 +271,18 @@ class TabController(QWidget):
                 self.switch_to_tab(instance.tab_id)
                 return
 
-        # 2. 로드된 클래스 목록에서 해당 클래스 찾기
-        TargetModuleClass = next((cls for cls in self.module_classes if cls.__name__ == module_class_name), None)
+        # 2. 매니페스트에서 해당 클래스 항목 찾기 (클래스는 이 시점에 import)
+        entry = self._find_entry(module_class_name)
 
-        if not TargetModuleClass:
+        if not entry:
             print(f"❌ '{module_class_name}'에 해당하는 탭 모듈 클래스를 찾을 수 없습니다.")
             return
 
         # 3. 새 탭 추가 (기존 add_tab_from_class 로직 재사용)
         try:
-            instance = TargetModuleClass()
-            instance.initialize_with_context(self.app_context)
+            instance = self._create_instance(entry)
+            if instance is None:
+                return
             
             # 동적 데이터가 필요한 경우 setup 메서드 호출
             if hasattr(instance, 'setup'):
@@ -203,6 +293,7 @@ class TabController(QWidget):
 
             self.module_instances[instance.tab_id] = instance
             self.tab_index_map[instance.tab_id] = tab_index
+            self.tab_pages[instance.tab_id] = widget
             
             if instance.can_close_tab():
                 self._add_close_button_to_tab(tab_index, instance.tab_id)
@@ -1,20 +1,166 @@
 # core/wildcard_manager.py
 
 import os
+import re
+import sys
+import glob
+import json
+import hashlib
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+import numpy as np
+
+from core.wildcard_store import CompactLines
+from core.wildcard_template import is_literal
+
+# '3::tag, tag' 형태의 라인 가중치. 접두어 뒤의 '::' 개수가 짝수(닫힌 NAI 강조 구문 '1.2::tag::')일 때만 가중치로 봄
+# 주의: 닫지 않은 강조 구문('1.5::masterpiece')은 가중치 1.5로 읽히므로, 강조로 쓰려면 '1.5::masterpiece::'처럼 닫아야 함
+_WEIGHT_PATTERN = re.compile(r'^(\d+(?:\.\d*)?)::\s*(.+)$')
+
+@dataclass
+class WildcardDiff:
+    """리로드 전후로 달라진 와일드카드 이름 목록"""
+    added: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.modified or self.removed)
+
+    def __str__(self) -> str:
+        return f"+{len(self.added)} ~{len(self.modified)} -{len(self.removed)}"
+
+class AliasTable:
+    """
+    가중치 라인용 Walker alias 테이블. 로드 시 한 번 O(n)으로 만들고 추첨은 O(1)입니다.
+    균등 인덱스 i와 [0, 1) 실수 u로 u < prob[i] 이면 i, 아니면 alias[i]를 선택합니다.
+    lines는 테이블을 만든 라인 리스트로, 리로드 중에도 다른 파일의 테이블과 섞이지 않도록 비교에 사용합니다.
+    """
+    __slots__ = ('lines', 'prob', 'alias')
+
+    def __init__(self, lines: Sequence[str], weights: List[float]):
+        self.lines = lines
+        n = len(weights)
+        total = float(sum(weights))
+        scaled = [w * n / total for w in weights]
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s], alias[s] = scaled[s], l
+            scaled[l] += scaled[s] - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+        # 남은 항목은 부동소수 오차로 1.0 근처에 있는 것들이므로 자기 자신을 선택
+        self.prob = np.array(prob, dtype=np.float64)
+        self.alias = np.array(alias, dtype=np.int64)
+
+    def pick(self, index: int, u: float) -> int:
+        return index if u < self.prob[index] else int(self.alias[index])
+
+    def pick_many(self, indices: np.ndarray, u: np.ndarray) -> np.ndarray:
+        return np.where(u < self.prob[indices], indices, self.alias[indices])
+
+@dataclass
+class WildcardScan:
+    """collect_changes()의 결과. apply_changes()로 반영합니다."""
+    file_index: Dict[str, Tuple[str, int, int]]  # 이름 -> (경로, mtime_ns, 크기)
+    loaded: Dict[str, Sequence[str]]              # 새로 읽은 파일의 라인 (list 또는 CompactLines, 비어있으면 빈 리스트)
+    diff: WildcardDiff
+    directories: Set[str]
+    alias_tables: Dict[str, AliasTable] = field(default_factory=dict)  # 가중치 라인이 있는 파일만
+    literal_files: Set[str] = field(default_factory=set)  # 모든 라인에 와일드카드 구문이 없는 파일
 
 class WildcardManager:
-    def __init__(self):
+    SETTINGS_PATH = os.path.join('save', 'wildcard_settings.json')
+    CACHE_DIR = os.path.join('save', 'wildcard_cache')
+    # 라인 저장 방식
+    # - 'list'   : 파일별 str 리스트 (기본값, 같은 라인 문자열은 파일 간에 intern으로 공유)
+    # - 'compact': 파일별 UTF-8 버퍼 + 오프셋 배열 (CompactLines, 선택된 라인만 디코딩)
+    # - 'mmap'   : compact 버퍼를 save/wildcard_cache에 기록하고 메모리 매핑
+    STORAGE_MODES = ('list', 'compact', 'mmap')
+
+    def __init__(self, storage_mode: Optional[str] = None):
         self.wildcards_dir = os.path.join(os.getcwd(), 'wildcards')
+        self.storage_mode = storage_mode or self._load_storage_mode()
         self.wildcard_dict_tree = {}
+        # 가중치('3::tag') 라인이 있는 파일의 alias 테이블. 없는 파일은 균등 추첨
+        self.alias_tables: Dict[str, AliasTable] = {}
+        # 모든 라인이 일반 태그인(중첩 와일드카드가 없는) 파일: 이름 -> 해당 라인 객체 (배치 확장의 열 단위 경로 판단용)
+        self.literal_files: Dict[str, Sequence[str]] = {}
         self.reload_callbacks = []
+        # 파일별 (경로, mtime, 크기) 색인. 리로드 시 바뀐 파일만 다시 읽는 기준
+        self._file_index: Dict[str, Tuple[str, int, int]] = {}
+        self.directories: Set[str] = set()
         self.activate_wildcards()
 
     def activate_wildcards(self):
         """
-        [수정됨] os.walk를 사용하여 모든 하위 폴더를 재귀적으로 탐색하고
-        와일드카드 딕셔너리를 구축합니다.
+        [수정됨] 모든 하위 폴더를 재귀적으로 탐색하여 와일드카드 딕셔너리를 처음부터 구축합니다.
         """
+        self._file_index = {}
+        if self.storage_mode == 'mmap':
+            self._clear_mmap_cache()
+        self.apply_changes(self.collect_changes(), full_reload=True)
+
+    def _load_storage_mode(self) -> str:
+        """save/wildcard_settings.json의 storage_mode를 읽습니다. (없거나 잘못되면 'list')"""
+        try:
+            if os.path.exists(self.SETTINGS_PATH):
+                with open(self.SETTINGS_PATH, 'r', encoding='utf-8') as f:
+                    mode = json.load(f).get('storage_mode', 'list')
+                if mode in self.STORAGE_MODES:
+                    return mode
+                print(f"⚠️ 알 수 없는 와일드카드 저장 방식 '{mode}', 'list'를 사용합니다.")
+        except Exception as e:
+            print(f"⚠️ 와일드카드 설정 로드 실패: {e}")
+        return 'list'
+
+    def _clear_mmap_cache(self):
+        """이전 실행에서 남은 매핑 파일 정리 (사용 중인 파일은 건너뜀)"""
+        os.makedirs(self.CACHE_DIR, exist_ok=True)
+        for path in glob.glob(os.path.join(self.CACHE_DIR, '*.bin')):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _remove_replaced_mmaps(old_tree: Dict[str, Sequence[str]], new_tree: Dict[str, Sequence[str]]):
+        """
+        교체/삭제된 와일드카드의 매핑 파일을 지웁니다.
+        Windows에서는 이전 매핑이 아직 열려 있으면 삭제가 실패하므로 무시하고, 다음 실행 시 _clear_mmap_cache가 정리합니다.
+        """
+        for name, lines in old_tree.items():
+            path = getattr(lines, 'path', None)
+            if path is None or getattr(new_tree.get(name), 'path', None) == path:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _store_lines(self, name: str, lines: List[str], mtime: int) -> Sequence[str]:
+        """storage_mode에 맞는 형태로 라인 리스트를 변환합니다."""
+        if not lines:
+            return lines
+        if self.storage_mode == 'list':
+            return [sys.intern(line) for line in lines]
+        mmap_path = None
+        if self.storage_mode == 'mmap':
+            # 수정된 파일은 새 이름으로 기록하여 기존 매핑을 읽는 중인 스레드와 충돌하지 않게 함
+            digest = hashlib.md5(name.encode('utf-8')).hexdigest()[:16]
+            mmap_path = os.path.join(self.CACHE_DIR, f"{digest}_{mtime}.bin")
+        try:
+            return CompactLines.from_lines(lines, mmap_path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 와일드카드 압축 저장 실패, 리스트로 유지합니다 ({name}): {e}")
+            return lines
+
+    def _scan_files(self) -> Tuple[Dict[str, Tuple[str, int, int]], Set[str]]:
+        """파일 내용을 읽지 않고 stat 정보만으로 .txt 파일 색인과 폴더 목록을 만듭니다."""
         if not os.path.exists(self.wildcards_dir):
             os.makedirs(self.wildcards_dir)
             try:
@@ -22,50 +168,158 @@ class WildcardManager:
             except UnicodeEncodeError:
                 print(f"[DIR] 와일드카드 디렉토리 생성: {self.wildcards_dir}")
 
-        self.wildcard_dict_tree.clear() # 매번 새로고침을 위해 초기화
-
-        # os.walk로 wildcards_dir의 모든 파일과 폴더를 순회합니다.
-        for root, dirs, files in os.walk(self.wildcards_dir):
-            for file in files:
-                if file.endswith('.txt'):
-                    file_path = os.path.join(root, file)
-                    
-                    # wildcards_dir를 기준으로 상대 경로를 계산합니다.
-                    # 예: 'wildcards/characters/outfit.txt' -> 'characters/outfit.txt'
-                    relative_path = os.path.relpath(file_path, self.wildcards_dir)
-                    
-                    # 와일드카드 이름 생성 (확장자 제거 및 경로 구분자 통일)
-                    # 예: 'characters\\outfit.txt' -> 'characters/outfit'
-                    wildcard_name = Path(relative_path).with_suffix('').as_posix()
-                    
-                    try:
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            # 비어있지 않은 라인만 리스트에 추가
-                            lines = [line.strip() for line in f if line.strip()]
-                        
-                        if lines:
-                            self.wildcard_dict_tree[wildcard_name] = lines
-                        else:
-                            try:
-                                print(f"⚠️ 와일드카드 파일이 비어있습니다: {file_path}")
-                            except UnicodeEncodeError:
-                                print(f"[WARN] 와일드카드 파일이 비어있습니다: {file_path}")
-                            
-                    except Exception as e:
-                        try:
-                            print(f"❌ 와일드카드 파일 읽기 오류 {file_path}: {e}")
-                        except UnicodeEncodeError:
-                            print(f"[ERROR] 와일드카드 파일 읽기 오류 {file_path}: {e}")
+        file_index = {}
+        directories = set()
+        pending = [self.wildcards_dir]
+        while pending:
+            directory = pending.pop()
+            directories.add(directory)
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.name.endswith('.txt'):
+                            # 'wildcards/characters/outfit.txt' -> 'characters/outfit'
+                            relative_path = os.path.relpath(entry.path, self.wildcards_dir)
+                            wildcard_name = Path(relative_path).with_suffix('').as_posix()
+                            stat = entry.stat()
+                            file_index[wildcard_name] = (entry.path, stat.st_mtime_ns, stat.st_size)
+            except OSError as e:
+                print(f"❌ 와일드카드 폴더 탐색 오류 {directory}: {e}")
+        return file_index, directories
 
+    @staticmethod
+    def _read_wildcard_file(file_path: str) -> List[str]:
         try:
-            print(f"✅ {len(self.wildcard_dict_tree)} 개의 와일드카드 로드 완료.")
-        except UnicodeEncodeError:
-            print(f"[OK] {len(self.wildcard_dict_tree)} 개의 와일드카드 로드 완료.")
-        
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                # 비어있지 않은 라인만 리스트에 추가
+                lines = [line.strip() for line in f if line.strip()]
+        except Exception as e:
+            try:
+                print(f"❌ 와일드카드 파일 읽기 오류 {file_path}: {e}")
+            except UnicodeEncodeError:
+                print(f"[ERROR] 와일드카드 파일 읽기 오류 {file_path}: {e}")
+            return []
+
+        if not lines:
+            try:
+                print(f"⚠️ 와일드카드 파일이 비어있습니다: {file_path}")
+            except UnicodeEncodeError:
+                print(f"[WARN] 와일드카드 파일이 비어있습니다: {file_path}")
+        return lines
+
+    @staticmethod
+    def _parse_weights(lines: List[str]) -> Tuple[List[str], Optional[List[float]]]:
+        """
+        '3::tag, tag' 가중치 접두어를 분리합니다. 가중치가 없는 라인은 1, 0 이하인 라인은 제외합니다.
+        가중치 라인이 하나도 없으면 (원본 라인, None)을 반환합니다.
+        """
+        if not any('::' in line for line in lines):
+            return lines, None
+
+        parsed_lines, weights = [], []
+        has_weight = False
+        for line in lines:
+            match = _WEIGHT_PATTERN.match(line)
+            if match and match.group(2).count('::') % 2 == 0:
+                has_weight = True
+                weight = float(match.group(1))
+                if weight <= 0:
+                    continue
+                parsed_lines.append(match.group(2))
+                weights.append(weight)
+            else:
+                parsed_lines.append(line)
+                weights.append(1.0)
+        if not has_weight:
+            return lines, None
+        return parsed_lines, weights
+
+    def collect_changes(self) -> WildcardScan:
+        """
+        이전 색인과 비교하여 추가/변경된 파일만 읽습니다.
+        공유 상태를 바꾸지 않으므로 작업 스레드에서 호출해도 안전합니다.
+        """
+        previous_index = self._file_index
+        file_index, directories = self._scan_files()
+
+        diff = WildcardDiff()
+        loaded = {}
+        alias_tables = {}
+        literal_files = set()
+        for name, (path, mtime, size) in file_index.items():
+            previous = previous_index.get(name)
+            if previous is not None and previous[1:] == (mtime, size):
+                continue
+            lines, weights = self._parse_weights(self._read_wildcard_file(path))
+            if lines and all(is_literal(line) for line in lines):
+                literal_files.add(name)
+            lines = self._store_lines(name, lines, mtime)
+            loaded[name] = lines
+            if lines and weights:
+                alias_tables[name] = AliasTable(lines, weights)
+            if name in self.wildcard_dict_tree:
+                # 내용이 비게 된 파일은 삭제로 취급 (빈 와일드카드는 등록하지 않음)
+                (diff.modified if loaded[name] else diff.removed).append(name)
+            elif loaded[name]:
+                diff.added.append(name)
+
+        for name in previous_index.keys() - file_index.keys():
+            if name in self.wildcard_dict_tree:
+                diff.removed.append(name)
+
+        return WildcardScan(file_index, loaded, diff, directories, alias_tables, literal_files)
+
+    def apply_changes(self, scan: WildcardScan, full_reload: bool = False):
+        """
+        collect_changes()의 결과를 반영하고 리로드 콜백에 변경 내역을 알립니다.
+        딕셔너리를 복사한 뒤 통째로 교체하므로 다른 스레드의 조회는 항상 완성된 상태를 봅니다.
+        """
+        new_tree = dict(self.wildcard_dict_tree)
+        new_tables = dict(self.alias_tables)
+        new_literals = dict(self.literal_files)
+        for name in scan.diff.removed:
+            new_tree.pop(name, None)
+            new_tables.pop(name, None)
+            new_literals.pop(name, None)
+        for name, lines in scan.loaded.items():
+            new_tables.pop(name, None)
+            new_literals.pop(name, None)
+            if lines:
+                new_tree[name] = lines
+                if name in scan.alias_tables:
+                    new_tables[name] = scan.alias_tables[name]
+                if name in scan.literal_files:
+                    new_literals[name] = lines
+
+        replaced_tree = self.wildcard_dict_tree
+        self.alias_tables = new_tables
+        self.literal_files = new_literals
+        self.wildcard_dict_tree = new_tree
+        self._file_index = scan.file_index
+        self.directories = scan.directories
+        self._remove_replaced_mmaps(replaced_tree, new_tree)
+
+        # 임시 파일 생성 등으로 실제 와일드카드 변화가 없으면 알리지 않음
+        if not full_reload and scan.diff.is_empty():
+            return
+
+        if full_reload:
+            try:
+                print(f"✅ {len(self.wildcard_dict_tree)} 개의 와일드카드 로드 완료. (저장 방식: {self.storage_mode})")
+            except UnicodeEncodeError:
+                print(f"[OK] {len(self.wildcard_dict_tree)} 개의 와일드카드 로드 완료. (저장 방식: {self.storage_mode})")
+        else:
+            try:
+                print(f"✅ 와일드카드 변경 반영 ({scan.diff}), 총 {len(self.wildcard_dict_tree)}개.")
+            except UnicodeEncodeError:
+                print(f"[OK] 와일드카드 변경 반영 ({scan.diff}), 총 {len(self.wildcard_dict_tree)}개.")
+
         # 등록된 콜백 함수들을 호출하여 리로드 이벤트를 알림
         for callback in self.reload_callbacks:
             try:
-                callback(len(self.wildcard_dict_tree))
+                callback(len(self.wildcard_dict_tree), scan.diff)
             except Exception as e:
                 try:
                     print(f"❌ 와일드카드 리로드 콜백 실행 중 오류: {e}")
@@ -75,30 +329,47 @@ class WildcardManager:
     def reload_wildcards(self):
         """
         와일드카드를 다시 로드합니다. 파일 변경사항을 반영하기 위해 사용합니다.
+        mtime/크기가 바뀐 파일만 다시 읽으며, 호출한 스레드에서 동기적으로 실행됩니다.
+        (GUI에서는 WildcardWatcher.request_reload()로 작업 스레드에서 실행)
         """
         try:
             print("🔄 와일드카드 리로드 중...")
         except UnicodeEncodeError:
             print("[RELOAD] 와일드카드 리로드 중...")
-        self.activate_wildcards()
-        
+        self.apply_changes(self.collect_changes())
+
     def register_reload_callback(self, callback):
         """
         와일드카드 리로드 시 호출될 콜백 함수를 등록합니다.
-        콜백 함수는 와일드카드 개수를 인자로 받습니다.
+        콜백 함수는 와일드카드 개수와 변경 내역(WildcardDiff)을 인자로 받습니다.
         """
         if callback not in self.reload_callbacks:
             self.reload_callbacks.append(callback)
-            
+
     def unregister_reload_callback(self, callback):
         """
         등록된 리로드 콜백 함수를 제거합니다.
         """
         if callback in self.reload_callbacks:
             self.reload_callbacks.remove(callback)
-            
+
+    def get_file_paths(self) -> List[str]:
+        """색인된 와일드카드 파일 경로 목록을 반환합니다. (파일 감시용)"""
+        return [path for path, _, _ in self._file_index.values()]
+
+    def get_alias_table(self, wildcard_name: str, lines: Sequence[str]) -> Optional[AliasTable]:
+        """lines(현재 조회한 라인 리스트)에 대응하는 가중치 테이블을 반환합니다. 가중치가 없으면 None."""
+        table = self.alias_tables.get(wildcard_name)
+        if table is not None and table.lines is lines:
+            return table
+        return None
+
+    def is_literal_file(self, wildcard_name: str, lines: Sequence[str]) -> bool:
+        """lines(현재 조회한 라인 리스트)의 모든 라인이 다른 와일드카드를 포함하지 않는지 (로드 시 계산)"""
+        return self.literal_files.get(wildcard_name) is lines
+
     def get_wildcard_count(self):
         """
         현재 로드된 와일드카드 개수를 반환합니다.
         """
-        return len(self.wildcard_dict_tree)
\ No newline at end of file
+        return len(self.wildcard_dict_tree)
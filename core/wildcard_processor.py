@@ -1,13 +1,102 @@
-import random
-import re
-from typing import List
+import secrets
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+import pandas as pd
 from .prompt_context import PromptContext
 from .wildcard_manager import WildcardManager
+from .wildcard_template import (
+    WildcardRef, Literal, InlineChoice, FileRef, compile_wildcard, place_star_tags
+)
+
+@dataclass
+class ExpandedPrompt:
+    """expand_batch()가 돌려주는 프롬프트 하나의 확장 결과"""
+    tags: List[str]
+    global_append_tags: List[str] = field(default_factory=list)
+    wildcard_history: Dict[str, List[str]] = field(default_factory=dict)
+    wildcard_state: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    def to_prompt(self) -> str:
+        """확장된 태그 뒤에 global_append_tags를 붙인 프롬프트 문자열"""
+        return ', '.join(self.tags + self.global_append_tags)
+
+def new_wildcard_seed() -> int:
+    """새 와일드카드 시드 (OS 난수 기반, JSON/메타데이터에 그대로 저장 가능한 63비트 정수)"""
+    return secrets.randbits(63)
+
+class BatchSampler:
+    """
+    선택지 개수(size)별로 난수 인덱스를 NumPy로 한 번에 block_size개씩 뽑아 두고
+    하나씩 꺼내 쓰는 샘플러. 같은 크기의 와일드카드끼리 풀을 공유해도 각 추첨은 독립입니다.
+    같은 시드의 Generator와 같은 순서의 요청이면 항상 같은 인덱스가 나옵니다.
+    """
+    def __init__(self, rng: np.random.Generator, block_size: int = 256):
+        self.rng = rng
+        self.block_size = max(1, block_size)
+        self._pools: Dict[int, list] = {}
+        self._positions: Dict[int, int] = {}
+        self._floats: list = []
+        self._float_position = 0
+
+    def draw(self, size: int) -> int:
+        pool = self._pools.get(size)
+        position = self._positions.get(size, 0)
+        if pool is None or position >= len(pool):
+            pool = self.rng.integers(0, size, self.block_size).tolist()
+            self._pools[size] = pool
+            position = 0
+        self._positions[size] = position + 1
+        return pool[position]
+
+    def draw_float(self) -> float:
+        """[0, 1) 범위의 실수 (가중치 alias 추첨용)"""
+        if self._float_position >= len(self._floats):
+            self._floats = self.rng.random(self.block_size).tolist()
+            self._float_position = 0
+        self._float_position += 1
+        return self._floats[self._float_position - 1]
+
+def _object_array(items: list) -> np.ndarray:
+    """튜플/문자열을 원소로 갖는 1차원 object 배열 (튜플이 2차원 배열로 펼쳐지지 않도록)"""
+    array = np.empty(len(items), dtype=object)
+    for i, item in enumerate(items):
+        array[i] = item
+    return array
 
 class WildcardProcessor:
     def __init__(self, wildcard_manager: WildcardManager):
         self.wildcard_manager = wildcard_manager
 
+    @staticmethod
+    def seed_context(context: PromptContext, seed: Optional[int] = None) -> int:
+        """
+        context에 이번 생성 전용 난수 생성기(NumPy PCG64)를 설정하고 시드를 metadata['wildcard_seed']에,
+        그 시점의 순차 카운터/상태를 metadata['wildcard_counters'] / metadata['wildcard_state']에 기록합니다.
+        같은 시드와 기록된 카운터로 다시 확장하면 같은 프롬프트가 나옵니다. (컨텍스트마다 한 번만 호출)
+        """
+        if seed is None:
+            seed = new_wildcard_seed()
+        context.wildcard_sampler = BatchSampler(np.random.Generator(np.random.PCG64(seed)))
+        context.metadata['wildcard_seed'] = seed
+        context.metadata['wildcard_counters'] = dict(context.sequential_counters)
+        context.metadata['wildcard_state'] = {name: dict(state) for name, state in context.wildcard_state.items()}
+        return seed
+
+    def pick_index(self, size: int, context: PromptContext) -> int:
+        """context의 난수 생성기로 0 <= i < size 범위의 인덱스를 선택합니다. (없으면 새 시드로 생성)"""
+        if context.wildcard_sampler is None:
+            self.seed_context(context)
+        return context.wildcard_sampler.draw(size)
+
+    def pick_line(self, wildcard_name: str, lines: Sequence[str], context: PromptContext) -> str:
+        """일반 무작위 모드의 라인 선택. 가중치 파일이면 alias 테이블로 O(1) 추첨합니다."""
+        index = self.pick_index(len(lines), context)
+        table = self.wildcard_manager.get_alias_table(wildcard_name, lines)
+        if table is not None:
+            index = table.pick(index, context.wildcard_sampler.draw_float())
+        return lines[index]
+
     def expand_tags(self, tag_list: List[str], context: PromptContext) -> List[str]:
         """
         태그 리스트를 받아 리스트 내의 모든 와일드카드를 확장합니다.
@@ -18,85 +107,154 @@ class WildcardProcessor:
             expanded_list.extend(self._expand_recursive(tag, context))
         return expanded_list
 
-    def _expand_recursive(self, tag: str, context: PromptContext, depth=0) -> List[str]:
-        """하나의 태그를 재귀적으로 확장합니다."""
-        if depth > 10: return [tag]
+    def expand_batch(self, tag_list: List[str], count: int, context: Optional[PromptContext] = None,
+                     seed: Optional[int] = None) -> List[ExpandedPrompt]:
+        """
+        같은 태그 리스트(템플릿)를 서로 독립적인 count개의 프롬프트로 한 번에 확장합니다.
+        - 무작위 선택은 NumPy(PCG64)로 인덱스를 한 번에 뽑아 사용하며, 같은 seed면 같은 결과가 나옵니다.
+          seed를 주지 않으면 새로 만들고, 사용한 시드와 시작 카운터는 seed_context()와 같은 metadata 키에 기록됩니다.
+        - 순차/종속 카운터는 context의 카운터를 공유하여 프롬프트 순서대로 결정적으로 진행되며,
+          배치가 끝나면 context에 마지막 상태가 남습니다. (다음 배치가 이어서 진행)
+        """
+        if count <= 0:
+            return []
+        if context is None:
+            context = PromptContext(source_row=pd.Series(dtype=object), settings={})
 
-        if tag.startswith('<') and tag.endswith('>'):
-            wildcard_name = tag[1:-1]
-            
-            # 인라인 와일드카드 처리
-            if '|' in wildcard_name:
-                options = wildcard_name.split('|')
-                chosen_option = random.choice(options).strip()
-                return self._expand_recursive(chosen_option, context, depth + 1)
-
-            # 파일 기반 와일드카드 처리 - <태그명> 형태는 기존 로직 유지
-            line = self._get_wildcard_line(wildcard_name, context)
-            if line is None: return [tag]
-            
-            resolved_tags = self._expand_recursive(line, context, depth + 1)
-            
-            final_tags_in_place = []
-            for resolved_tag in resolved_tags:
-                sub_tags = [t.strip() for t in resolved_tag.split(',')]
-                tags_to_keep = [t[1:] for t in sub_tags if t.startswith('*')]
-                tags_to_append = [t for t in sub_tags if not t.startswith('*')]
-
-                if tags_to_keep:
-                    final_tags_in_place.extend(tags_to_keep)
-                    context.global_append_tags.extend(tags_to_append)
-                elif tags_to_append:
-                    final_tags_in_place.append(tags_to_append[0])
-                    context.global_append_tags.extend(tags_to_append[1:])
-            
-            return final_tags_in_place if final_tags_in_place else []
-        
-        # 복합 와일드카드 처리 (__...__)
-        if '__' in tag:
-            parts = re.split(r'(__.*?__)', tag)
-            result_parts = []
-            
-            for part in parts:
-                if not part:
-                    continue
-                    
-                if part.startswith('__') and part.endswith('__'):
-                    # __태그명__ 형태: global_append_tags 없이 현재 위치에 일괄 나열
-                    wildcard_name = part[2:-2]
-                    line = self._get_wildcard_line(wildcard_name, context)
-                    if line is not None:
-                        expanded_parts = self._expand_recursive(line, context, depth + 1)
-                        # 모든 결과를 현재 위치에 콤마로 연결
-                        all_tags = []
-                        for expanded_part in expanded_parts:
-                            sub_tags = [t.strip() for t in expanded_part.split(',')]
-                            all_tags.extend(sub_tags)
-                        result_parts.append(', '.join(all_tags))
-                    else:
-                        result_parts.append(part)  # 확장 실패시 원본 유지
-                else:
-                    result_parts.append(part)
-            
-            return [''.join(result_parts)]
+        compiled = [compile_wildcard(tag) for tag in tag_list]
+        if seed is None:
+            seed = new_wildcard_seed()
+        context.metadata['wildcard_seed'] = seed
+        context.metadata['wildcard_counters'] = dict(context.sequential_counters)
+        context.metadata['wildcard_state'] = {name: dict(state) for name, state in context.wildcard_state.items()}
+        rng = np.random.Generator(np.random.PCG64(seed))
 
-        return [tag]
+        columns = self._plan_columns(compiled)
+        if columns is not None:
+            return self._expand_batch_columns(columns, count, context, rng)
+        return self._expand_batch_nodes(compiled, count, context, rng)
+
+    def _expand_batch_nodes(self, compiled: list, count: int, context: PromptContext,
+                            rng: np.random.Generator) -> List[ExpandedPrompt]:
+        """프롬프트별 트리 순회 배치 확장 (중첩/종속 와일드카드처럼 이전 선택에 의존하는 템플릿)"""
+        # 모든 프롬프트가 하나의 샘플러를 공유 (크기별 인덱스 풀을 count개 단위로 채움)
+        sampler = BatchSampler(rng, count)
+        results = []
+        for _ in range(count):
+            item_context = PromptContext(
+                source_row=context.source_row,
+                settings=context.settings,
+                sequential_counters=context.sequential_counters,
+                wildcard_sampler=sampler,
+            )
+            tags = []
+            for node in compiled:
+                tags.extend(node.expand(self, item_context, 0))
+            results.append(ExpandedPrompt(
+                tags=tags,
+                global_append_tags=item_context.global_append_tags,
+                wildcard_history=item_context.wildcard_history,
+                wildcard_state=item_context.wildcard_state,
+            ))
+
+        context.wildcard_state.update(results[-1].wildcard_state)
+        return results
+
+    def _plan_columns(self, compiled: list) -> Optional[list]:
+        """
+        템플릿의 모든 태그가 열(column) 단위로 한 번에 처리 가능한지 확인합니다.
+        일반 태그, 일반 태그만으로 된 <a|b>, 중첩 와일드카드가 없는 파일의 <name>/<*name>만 허용하며
+        (같은 순차 와일드카드는 한 번만), 그 외에는 None을 반환하여 프롬프트별 트리 순회를 사용합니다.
+        """
+        columns = []
+        sequential_names = set()
+        tree = self.wildcard_manager.wildcard_dict_tree
+        for node in compiled:
+            if isinstance(node, Literal):
+                columns.append(('literal', node.source))
+            elif isinstance(node, InlineChoice) and all(isinstance(o, Literal) for o in node.options):
+                columns.append(('choice', [o.source for o in node.options]))
+            elif isinstance(node, FileRef) and node.ref.mode in (WildcardRef.PLAIN, WildcardRef.SEQUENTIAL):
+                lines = tree.get(node.ref.name)
+                if not lines or not self.wildcard_manager.is_literal_file(node.ref.name, lines):
+                    return None
+                if node.ref.mode == WildcardRef.SEQUENTIAL:
+                    if node.ref.name in sequential_names:
+                        return None
+                    sequential_names.add(node.ref.name)
+                table = self.wildcard_manager.get_alias_table(node.ref.name, lines)
+                columns.append(('file', node.ref, lines, table))
+            else:
+                return None
+        return columns
+
+    def _expand_batch_columns(self, columns: list, count: int, context: PromptContext,
+                              rng: np.random.Generator) -> List[ExpandedPrompt]:
+        """
+        열 단위 배치 확장: 와일드카드마다 count개의 인덱스를 NumPy로 한 번에 구하고,
+        선택된 라인의 조회/태그 배치(place_star_tags)는 고유 라인마다 한 번만 한 뒤 인덱싱으로 펼칩니다.
+        """
+        results = [ExpandedPrompt(tags=[]) for _ in range(count)]
+
+        for column in columns:
+            kind = column[0]
+            if kind == 'literal':
+                tag = column[1]
+                for result in results:
+                    result.tags.append(tag)
+                continue
+
+            if kind == 'choice':
+                options = _object_array(column[1])
+                for result, tag in zip(results, options[rng.integers(0, len(options), count)].tolist()):
+                    result.tags.append(tag)
+                continue
+
+            ref, lines, table = column[1], column[2], column[3]
+            name, total_lines = ref.name, len(lines)
+            if ref.mode == WildcardRef.SEQUENTIAL:
+                start = context.sequential_counters.get(name, 0)
+                indices = (start + np.arange(count)) % total_lines
+                context.sequential_counters[name] = start + count
+            elif table is not None:
+                indices = table.pick_many(rng.integers(0, total_lines, count), rng.random(count))
+            else:
+                indices = rng.integers(0, total_lines, count)
+
+            # 선택된 고유 라인만 조회/분리 (CompactLines도 필요한 라인만 디코딩)
+            unique, inverse = np.unique(indices, return_inverse=True)
+            picked = [lines[index] for index in unique.tolist()]
+            placed = _object_array([place_star_tags(line) for line in picked])[inverse].tolist()
+            picked = _object_array(picked)[inverse].tolist()
+
+            for result, line, (tags_in_place, tags_to_append) in zip(results, picked, placed):
+                result.tags.extend(tags_in_place)
+                if tags_to_append:
+                    result.global_append_tags.extend(tags_to_append)
+                result.wildcard_history.setdefault(name, []).append(line)
+            if ref.mode == WildcardRef.SEQUENTIAL:
+                # [상태 관찰] 순차 와일드카드 상태 기록
+                for result, position in zip(results, (indices + 1).tolist()):
+                    result.wildcard_state[name] = {'current': position, 'total': total_lines}
+
+        context.wildcard_state.update(results[-1].wildcard_state)
+        return results
+
+    def _expand_recursive(self, tag: str, context: PromptContext, depth=0) -> List[str]:
+        """하나의 태그를 확장합니다. 태그는 compile_wildcard()로 한 번만 파싱되어 캐시됩니다."""
+        return compile_wildcard(tag).expand(self, context, depth)
 
     def _get_wildcard_line(self, wildcard_name: str, context: PromptContext) -> str | None:
         """WildcardManager에서 와일드카드 내용을 가져옵니다. 순차/종속 모드를 처리합니다."""
-        is_sequential = wildcard_name.startswith('*')
-        is_observer = wildcard_name.startswith('$')
-
-        if is_sequential:
-            wildcard_name = wildcard_name[1:]
-        elif is_observer:
-            try:
-                master_name, slave_name = wildcard_name[1:].split(':', 1)
-                wildcard_name = slave_name
-            except ValueError:
-                print(f"경고: 잘못된 종속 와일드카드 구문입니다: {wildcard_name}")
-                return None
-        
+        return self.resolve_line(WildcardRef(wildcard_name), context)
+
+    def resolve_line(self, ref: WildcardRef, context: PromptContext) -> str | None:
+        """미리 해석된 와일드카드 참조로 라인을 선택합니다. 순차/종속 모드를 처리합니다."""
+        if ref.mode == WildcardRef.INVALID:
+            print(f"경고: 잘못된 종속 와일드카드 구문입니다: {ref.source}")
+            return None
+
+        wildcard_name = ref.name
         lines = self.wildcard_manager.wildcard_dict_tree.get(wildcard_name)
         if not lines:
             print(f"경고: 와일드카드 '{wildcard_name}'을 찾을 수 없습니다.")
@@ -105,14 +263,15 @@ class WildcardProcessor:
         chosen_line = ""
         total_lines = len(lines)
         
-        if is_sequential:
+        if ref.mode == WildcardRef.SEQUENTIAL:
             counter = context.sequential_counters.get(wildcard_name, 0)
             chosen_line = lines[counter % total_lines]
             context.sequential_counters[wildcard_name] = counter + 1
             # [상태 관찰] 순차 와일드카드 상태 기록
             context.wildcard_state[wildcard_name] = {'current': counter % total_lines + 1, 'total': total_lines}
 
-        elif is_observer:
+        elif ref.mode == WildcardRef.OBSERVER:
+            master_name = ref.master
             # 🔧 [수정] Master/Slave 의존성 로직 개선
             master_counter = context.sequential_counters.get(master_name, 0)
             
@@ -131,8 +290,8 @@ class WildcardProcessor:
             # [상태 관찰] 종속 와일드카드 상태 기록
             context.wildcard_state[wildcard_name] = {'current': slave_index + 1, 'total': total_lines, 'master_cycles': completed_master_cycles}
             
-        else: # 일반 무작위 모드
-            chosen_line = random.choice(lines)
+        else: # 일반 무작위 모드 (가중치 라인 지원)
+            chosen_line = self.pick_line(wildcard_name, lines, context)
         
         context.wildcard_history.setdefault(wildcard_name, []).append(chosen_line)
         return chosen_line
\ No newline at end of file
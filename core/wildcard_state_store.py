@@ -0,0 +1,104 @@
+# core/wildcard_state_store.py
+
+import os
+import json
+import time
+from typing import Any, Dict
+
+class WildcardStateStore:
+    """
+    순차/종속 와일드카드 카운터(sequential_counters)와 상태(wildcard_state)를
+    save/wildcard_state.jsonl 에 보존하여 앱을 다시 시작해도 이어서 진행되도록 합니다.
+
+    - 생성할 때마다 바뀐 항목만 한 줄(JSON)로 덧붙이므로 쓰기 비용이 작고,
+      저장 도중 종료되어도 마지막 줄만 버려집니다.
+    - 덧붙인 줄이 COMPACT_THRESHOLD개를 넘으면 현재 전체 상태 한 줄로 파일을 다시 씁니다. (압축)
+    """
+    STATE_PATH = os.path.join('save', 'wildcard_state.jsonl')
+    COMPACT_THRESHOLD = 500
+
+    def __init__(self, path: str = STATE_PATH):
+        self.path = path
+        self.counters: Dict[str, int] = {}
+        self.state: Dict[str, Dict[str, Any]] = {}
+        self._appended = 0
+        self.load()
+
+    def load(self):
+        """파일의 기록을 순서대로 적용하여 마지막 상태를 복원합니다."""
+        self.counters, self.state = {}, {}
+        self._appended = 0
+        has_broken_line = False
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        print(f"⚠️ 손상된 와일드카드 상태 기록을 건너뜁니다: {line[:50]}")
+                        has_broken_line = True
+                        continue
+                    if record.get('snapshot'):
+                        self.counters, self.state = {}, {}
+                    self.counters.update(record.get('counters', {}))
+                    self.state.update(record.get('state', {}))
+                    self._appended += 1
+        except OSError as e:
+            print(f"⚠️ 와일드카드 상태 파일 읽기 실패: {e}")
+            return
+
+        if self.counters:
+            print(f"✅ 순차 와일드카드 카운터 복원: {len(self.counters)}개")
+        # 저장 중 끊긴 줄 뒤에 이어 쓰지 않도록 손상된 파일은 바로 다시 씀
+        if has_broken_line or self._appended > self.COMPACT_THRESHOLD:
+            self.compact()
+
+    def restore_into(self, context):
+        """저장된 카운터/상태를 PromptContext에 복사합니다. (앱 시작 후 첫 컨텍스트용)"""
+        context.sequential_counters = dict(self.counters)
+        context.wildcard_state = {name: dict(state) for name, state in self.state.items()}
+
+    def record(self, counters: Dict[str, int], state: Dict[str, Dict[str, Any]]):
+        """마지막으로 저장한 내용과 달라진 항목만 덧붙입니다."""
+        changed_counters = {name: value for name, value in counters.items() if self.counters.get(name) != value}
+        changed_state = {name: dict(value) for name, value in state.items() if self.state.get(name) != value}
+        if not (changed_counters or changed_state):
+            return
+
+        self.counters.update(changed_counters)
+        self.state.update(changed_state)
+        record = {'time': round(time.time(), 3), 'counters': changed_counters, 'state': changed_state}
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self._appended += 1
+        except OSError as e:
+            print(f"⚠️ 와일드카드 상태 저장 실패: {e}")
+            return
+
+        if self._appended > self.COMPACT_THRESHOLD:
+            self.compact()
+
+    def compact(self):
+        """현재 전체 상태 한 줄로 파일을 다시 씁니다. 임시 파일에 쓴 뒤 교체하므로 중간에 끊겨도 안전합니다."""
+        record = {'snapshot': True, 'time': round(time.time(), 3), 'counters': self.counters, 'state': self.state}
+        temp_path = self.path + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            os.replace(temp_path, self.path)
+            self._appended = 1
+        except OSError as e:
+            print(f"⚠️ 와일드카드 상태 파일 압축 실패: {e}")
+
+    def reset(self):
+        """모든 카운터/상태를 지웁니다. (순차 리셋)"""
+        self.counters, self.state = {}, {}
+        self.compact()
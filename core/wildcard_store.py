@@ -0,0 +1,64 @@
+# core/wildcard_store.py
+
+import mmap
+from array import array
+from collections.abc import Sequence
+from typing import List, Optional
+
+class CompactLines(Sequence):
+    """
+    와일드카드 파일 하나의 라인들을 하나의 연속된 UTF-8 버퍼와 오프셋 배열로 보관하는 읽기 전용 시퀀스.
+    - 라인마다 str 객체를 만들지 않으므로 큰 와일드카드 모음에서 메모리 사용량이 크게 줄어듭니다.
+    - lines[i] 로 접근할 때 해당 라인만 디코딩합니다. (len / 인덱싱 / 순회는 list와 동일하게 동작)
+    - mmap_path를 주면 버퍼를 파일로 기록한 뒤 메모리 매핑하여 OS 페이지 캐시에 맡깁니다.
+    """
+    __slots__ = ('_buffer', '_offsets', 'path')
+
+    def __init__(self, buffer, offsets: array, path: Optional[str] = None):
+        self._buffer = buffer    # bytes 또는 mmap.mmap
+        self._offsets = offsets  # 라인 i는 buffer[offsets[i]:offsets[i + 1]]
+        self.path = path         # 매핑한 파일 경로 (bytes 버퍼면 None)
+
+    @classmethod
+    def from_lines(cls, lines: List[str], mmap_path: Optional[str] = None) -> 'CompactLines':
+        encoded = [line.encode('utf-8') for line in lines]
+        offsets = array('q', [0])
+        position = 0
+        for data in encoded:
+            position += len(data)
+            offsets.append(position)
+        buffer = b''.join(encoded)
+
+        # 빈 파일은 매핑할 수 없으므로 bytes로 유지
+        if mmap_path and buffer:
+            with open(mmap_path, 'wb') as f:
+                f.write(buffer)
+            with open(mmap_path, 'rb') as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return cls(buffer, offsets, mmap_path)
+        return cls(buffer, offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("CompactLines index out of range")
+        return self._buffer[self._offsets[index]:self._offsets[index + 1]].decode('utf-8')
+
+    def __iter__(self):
+        offsets, buffer = self._offsets, self._buffer
+        for i in range(len(offsets) - 1):
+            yield buffer[offsets[i]:offsets[i + 1]].decode('utf-8')
+
+    def __repr__(self) -> str:
+        return f"CompactLines({len(self)} lines, {self.nbytes} bytes)"
+
+    @property
+    def nbytes(self) -> int:
+        """버퍼와 오프셋 배열이 차지하는 바이트 수"""
+        return len(self._buffer) + self._offsets.itemsize * len(self._offsets)
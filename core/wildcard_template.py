@@ -0,0 +1,185 @@
+# core/wildcard_template.py
+
+import re
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .prompt_context import PromptContext
+    from .wildcard_processor import WildcardProcessor
+
+# 와일드카드 문법을 미리 파싱해 둔 트리(AST) 노드들.
+# 태그 문자열/와일드카드 라인은 compile_wildcard()로 한 번만 파싱되어 캐시되고,
+# 확장 시에는 노드의 expand()를 따라 내려가기만 합니다.
+# 노드는 불변이며, 순차 카운터 등 실행 상태는 모두 PromptContext에 기록됩니다.
+
+_COMPOSITE_PATTERN = re.compile(r'(__.*?__)')
+MAX_DEPTH = 10
+
+class WildcardRef:
+    """와일드카드 파일 참조. 이름 앞의 '*'(순차) / '$master:slave'(종속) 표기를 미리 해석합니다."""
+    __slots__ = ('source', 'mode', 'name', 'master')
+
+    PLAIN = 'plain'
+    SEQUENTIAL = 'sequential'
+    OBSERVER = 'observer'
+    INVALID = 'invalid'
+
+    def __init__(self, source: str):
+        self.source = source
+        self.master = None
+        if source.startswith('*'):
+            self.mode, self.name = self.SEQUENTIAL, source[1:]
+        elif source.startswith('$'):
+            try:
+                self.master, self.name = source[1:].split(':', 1)
+                self.mode = self.OBSERVER
+            except ValueError:
+                self.mode, self.name = self.INVALID, source
+        else:
+            self.mode, self.name = self.PLAIN, source
+
+class Node(ABC):
+    """AST 노드 기본 클래스. source는 깊이 제한에 걸렸을 때 그대로 돌려줄 원본 문자열입니다."""
+    __slots__ = ('source',)
+
+    def __init__(self, source: str):
+        self.source = source
+
+    @abstractmethod
+    def expand(self, processor: 'WildcardProcessor', context: 'PromptContext', depth: int) -> List[str]:
+        """노드를 확장한 태그 목록"""
+
+class Literal(Node):
+    """와일드카드가 없는 일반 태그"""
+    __slots__ = ()
+
+    def expand(self, processor, context, depth):
+        return [self.source]
+
+class InlineChoice(Node):
+    """<a|b|c> 인라인 선택. 선택지도 각각 컴파일된 노드입니다."""
+    __slots__ = ('options',)
+
+    def __init__(self, source: str, options: Tuple[Node, ...]):
+        super().__init__(source)
+        self.options = options
+
+    def expand(self, processor, context, depth):
+        if depth > MAX_DEPTH:
+            return [self.source]
+        return self.options[processor.pick_index(len(self.options), context)].expand(processor, context, depth + 1)
+
+class FileRef(Node):
+    """
+    <name> 파일 와일드카드. 선택된 라인을 콤마로 나눠
+    '*'로 시작하는 태그는 제자리에 유지하고 나머지는 global_append_tags로 보냅니다.
+    (*태그가 없으면 첫 태그만 제자리에 둡니다)
+    """
+    __slots__ = ('ref',)
+
+    def __init__(self, source: str, ref: WildcardRef):
+        super().__init__(source)
+        self.ref = ref
+
+    def expand(self, processor, context, depth):
+        if depth > MAX_DEPTH:
+            return [self.source]
+        line = processor.resolve_line(self.ref, context)
+        if line is None:
+            return [self.source]
+
+        resolved_tags = compile_wildcard(line).expand(processor, context, depth + 1)
+
+        final_tags_in_place = []
+        for resolved_tag in resolved_tags:
+            tags_in_place, tags_to_append = place_star_tags(resolved_tag)
+            final_tags_in_place.extend(tags_in_place)
+            context.global_append_tags.extend(tags_to_append)
+        return final_tags_in_place
+
+class InlineRef:
+    """__name__ 복합 와일드카드 조각 (Sequence의 일부). 선택된 라인의 태그를 현재 위치에 콤마로 이어 붙입니다."""
+    __slots__ = ('source', 'ref')
+
+    def __init__(self, source: str, ref: WildcardRef):
+        self.source = source
+        self.ref = ref
+
+    def render(self, processor, context, depth) -> str:
+        line = processor.resolve_line(self.ref, context)
+        if line is None:
+            return self.source  # 확장 실패시 원본 유지
+        all_tags = []
+        for expanded_part in compile_wildcard(line).expand(processor, context, depth + 1):
+            all_tags.extend(split_commas(expanded_part))
+        return ', '.join(all_tags)
+
+class Sequence(Node):
+    """일반 텍스트와 __name__ 조각이 섞인 태그. 조각들을 이어 붙인 하나의 태그가 됩니다."""
+    __slots__ = ('parts',)
+
+    def __init__(self, source: str, parts: Tuple[object, ...]):
+        super().__init__(source)
+        self.parts = parts  # str(일반 텍스트) 또는 InlineRef
+
+    def expand(self, processor, context, depth):
+        if depth > MAX_DEPTH:
+            return [self.source]
+        return [''.join(
+            part if isinstance(part, str) else part.render(processor, context, depth)
+            for part in self.parts
+        )]
+
+def is_literal(tag: str) -> bool:
+    """compile_wildcard(tag)가 Literal이 되는지 (파싱/캐시 없이 판단, 파일 로드 시 전체 라인 검사용)"""
+    return not (tag.startswith('<') and tag.endswith('>')) and '__' not in tag
+
+@lru_cache(maxsize=65536)
+def compile_wildcard(tag: str) -> Node:
+    """태그 문자열(또는 와일드카드 라인)을 AST로 컴파일합니다. 결과는 문자열 단위로 캐시됩니다."""
+    if tag.startswith('<') and tag.endswith('>'):
+        wildcard_name = tag[1:-1]
+        if '|' in wildcard_name:
+            options = tuple(compile_wildcard(option.strip()) for option in wildcard_name.split('|'))
+            return InlineChoice(tag, options)
+        return FileRef(tag, WildcardRef(wildcard_name))
+
+    if '__' in tag:
+        parts = []
+        for part in _COMPOSITE_PATTERN.split(tag):
+            if not part:
+                continue
+            if part.startswith('__') and part.endswith('__'):
+                parts.append(InlineRef(part, WildcardRef(part[2:-2])))
+            else:
+                parts.append(part)
+        return Sequence(tag, tuple(parts))
+
+    return Literal(tag)
+
+@lru_cache(maxsize=65536)
+def split_star_tags(text: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """'*a, b, *c' -> (('a', 'c'), ('b',)) : 제자리 유지 태그와 뒤로 보낼 태그로 분리"""
+    sub_tags = split_commas(text)
+    tags_to_keep = tuple(t[1:] for t in sub_tags if t.startswith('*'))
+    tags_to_append = tuple(t for t in sub_tags if not t.startswith('*'))
+    return tags_to_keep, tags_to_append
+
+@lru_cache(maxsize=65536)
+def place_star_tags(text: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    <name>으로 선택된 태그 묶음의 배치 결과: (제자리에 둘 태그, global_append_tags로 보낼 태그)
+    *태그가 있으면 *태그만 제자리에, 없으면 첫 태그만 제자리에 둡니다.
+    """
+    tags_to_keep, tags_to_append = split_star_tags(text)
+    if tags_to_keep:
+        return tags_to_keep, tags_to_append
+    if tags_to_append:
+        return tags_to_append[:1], tags_to_append[1:]
+    return (), ()
+
+@lru_cache(maxsize=65536)
+def split_commas(text: str) -> Tuple[str, ...]:
+    return tuple(t.strip() for t in text.split(','))
@@ -0,0 +1,108 @@
+# core/wildcard_watcher.py
+
+import os
+from PyQt6.QtCore import QObject, QThread, QTimer, QFileSystemWatcher, pyqtSignal
+from PyQt6.QtWidgets import QApplication
+
+from core.wildcard_manager import WildcardManager
+
+class WildcardReloadWorker(QObject):
+    """작업 스레드에서 와일드카드 폴더를 스캔하고 바뀐 파일만 읽는 워커"""
+    scan_finished = pyqtSignal(object)  # WildcardScan
+
+    def __init__(self, wildcard_manager: WildcardManager):
+        super().__init__()
+        self.wildcard_manager = wildcard_manager
+
+    def run_scan(self):
+        try:
+            scan = self.wildcard_manager.collect_changes()
+        except Exception as e:
+            print(f"❌ 와일드카드 변경 검사 중 오류: {e}")
+            scan = None
+        self.scan_finished.emit(scan)
+
+class WildcardWatcher(QObject):
+    """
+    wildcards/ 폴더를 QFileSystemWatcher로 감시하여 변경 시 증분 리로드를 수행합니다.
+    - 스캔/파일 읽기는 작업 스레드에서, 결과 반영(apply_changes)과 콜백은 GUI 스레드에서 실행
+    - 저장 직후 연속으로 발생하는 이벤트는 DEBOUNCE_MS 동안 모아서 한 번만 스캔
+    """
+    DEBOUNCE_MS = 300
+    # 폴더는 항상 감시하고, 파일 감시는 OS 감시 한도를 고려하여 이 개수까지만 등록
+    # (초과 시 파일 추가/삭제/이름 변경은 폴더 이벤트로, 내용 수정은 리로드 버튼으로 반영)
+    MAX_WATCHED_FILES = 2000
+
+    scan_requested = pyqtSignal()
+
+    def __init__(self, wildcard_manager: WildcardManager, parent: QObject = None):
+        super().__init__(parent)
+        self.wildcard_manager = wildcard_manager
+        self._scan_in_progress = False
+        self._rescan_pending = False
+
+        self.fs_watcher = QFileSystemWatcher(self)
+        self.fs_watcher.directoryChanged.connect(self._on_path_changed)
+        self.fs_watcher.fileChanged.connect(self._on_path_changed)
+
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(self.DEBOUNCE_MS)
+        self.debounce_timer.timeout.connect(self.request_reload)
+
+        self.reload_thread = QThread()
+        self.reload_worker = WildcardReloadWorker(wildcard_manager)
+        self.reload_worker.moveToThread(self.reload_thread)
+        self.scan_requested.connect(self.reload_worker.run_scan)
+        self.reload_worker.scan_finished.connect(self._on_scan_finished)
+        self.reload_thread.finished.connect(self.reload_worker.deleteLater)
+        self.reload_thread.start()
+
+        app = QApplication.instance()
+        if app:
+            app.aboutToQuit.connect(self.shutdown)
+
+        self._sync_watched_paths()
+
+    def request_reload(self):
+        """증분 리로드를 요청합니다. 스캔 중이면 끝난 뒤 한 번 더 실행합니다."""
+        if self._scan_in_progress:
+            self._rescan_pending = True
+            return
+        self._scan_in_progress = True
+        self.scan_requested.emit()
+
+    def _on_path_changed(self, path: str):
+        self.debounce_timer.start()
+
+    def _on_scan_finished(self, scan):
+        self._scan_in_progress = False
+        if scan is not None:
+            self.wildcard_manager.apply_changes(scan)
+            self._sync_watched_paths()
+
+        if self._rescan_pending:
+            self._rescan_pending = False
+            self.request_reload()
+
+    def _sync_watched_paths(self):
+        """현재 색인 기준으로 감시 대상 폴더/파일 목록을 맞춥니다."""
+        # Qt는 경로 구분자를 '/'로 돌려주므로 양쪽 모두 정규화하여 비교
+        wanted = {os.path.normpath(path) for path in self.wildcard_manager.directories}
+        file_paths = sorted(self.wildcard_manager.get_file_paths())
+        wanted.update(os.path.normpath(path) for path in file_paths[:self.MAX_WATCHED_FILES])
+
+        watched = {os.path.normpath(path) for path in self.fs_watcher.directories() + self.fs_watcher.files()}
+        stale = list(watched - wanted)
+        if stale:
+            self.fs_watcher.removePaths(stale)
+        new_paths = [path for path in wanted - watched if os.path.exists(path)]
+        if new_paths:
+            self.fs_watcher.addPaths(new_paths)
+
+    def shutdown(self):
+        """앱 종료 시 리로드 워커 스레드 정리"""
+        self.debounce_timer.stop()
+        if self.reload_thread.isRunning():
+            self.reload_thread.quit()
+            self.reload_thread.wait(1000)
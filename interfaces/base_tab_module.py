@@ -44,6 +44,13 @@ class BaseTabModule(QObject, ABC, metaclass=pyqtABCMeta):
         """탭의 유형을 반환합니다 ('core', 'closable', 'permanent')"""
         return 'core'  # 기본값: 핵심 탭 (시작 시 로드, 닫을 수 없음)
 
+    def should_defer_widget(self) -> bool:
+        """
+        True를 반환하면 시작 시에는 빈 자리표시 위젯만 추가하고,
+        탭이 처음 활성화될 때 create_widget()을 호출합니다. (무거운 탭의 지연 로드용)
+        """
+        return False
+
     def can_close_tab(self) -> bool:
         """탭이 닫힐 수 있는지 여부를 반환합니다."""
         return self.get_tab_type() in ['closable']
@@ -1,15 +1,41 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTextEdit, 
-    QCheckBox, QPushButton, QFrame, QScrollArea
+    QCheckBox, QPushButton, QFrame, QScrollArea, QFileDialog, QMessageBox
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QObject, QThread, pyqtSignal
 from interfaces.base_module import BaseMiddleModule
 from interfaces.mode_aware_module import ModeAwareModule
 from core.prompt_context import PromptContext
+from core.conditional_rules import ConditionalRuleEngine
+from core.conditional_rules_bulk import apply_rules_bulk, format_bulk_report
 from ui.theme import get_dynamic_styles
 from ui.scaling_manager import get_scaled_font_size
 from typing import Dict, Any, List
-import re
+
+class BulkRuleWorker(QObject):
+    """검색 결과 전체에 규칙을 일괄 적용하는 백그라운드 워커"""
+    progress_updated = pyqtSignal(int, int)
+    bulk_finished = pyqtSignal(object)
+    error_occurred = pyqtSignal(str)
+
+    def __init__(self, rule_engine: ConditionalRuleEngine, rules_text: str, df, prefix_tags: List[str], output_path: str = None):
+        super().__init__()
+        self.rule_engine = rule_engine
+        self.rules_text = rules_text
+        self.df = df
+        self.prefix_tags = prefix_tags
+        self.output_path = output_path
+
+    def run(self):
+        try:
+            report = apply_rules_bulk(
+                self.rule_engine, self.rules_text, self.df, self.prefix_tags,
+                output_path=self.output_path, progress_callback=self.progress_updated.emit
+            )
+            self.bulk_finished.emit(report)
+        except Exception as e:
+            self.error_occurred.emit(f"전체 결과 적용 중 오류 발생: {e}")
+
 
 class PromptListModifierModule(BaseMiddleModule, ModeAwareModule):
     """
@@ -33,7 +59,13 @@ class PromptListModifierModule(BaseMiddleModule, ModeAwareModule):
         self.enable_checkbox = None
         self.rules_textedit = None
         self.log_textedit = None
+        self.bulk_button = None
         self.widget = None
+        self.bulk_thread = None
+        self.bulk_worker = None
+
+        # 규칙 파싱/평가 엔진 (Qt 비의존, 헤드리스 파이프라인과 공유)
+        self.rule_engine = ConditionalRuleEngine()
 
     def get_title(self) -> str:
         return "🔀 조건부 프롬프트"
@@ -186,6 +218,12 @@ class PromptListModifierModule(BaseMiddleModule, ModeAwareModule):
         test_button.clicked.connect(self.test_rules)
         layout.addWidget(test_button)
 
+        # 일괄 적용 버튼 (검색 결과 전체에 규칙을 적용해 규칙별 적중 수 집계)
+        self.bulk_button = QPushButton("전체 결과에 적용")
+        self.bulk_button.setStyleSheet(test_button.styleSheet())
+        self.bulk_button.clicked.connect(self.apply_rules_to_all_results)
+        layout.addWidget(self.bulk_button)
+
         # 위젯 참조 저장
         self.widget = widget
         
@@ -278,412 +316,18 @@ class PromptListModifierModule(BaseMiddleModule, ModeAwareModule):
         
         return modified_context
 
-    def _apply_rules(self, context: PromptContext, rules_text: str, logs: List[str]) -> PromptContext:
-        """규칙을 적용하여 프롬프트 리스트를 수정"""
-        # 규칙 파싱
-        rules = self._parse_rules(rules_text)
-        
-        # 현재 태그 리스트 복사
-        prefix_tags = context.prefix_tags.copy()
-        main_tags = context.main_tags.copy()
-        postfix_tags = context.postfix_tags.copy()
-        
-        # 규칙 실행 결과만 먼저 수집
-        rule_results = []
-        
-        # 각 규칙 적용
-        for rule in rules:
-            try:
-                condition = rule['condition']
-                action = rule['action']
-                
-                # 조건 확인
-                condition_met = self._check_condition(condition, prefix_tags, main_tags, postfix_tags)
-                
-                if condition_met:
-                    # 액션 실행
-                    prefix_tags, main_tags, postfix_tags = self._execute_action(
-                        action, prefix_tags, main_tags, postfix_tags
-                    )
-                    rule_results.append({
-                        'rule': rule['original'],
-                        'met': True,
-                        'description': action['description']
-                    })
-                else:
-                    rule_results.append({
-                        'rule': rule['original'],
-                        'met': False,
-                        'description': None
-                    })
-                    
-            except Exception as e:
-                rule_results.append({
-                    'rule': rule['original'],
-                    'met': False,
-                    'description': f"Error: {str(e)}"
-                })
-        
-        # 최상단에 규칙 실행 결과 추가
-        # logs.append("=== 규칙 실행 결과 ===")
-        for result in rule_results:
-            if result['met']:
-                logs.append(f"[Rule: {result['rule']}] -> Condition Met -> {result['description']}")
-            else:
-                error_msg = result['description'] if result['description'] and "Error:" in result['description'] else "Condition Not Met."
-                logs.append(f"[Rule: {result['rule']}] -> {error_msg}")
-        logs.append("")
-
-        # 수정된 태그 리스트를 컨텍스트에 적용
-        context.prefix_tags = prefix_tags
-        context.main_tags = main_tags
-        context.postfix_tags = postfix_tags
-        
-        return context
-
-    def _parse_tag_list(self, tag_text: str) -> List[str]:
-        """태그 문자열을 리스트로 파싱 (^ 구분자 또는 쉼표 구분자 지원) - 따옴표 완전 제거"""
-        tag_text = tag_text.strip()
-        
-        # 전체 문자열 양끝 따옴표 제거
-        if (tag_text.startswith('"') and tag_text.endswith('"')) or \
-        (tag_text.startswith("'") and tag_text.endswith("'")):
-            tag_text = tag_text[1:-1]
-        
-        if '^' in tag_text:
-            # ^ 구분자 사용
-            tags = [tag.strip() for tag in tag_text.split('^') if tag.strip()]
-        elif ',' in tag_text:
-            # 쉼표 구분자 사용
-            tags = [tag.strip() for tag in tag_text.split(',') if tag.strip()]
-        else:
-            # 단일 태그
-            tags = [tag_text] if tag_text else []
-        
-        # 각 개별 태그에서도 따옴표 제거
-        cleaned_tags = []
-        for tag in tags:
-            tag = tag.strip()
-            # 개별 태그의 양끝 따옴표 제거
-            if (tag.startswith('"') and tag.endswith('"')) or \
-            (tag.startswith("'") and tag.endswith("'")):
-                tag = tag[1:-1]
-            cleaned_tags.append(tag)
-        
-        return cleaned_tags
-
-    def _parse_rules(self, rules_text: str) -> List[Dict]:
-        """규칙 텍스트를 파싱하여 구조화된 규칙 리스트 생성 - 따옴표 인식 개선"""
-        rules = []
-        
-        # 따옴표를 고려한 쉼표 분할
-        rule_parts = self._split_rules_with_quotes(rules_text)
-        
-        for rule_part in rule_parts:
-            try:
-                # (조건):실행문 형식으로 분리
-                match = re.match(r"\((.*?)\)\:(.*)", rule_part)
-                if not match:
-                    continue
-                    
-                condition_part, action_part = match.groups()
-                condition_part = condition_part.strip()
-                action_part = action_part.strip().strip('"')
-                
-                # 조건 파싱
-                condition = self._parse_condition(condition_part)
-                
-                # 액션 파싱
-                action = self._parse_action(action_part)
-                
-                rules.append({
-                    'condition': condition,
-                    'action': action,
-                    'original': rule_part
-                })
-                
-            except Exception as e:
-                print(f"규칙 파싱 오류: {rule_part} -> {e}")
-        
-        return rules
-    
-    def _split_rules_with_quotes(self, rules_text: str) -> List[str]:
-        """따옴표 내부의 쉼표는 무시하고 규칙을 분할 - 따옴표 없는 케이스도 지원, # 주석 처리"""
-        rules = []
-        current_rule = ""
-        in_quotes = False
-        quote_char = None
-        paren_count = 0
-        
-        i = 0
-        while i < len(rules_text):
-            char = rules_text[i]
-            
-            # 괄호 카운팅 (조건부 영역 추적)
-            if char == '(':
-                paren_count += 1
-            elif char == ')':
-                paren_count -= 1
-            
-            # 따옴표 처리
-            if char in ['"', "'"] and (i == 0 or rules_text[i-1] != '\\'):
-                if not in_quotes:
-                    in_quotes = True
-                    quote_char = char
-                elif char == quote_char:
-                    in_quotes = False
-                    quote_char = None
-            
-            # 쉼표 분할 조건
-            if char == ',' and not in_quotes and paren_count == 0:
-                # 따옴표 밖이고 조건부 괄호 밖의 쉼표를 발견하면 규칙 분할
-                if current_rule.strip():
-                    # # 주석 처리 - #로 시작하는 규칙은 무시
-                    rule_text = current_rule.strip()
-                    if not rule_text.startswith('#'):
-                        rules.append(rule_text)
-                current_rule = ""
-            else:
-                current_rule += char
-            
-            i += 1
-        
-        # 마지막 규칙 추가
-        if current_rule.strip():
-            rule_text = current_rule.strip()
-            if not rule_text.startswith('#'):
-                rules.append(rule_text)
-        
-        return rules
-
-    def _parse_condition(self, condition_text: str) -> Dict:
-        """조건 텍스트를 파싱 - 논리 연산자 지원"""
-        condition_text = condition_text.strip()
-        
-        return {
-            'type': 'logical',
-            'expression': condition_text
-        }
-
-    def _parse_action(self, action_text: str) -> Dict:
-        """액션 텍스트를 파싱 - 복수 태그 및 따옴표 선택사항 지원"""
-        action_text = action_text.strip()
-        
-        # 외부 따옴표 제거 (있는 경우) - 더 정확한 방식
-        action_text = self._remove_outer_quotes(action_text)
-        
-        if '+=' in action_text:
-            # 삽입/추가 액션 처리
-            parts = action_text.split('+=', 1)
-            if len(parts) == 2:
-                left_part = parts[0].strip()
-                right_part = parts[1].strip()
-                
-                # right_part를 태그 리스트로 변환
-                tag_list = self._parse_tag_list(right_part)
-                
-                # target_list+= 형태인지 확인
-                if left_part in ['prefix', 'main', 'postfix']:
-                    return {
-                        'type': 'append_to_list',
-                        'target_list': left_part,
-                        'tag_list': tag_list,
-                        'description': f'{tag_list} appended to {left_part}_tags.'
-                    }
-                else:
-                    # existing_tag+= 형태
-                    return {
-                        'type': 'insert',
-                        'existing_tag': left_part,
-                        'tag_list': tag_list,
-                        'description': f'{tag_list} inserted after "{left_part}".'
-                    }
-                    
-        elif '+:' in action_text:
-            # 추가 액션
-            if action_text.startswith(('prefix+:', 'main+:', 'postfix+:')):
-                target_list, tag_part = action_text.split('+:', 1)
-                target_list = target_list.strip()
-            else:
-                target_list = 'main'
-                tag_part = action_text.replace('+:', '', 1)
-            
-            tag_list = self._parse_tag_list(tag_part.strip())
-            
-            return {
-                'type': 'append',
-                'target_list': target_list,
-                'tag_list': tag_list,
-                'description': f'{tag_list} appended to {target_list}_tags.'
-            }
-            
-        elif '=' in action_text:
-            # 대체 액션
-            parts = action_text.split('=', 1)
-            if len(parts) == 2:
-                old_tag = parts[0].strip()
-                new_tag_part = parts[1].strip()
-                
-                # new_tag_part를 태그 리스트로 변환
-                new_tag_list = self._parse_tag_list(new_tag_part)
-                
-                return {
-                    'type': 'replace',
-                    'old_tag': old_tag,
-                    'new_tag_list': new_tag_list,
-                    'description': f'"{old_tag}" replaced with {new_tag_list}.'
-                }
-        
-        raise ValueError(f"Unknown action format: {action_text}")
-    
-    def _remove_outer_quotes(self, text: str) -> str:
-        """외부 따옴표만 제거하는 헬퍼 메서드"""
-        text = text.strip()
-        if len(text) >= 2:
-            if (text.startswith('"') and text.endswith('"')) or \
-               (text.startswith("'") and text.endswith("'")):
-                return text[1:-1]
-        return text
-
-    def _check_condition(self, condition: Dict, prefix_tags: List[str], main_tags: List[str], postfix_tags: List[str]) -> bool:
-        """조건 확인 - 논리 연산자 지원"""
-        if condition['type'] != 'logical':
-            return False
-            
-        all_tags = prefix_tags + main_tags + postfix_tags
-        expression = condition['expression']
-        
-        return self._evaluate_logical_expression(expression, all_tags)
-    
-    def _evaluate_logical_expression(self, expression: str, all_tags: List[str]) -> bool:
-        """논리 표현식 평가"""
-        if not expression:
-            return True
-        
-        # AND 연산자로 분할 (상위 레벨)
-        and_parts = re.split(r'\s*&\s*', expression)
-        and_results = []
-        
-        for and_part in and_parts:
-            # OR 연산자로 분할 (하위 레벨)
-            or_parts = re.split(r'\s*\|\s*', and_part)
-            or_results = []
-            
-            for or_part in or_parts:
-                or_part = or_part.strip()
-                result = self._evaluate_single_condition(or_part, all_tags)
-                or_results.append(result)
-            
-            # OR 조건 평가 (하나라도 True면 True)
-            and_results.append(any(or_results))
-        
-        # AND 조건 평가 (모두 True여야 True)
-        return all(and_results)
-    
-    def _evaluate_single_condition(self, condition: str, all_tags: List[str]) -> bool:
-        """단일 조건 평가"""
-        condition = condition.strip()
-        
-        # 등급 조건 처리
-        if condition in ['e', 'q', 's', 'g']:
-            return self._check_rating_condition(condition, exact_match=True)
-        elif condition in ['~e', '~q', '~s', '~g']:
-            rating_char = condition[1:]  # ~ 제거
-            return self._check_rating_condition(rating_char, exact_match=False)
-        
-        # 기존 태그 조건 처리
-        if condition.startswith('~!'):
-            # 정확 불일치 조건 (~!tag)
-            tag = condition[2:]
-            return tag not in all_tags
-        elif condition.startswith('~'):
-            # 불포함 조건 (~tag)
-            tag = condition[1:]
-            return not any(tag in element for element in all_tags)
-        elif condition.startswith('*'):
-            # 정확 일치 조건 (*tag)
-            tag = condition[1:]
-            return tag in all_tags
-        else:
-            # 포함 조건 (tag)
-            return any(condition in element for element in all_tags)
-    
-    def _check_rating_condition(self, rating_char: str, exact_match: bool) -> bool:
-        """등급 조건을 확인"""
+    def _current_source_row(self):
+        """등급 조건 판단에 사용할 현재 source_row"""
         if not hasattr(self, 'app_context') or not self.app_context:
-            return False
-            
-        current_source_row = self.app_context.current_source_row
-        if current_source_row is None:
-            return False
-            
-        # source_row에서 rating 값 추출
-        row_rating = current_source_row.get('rating', None)
-        if row_rating is None:
-            return False
-            
-        # 등급 비교
-        if exact_match:
-            return row_rating == rating_char
-        else:
-            return row_rating != rating_char
-
-    def _execute_action(self, action: Dict, prefix_tags: List[str], main_tags: List[str], postfix_tags: List[str]) -> tuple:
-        """액션 실행 - 태그 리스트 처리 지원"""
-        if action['type'] == 'append':
-            # 기존 추가 액션
-            target_list = action['target_list']
-            tag_list = action.get('tag_list', [action.get('tag', '')])
-            
-            if target_list == 'prefix':
-                prefix_tags.extend(tag_list)
-            elif target_list == 'postfix':
-                postfix_tags.extend(tag_list)
-            else:  # main (기본값)
-                main_tags.extend(tag_list)
-                
-        elif action['type'] == 'append_to_list':
-            # 리스트별 추가 액션 (prefix+=, main+=, postfix+=)
-            target_list = action['target_list']
-            tag_list = action.get('tag_list', [])
-            
-            if target_list == 'prefix':
-                prefix_tags.extend(tag_list)
-            elif target_list == 'postfix':
-                postfix_tags.extend(tag_list)
-            else:  # main
-                main_tags.extend(tag_list)
-                
-        elif action['type'] == 'insert':
-            # 삽입 액션 (기존 태그 검색)
-            existing_tag = action['existing_tag']
-            tag_list = action.get('tag_list', [action.get('new_tag', '')])
-            
-            # prefix -> main -> postfix 순서로 검색
-            for tag_list_ref in [prefix_tags, main_tags, postfix_tags]:
-                for i, tag in enumerate(tag_list_ref):
-                    if existing_tag in tag:
-                        # 리스트의 태그들을 역순으로 삽입 (순서 유지)
-                        for j, new_tag in enumerate(reversed(tag_list)):
-                            tag_list_ref.insert(i + 1, new_tag)
-                        return prefix_tags, main_tags, postfix_tags
-                        
-        elif action['type'] == 'replace':
-            # 대체 액션
-            old_tag = action['old_tag']
-            new_tag_list = action.get('new_tag_list', [action.get('new_tag', '')])
-            
-            # prefix -> main -> postfix 순서로 검색하여 첫 번째 일치 항목 대체
-            for tag_list_ref in [prefix_tags, main_tags, postfix_tags]:
-                for i, tag in enumerate(tag_list_ref):
-                    if old_tag == tag:
-                        # 기존 태그를 제거하고 새 태그들을 그 자리에 삽입
-                        tag_list_ref.pop(i)
-                        for j, new_tag in enumerate(reversed(new_tag_list)):
-                            tag_list_ref.insert(i, new_tag)
-                        return prefix_tags, main_tags, postfix_tags
-        
-        return prefix_tags, main_tags, postfix_tags
+            return None
+        return self.app_context.current_source_row
+
+    def _apply_rules(self, context: PromptContext, rules_text: str, logs: List[str]) -> PromptContext:
+        """
+        규칙을 적용하여 프롬프트 리스트를 수정
+        (파싱/평가는 core.conditional_rules.ConditionalRuleEngine이 담당하며, 규칙 텍스트가 바뀔 때만 다시 컴파일됩니다)
+        """
+        return self.rule_engine.apply_rules(context, rules_text, logs, self._current_source_row())
 
     def _update_log_display(self, logs: List[str]):
         """로그 디스플레이 업데이트 - HTML 스타일링 지원"""
@@ -835,6 +479,72 @@ class PromptListModifierModule(BaseMiddleModule, ModeAwareModule):
         # 8. 로그 표시
         self._update_log_display(logs)
 
+    def apply_rules_to_all_results(self):
+        """검색 결과 전체에 규칙을 일괄 적용 (규칙별 적중 수 표시, 선택 시 재작성된 프롬프트를 Parquet으로 저장)"""
+        if not self.rules_textedit or self.bulk_thread is not None:
+            return
+
+        rules_text = self.rules_textedit.toPlainText().strip()
+        if not rules_text:
+            self.log_textedit.setText("규칙이 비어있습니다.")
+            return
+
+        if not hasattr(self, 'app_context') or not self.app_context:
+            self.log_textedit.setText("AppContext가 설정되지 않았습니다.")
+            return
+
+        search_results = getattr(self.app_context.main_window, 'search_results', None)
+        if not search_results or search_results.is_empty():
+            self.log_textedit.setText("검색 결과가 없습니다. 먼저 검색을 수행해주세요.")
+            return
+
+        output_path = None
+        answer = QMessageBox.question(
+            self.widget, "전체 결과에 적용",
+            "규칙이 적용된 프롬프트를 Parquet 파일로 저장하시겠습니까?\n(아니오: 규칙별 적중 수만 집계)"
+        )
+        if answer == QMessageBox.StandardButton.Yes:
+            output_path, _ = QFileDialog.getSaveFileName(self.widget, "Parquet 파일로 저장", "", "Parquet Files (*.parquet)")
+            if not output_path:
+                return
+
+        df = search_results.get_dataframe()
+        self.bulk_button.setEnabled(False)
+        self.log_textedit.setText(f"전체 결과({len(df):,}행)에 규칙 적용 중...")
+
+        # 규칙 테스트와 같은 기본 prefix_tags로 평가
+        self.bulk_thread = QThread()
+        self.bulk_worker = BulkRuleWorker(self.rule_engine, rules_text, df, ["masterpiece", "best quality"], output_path)
+        self.bulk_worker.moveToThread(self.bulk_thread)
+
+        self.bulk_worker.progress_updated.connect(self._on_bulk_progress)
+        self.bulk_worker.bulk_finished.connect(self._on_bulk_finished)
+        self.bulk_worker.error_occurred.connect(self._on_bulk_error)
+
+        self.bulk_thread.started.connect(self.bulk_worker.run)
+        self.bulk_thread.finished.connect(self.bulk_thread.deleteLater)
+        self.bulk_thread.start()
+
+    def _on_bulk_progress(self, done: int, total: int):
+        self.log_textedit.setText(f"전체 결과에 규칙 적용 중... {done:,} / {total:,}")
+
+    def _on_bulk_finished(self, report: dict):
+        self._update_log_display(format_bulk_report(report))
+        self._cleanup_bulk_thread()
+
+    def _on_bulk_error(self, message: str):
+        self.log_textedit.setText(message)
+        self._cleanup_bulk_thread()
+
+    def _cleanup_bulk_thread(self):
+        if self.bulk_thread:
+            self.bulk_thread.quit()
+            self.bulk_thread.wait()
+        self.bulk_thread = None
+        self.bulk_worker = None
+        if self.bulk_button:
+            self.bulk_button.setEnabled(True)
+
     def initialize_with_context(self, app_context):
         """AppContext 주입"""
         self.app_context = app_context
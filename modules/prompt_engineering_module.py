@@ -1,6 +1,7 @@
 from PyQt6.QtWidgets import QVBoxLayout, QLabel, QWidget, QTextEdit, QCheckBox
 from interfaces.base_module import BaseMiddleModule
 from core.prompt_context import PromptContext
+from core.prompt_engineering import apply_prompt_engineering, AutoHideMatcher
 from interfaces.mode_aware_module import ModeAwareModule
 from ui.theme import get_dynamic_styles
 from ui.scaling_manager import get_scaled_font_size
@@ -30,6 +31,8 @@ class PromptEngineeringModule(BaseMiddleModule, ModeAwareModule):
         self.pre_textedit = None
         self.post_textedit = None
         self.auto_hide_textedit = None
+        # 자동 숨김 매처: 자동 숨김 프롬프트가 바뀌면 비우고, 다음 훅 실행 때 한 번만 다시 만듦
+        self.auto_hide_matcher = None
         self.preprocessing_checkboxes = {}
 
         # 기존 설정 파일 경로 유지
@@ -131,6 +134,7 @@ class PromptEngineeringModule(BaseMiddleModule, ModeAwareModule):
         self.auto_hide_textedit = QTextEdit()
         self.auto_hide_textedit.setFixedHeight(160)
         self.auto_hide_textedit.setStyleSheet(dynamic_styles['compact_textedit'])
+        self.auto_hide_textedit.textChanged.connect(self._invalidate_auto_hide_matcher)
         layout.addWidget(self.auto_hide_textedit)
 
         # 프롬프트 전처리 옵션들
@@ -170,132 +174,20 @@ class PromptEngineeringModule(BaseMiddleModule, ModeAwareModule):
         print("🔧 프롬프트 엔지니어링 훅 실행...")
 
         options = self.get_parameters()
+        if self.auto_hide_matcher is None:
+            self.auto_hide_matcher = AutoHideMatcher(options["auto_hide"])
+        options["auto_hide_matcher"] = self.auto_hide_matcher
 
-        # 메인UI의 전역 데이터 파이프라인에 접근
-        filter_manager = self.context.filter_data_manager
-
-        # 1. 선행/후행 프롬프트 추가
-        _prefix_tags = options["pre_prompt"]
-        _postfix_tags = options["post_prompt"]
-        
-        # context의 태그 리스트 앞/뒤에 추가
-        prefix_tags = _prefix_tags + context.prefix_tags
-        postfix_tags = context.postfix_tags + _postfix_tags
-        main_tags = context.main_tags
-        removed_tags = context.removed_tags
-        source_row = context.source_row
-        
-        # 2. 자동 태그 제거 옵션 처리
-        checkbox_options = options["preprocessing_options"]
-
-        # "remove_work_title"
-        if not checkbox_options.get("remove_work_title"):
-            copyright = source_row.get("copyright")
-            if copyright: prefix_tags.insert(0, copyright)
-
-        # "remove_author"
-        if not checkbox_options.get("remove_author"):
-            artist = source_row.get("artist")
-            if artist: prefix_tags.insert(0, artist)
-
-        # "remove_character_name"
-        if not checkbox_options.get("remove_character_name"):
-            character = source_row.get("character")
-            if character: prefix_tags.insert(0, character)
-
-        # 자동숨김프롬프트 처리
-        auto_hide = options["auto_hide"]
-        temp_hide_prompt = []
-        
-        # ~ 로 시작하는 아이템 제거
-        auto_hide = [item for item in auto_hide if not item.startswith('~')]
-        
-        # 직접 매칭되는 키워드 제거
-        for keyword in main_tags:
-            if keyword in auto_hide:
-                temp_hide_prompt.append(keyword)
-        for keyword in temp_hide_prompt:
-            main_tags.remove(keyword)
-            removed_tags.append(keyword)
-            
-        # 패턴 매칭 처리
-        to_remove = []
-        for item in auto_hide:
-            modified_item = item
-            if item.startswith("__") and item.endswith("__"):
-                modified_item = modified_item.replace("_", "")
-                to_remove += [keyword for keyword in main_tags if modified_item in keyword]
-            elif item.startswith("_") and item.endswith("_"):
-                modified_item = modified_item.replace("_", " ")
-                to_remove += [keyword for keyword in main_tags if modified_item in keyword]
-            elif item.startswith("_"):
-                modified_item = modified_item.replace("_", " ", 1)
-                to_remove += [keyword for keyword in main_tags if modified_item in keyword]
-            elif item.endswith("_"):
-                modified_item = " " + modified_item.rstrip("_") + " "
-                to_remove += [keyword for keyword in main_tags if modified_item.strip() in keyword]
-                
-        # 조건에 맞는 키워드를 main_tags에서 제거
-        to_remove = list(set(to_remove))
-        if to_remove:
-            for keyword in to_remove:
-                if keyword in main_tags:
-                    main_tags.remove(keyword)
-                    removed_tags.append(keyword)
-                    
+        # 실제 태그 가공은 Qt와 무관한 core.prompt_engineering에서 수행 (헤드리스 파이프라인과 공유)
+        context = apply_prompt_engineering(context, options, self.context.filter_data_manager)
+        removed_tags = context.metadata.get('auto_hide_removed_tags')
         print(f"Auto Hide로 제거된 태그: {', '.join(removed_tags) if removed_tags else '없음'}")
-
-        # "remove_character_features"
-        if checkbox_options.get("remove_character_features"):
-            characteristics = filter_manager.characteristic_list
-            temp = []
-            for keyword in main_tags:
-                if keyword in characteristics:
-                    temp.append(keyword)
-            for keyword in temp:
-                main_tags.remove(keyword)
-                removed_tags.append(keyword)
-    
-        # "remove_clothes"
-        if checkbox_options.get("remove_clothes"):
-            clothes = filter_manager.clothes_list
-            temp = []
-            for keyword in main_tags:
-                if keyword in clothes:
-                    temp.append(keyword)
-            for keyword in temp:
-                main_tags.remove(keyword)
-                removed_tags.append(keyword)
-
-        # "remove_color"
-        if checkbox_options.get("remove_color"):
-            colors = filter_manager.color_list
-            temp = []
-            for keyword in main_tags:
-                if any(color in keyword for color in colors):
-                    temp.append(keyword)
-            for keyword in temp:
-                main_tags.remove(keyword)
-                removed_tags.append(keyword)
-
-        # "remove_location_and_background_color"
-        if checkbox_options.get("remove_location_and_background_color"):
-            locations = ['indoors', 'outdoors', 'airplane interior', 'airport', 'apartment', 'arena', 'armory', 'bar', 'barn', 'bathroom', 'bathtub', 'bedroom', 'bell tower', 'billiard room', 'book store', 'bowling alley', 'bunker', 'bus interior', 'butcher shop', 'cafe', 'cafeteria', 'car interior', 'casino', 'castle', 'catacomb', 'changing room', 'church', 'classroom', 'closet', 'construction site', 'convenience store', 'convention hall', 'court', 'dining room', 'drugstore', 'ferris wheel', 'flower shop', 'gym', 'hangar', 'hospital', 'hotel room', 'hotel', 'infirmary', 'izakaya', 'kitchen', 'laboratory', 'library', 'living room', 'locker room', 'mall', 'messy room', 'mosque', 'movie theater', 'museum', 'nightclub', 'office', 'onsen', 'ovservatory', 'phone booth', 'planetarium', 'pool', 'prison', 'refinery', 'restaurant', 'restroom', 'rural', 'salon', 'school', 'sex shop', 'shop', 'shower room', 'skating rink', 'snowboard shop', 'spacecraft interior', 'staff room', 'stage', 'supermarket', 'throne', 'train station', 'tunnel', 'airfield', 'alley', 'amphitheater', 'aqueduct', 'bamboo forest', 'beach', 'blizzard', 'bridge', 'bus stop', 'canal', 'canyon', 'carousel', 'cave', 'cliff', 'cockpit', 'conservatory', 'cross walk', 'desert', 'dust storm', 'flower field', 'forest', 'garden', 'gas staion', 'gazebo', 'geyser', 'glacier', 'graveyard', 'harbor', 'highway', 'hill', 'island', 'jungle', 'lake', 'market', 'meadow', 'nuclear powerplant', 'oasis', 'ocean bottom', 'ocean', 'pagoda', 'parking lot', 'playground', 'pond', 'poolside', 'railroad', 'rainforest', 'rice paddy', 'roller coster', 'rooftop', 'rope bridge', 'running track', 'savannah', 'shipyard', 'shirine', 'skyscraper', 'soccor field', 'space elevator', 'stair', 'starry sky', 'swamp', 'tidal flat', 'volcano', 'waterfall', 'waterpark', 'wheat field', 'zoo', 'white background', 'simple background', 'grey background', 'gradient background', 'blue background', 'black background', 'yellow background', 'pink background', 'red background', 'brown background', 'green background', 'purple background', 'orange background']
-            temp = []
-            for keyword in main_tags:
-                if keyword in locations:
-                    temp.append(keyword)
-            for keyword in temp:
-                main_tags.remove(keyword)
-                removed_tags.append(keyword)
-        
-        # 수정된 context를 다음 훅 또는 파이프라인으로 전달
-        context.prefix_tags = prefix_tags
-        context.postfix_tags = postfix_tags
-        context.main_tags = main_tags
-
         return context
 
+    def _invalidate_auto_hide_matcher(self):
+        """자동 숨김 프롬프트가 바뀌면 캐시된 매처를 버립니다."""
+        self.auto_hide_matcher = None
+
     def get_parameters(self) -> Dict[str, Any]:
         """프롬프트 엔지니어링 모듈의 현재 파라미터를 수집하여 반환합니다."""
         # 각 체크박스의 상태를 수집
@@ -145,27 +145,36 @@ class WildcardStatusModule(BaseMiddleModule):
     def reload_wildcards(self):
         """
         리로드 버튼 클릭 시 호출되는 함수.
-        와일드카드 매니저에게 리로드를 요청합니다.
+        와일드카드 감시자가 있으면 작업 스레드에서 증분 리로드를 요청하고,
+        없으면 와일드카드 매니저에서 직접 리로드합니다.
         """
         try:
-            self.context.wildcard_manager.reload_wildcards()
+            watcher = getattr(self.context, 'wildcard_watcher', None)
+            if watcher:
+                watcher.request_reload()
+            else:
+                self.context.wildcard_manager.reload_wildcards()
         except Exception as e:
             print(f"❌ 와일드카드 리로드 중 오류 발생: {e}")
             
-    def on_wildcards_reloaded(self, wildcard_count):
+    def on_wildcards_reloaded(self, wildcard_count, diff=None):
         """
         와일드카드 리로드 완료 시 호출되는 콜백 함수.
-        와일드카드 개수 레이블을 업데이트합니다.
+        와일드카드 개수 레이블을 업데이트하고 변경 내역을 툴팁으로 표시합니다.
         """
         if hasattr(self, 'count_label') and self.count_label:
             self.count_label.setText(f"로드된 와일드카드: {wildcard_count}개")
+            if diff is not None:
+                self.count_label.setToolTip(f"마지막 리로드: 추가 {len(diff.added)} / 변경 {len(diff.modified)} / 삭제 {len(diff.removed)}")
             
     def reset_sequential_wildcards(self):
         """
         순차 리셋 버튼 클릭 시 호출되는 함수.
         AppContext의 current_prompt_context에서 순차 와일드카드 카운터와 상태를 초기화합니다.
+        저장된 카운터(save/wildcard_state.jsonl)도 함께 초기화합니다.
         """
         try:
+            self.context.wildcard_state_store.reset()
             if self.context.current_prompt_context:
                 # 순차 카운터 초기화
                 old_counter_count = len(self.context.current_prompt_context.sequential_counters)
@@ -1,69 +1,154 @@
 import io
 from contextlib import redirect_stdout
+from functools import lru_cache
+import ast
+import types
 import random
 import re
 import math
 import builtins
 
+# 허용 모듈
+ALLOWED_MODULES = {
+    'random': random,
+    're': re,
+    'math': math
+}
+
+# 위험한 함수/키워드만 블랙리스트로 관리
+BLACKLISTED_KEYWORDS = [
+    'import os', 'from os', 'exec', 'eval', 'compile',
+    'open(', 'file(', 'input(', 'raw_input(',
+    'subprocess', 'system', 'popen', 'spawn',
+    'exit(', 'quit(', 'sys.exit',
+    'delattr', '__del__', '__class__', '__bases__', '__subclasses__',
+    'globals()', 'locals()', 'vars()', 'dir()',
+    'getattr', 'setattr', 'hasattr'
+]
+
+# 모든 기본 내장 함수를 허용 (한 번만 만들어 두고 실행기마다 얕은 복사로 사용)
+_SAFE_BUILTINS = {name: getattr(builtins, name) for name in dir(builtins)}
+_SAFE_BUILTINS.update({
+    'True': True,
+    'False': False,
+    'None': None,
+    # 기본 예외 클래스들도 허용
+    'Exception': Exception,
+    'ValueError': ValueError,
+    'TypeError': TypeError,
+    'IndexError': IndexError,
+    'KeyError': KeyError,
+    'AttributeError': AttributeError,
+})
+
+# 인자로 넘겨도 원본 리스트를 바꾸지 않는 내장 함수 (복사 생략 판단용)
+_READ_ONLY_CALLS = frozenset([
+    'len', 'sorted', 'set', 'frozenset', 'list', 'tuple', 'any', 'all', 'sum',
+    'min', 'max', 'enumerate', 'zip', 'reversed', 'str', 'print', 'bool'
+])
+
+class CompiledScript:
+    """
+    한 번 검사/컴파일한 사용자 코드.
+    - error: 블랙리스트/문법 오류 메시지 (None이면 실행 가능)
+    - names: 코드가 참조하는 이름 (중첩 컴프리헨션/람다 포함), 참조하지 않는 변수는 넘기지 않음
+    - mutated: 원본을 바꿀 수 있는 방식으로 쓰이는 이름, 이 변수들만 복사해서 넘김
+    """
+    __slots__ = ('code', 'error', 'names', 'mutated')
+
+    def __init__(self, code=None, error=None, names=frozenset(), mutated=frozenset()):
+        self.code = code
+        self.error = error
+        self.names = names
+        self.mutated = mutated
+
+def _code_names(code: types.CodeType) -> set:
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _code_names(const)
+    return names
+
+def _bound_names(tree: ast.AST) -> set:
+    """코드가 직접 바인딩하는 이름 (대입/def/class/매개변수/import/for 대상/except as/match 캡처 등)"""
+    bound = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load):
+            bound.add(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            bound.add(node.name)
+        elif isinstance(node, ast.arg):
+            bound.add(node.arg)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            bound.update((alias.asname or alias.name).split('.')[0] for alias in node.names)
+        elif isinstance(node, (ast.ExceptHandler, ast.MatchAs, ast.MatchStar)) and node.name:
+            bound.add(node.name)
+        elif isinstance(node, ast.MatchMapping) and node.rest:
+            bound.add(node.rest)
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            bound.update(node.names)
+    return bound
+
+def _is_read_only_use(parent: ast.AST, node: ast.Name, read_only_calls: frozenset) -> bool:
+    """이름이 읽기 전용으로만 쓰이는 위치인지 (순회, 비교, 인덱싱, 연산, 읽기 전용 내장 함수 인자 등)"""
+    if isinstance(parent, (ast.comprehension, ast.For)):
+        return parent.iter is node
+    if isinstance(parent, (ast.Compare, ast.BinOp, ast.UnaryOp, ast.FormattedValue)):
+        return True
+    if isinstance(parent, (ast.If, ast.While, ast.IfExp)):
+        return parent.test is node
+    if isinstance(parent, ast.Subscript):
+        return parent.value is node and isinstance(parent.ctx, ast.Load)
+    if isinstance(parent, ast.Call):
+        return (node in parent.args and isinstance(parent.func, ast.Name)
+                and parent.func.id in read_only_calls)
+    return False
+
+def _mutated_names(tree: ast.AST) -> frozenset:
+    """
+    원본 객체가 바뀔 수 있는 이름 (보수적 판단).
+    메서드 호출, 항목 대입, 다른 이름으로의 대입/전달 등 읽기 전용으로 확인되지 않는 사용은 모두 변경 가능으로 봅니다.
+    코드가 'len' 등 읽기 전용 내장 함수 이름을 다시 정의하면 그 이름의 호출 인자도 변경 가능으로 봅니다.
+    """
+    read_only_calls = _READ_ONLY_CALLS - _bound_names(tree)
+    mutated = set()
+    for parent in ast.walk(tree):
+        # 'x += ...'는 대입 전에 원본 리스트를 제자리에서 확장
+        if isinstance(parent, ast.AugAssign) and isinstance(parent.target, ast.Name):
+            mutated.add(parent.target.id)
+        for child in ast.iter_child_nodes(parent):
+            if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Load):
+                if not _is_read_only_use(parent, child, read_only_calls):
+                    mutated.add(child.id)
+    return frozenset(mutated)
+
+@lru_cache(maxsize=128)
+def compile_script(code: str) -> CompiledScript:
+    """사용자 코드를 검사하고 컴파일합니다. 같은 코드는 캐시된 결과를 재사용합니다."""
+    # 블랙리스트 검사 (대소문자 구분 없이)
+    code_lower = code.lower()
+    for keyword in BLACKLISTED_KEYWORDS:
+        if keyword.lower() in code_lower:
+            return CompiledScript(error=f"오류: 보안상 허용되지 않는 키워드가 포함되어 있습니다: {keyword}")
+    try:
+        compiled = builtins.compile(code, '<string>', 'exec')
+        tree = ast.parse(code)
+    except Exception as e:
+        return CompiledScript(error=f"실행 중 오류 발생: {e}")
+    return CompiledScript(compiled, None, frozenset(_code_names(compiled)), _mutated_names(tree))
+
 class SafeExecutor:
     """
     최소 제약 파이썬 코드 실행기.
     OS 접근 및 위험한 함수만 차단하고, 나머지는 모두 허용.
+    코드 검사/컴파일 결과는 compile_script에 캐시되며, 변수는 코드가 바꿀 수 있는 것만 복사해서 넘깁니다.
     """
     def __init__(self, allowed_vars: dict):
-        self.allowed_vars = {k: v.copy() for k, v in allowed_vars.items()}
-
-        # 허용 모듈
-        self.allowed_modules = {
-            'random': random,
-            're': re,
-            'math': math
-        }
-
-        # 위험한 함수/키워드만 블랙리스트로 관리
-        self.blacklisted_keywords = [
-            'import os', 'from os', 'exec', 'eval', 'compile',
-            'open(', 'file(', 'input(', 'raw_input(',
-            'subprocess', 'system', 'popen', 'spawn',
-            'exit(', 'quit(', 'sys.exit',
-            'delattr', '__del__', '__class__', '__bases__', '__subclasses__',
-            'globals()', 'locals()', 'vars()', 'dir()',
-            'getattr', 'setattr', 'hasattr'
-        ]
-
-        # 모든 기본 내장 함수를 허용 (위험한 것들만 제외)
-        # dangerous_builtins = {
-        #     'open', 'input', 'raw_input', 'file', 'execfile', 'reload', 
-        #     'exit', 'quit', 'eval', 'exec', 'compile',
-        #     'delattr', 'getattr', 'setattr', 'hasattr', 'globals', 'locals', 'vars', 'dir'
-        # }
-        
-        # 모든 내장 함수에서 위험한 것들만 제외
-        safe_builtins = {}
-        for name in dir(builtins):
-            # if not name.startswith('_') and name not in dangerous_builtins:
-            safe_builtins[name] = getattr(builtins, name)
-        
-        # 기본적으로 필요한 상수들 추가
-        safe_builtins.update({
-            'True': True,
-            'False': False,
-            'None': None,
-            'print': self.captured_print,
-            # 기본 예외 클래스들도 허용
-            'Exception': Exception,
-            'ValueError': ValueError,
-            'TypeError': TypeError,
-            'IndexError': IndexError,
-            'KeyError': KeyError,
-            'AttributeError': AttributeError,
-        })
-
-        self.execution_globals = {
-            "__builtins__": safe_builtins,
-            **self.allowed_vars,
-            **self.allowed_modules
-        }
+        self.allowed_vars = allowed_vars
+
+        safe_builtins = dict(_SAFE_BUILTINS)
+        safe_builtins['print'] = self.captured_print
+        self.safe_builtins = safe_builtins
 
         self.output_buffer = io.StringIO()
 
@@ -72,11 +157,9 @@ class SafeExecutor:
 
     def execute(self, code: str):
         """사용자 코드를 안전하게 실행"""
-        # 블랙리스트 검사 (대소문자 구분 없이)
-        code_lower = code.lower()
-        for keyword in self.blacklisted_keywords:
-            if keyword.lower() in code_lower:
-                return f"오류: 보안상 허용되지 않는 키워드가 포함되어 있습니다: {keyword}", None, False
+        script = compile_script(code)
+        if script.error is not None:
+            return script.error, None, False
 
         self.output_buffer.seek(0)
         self.output_buffer.truncate(0)
@@ -86,17 +169,25 @@ class SafeExecutor:
                                set(self.allowed_vars.get('main_tags', [])) | \
                                set(self.allowed_vars.get('postfix_tags', []))
 
+            # 코드가 참조하는 변수만 전달 (바뀔 수 있는 변수는 복사해서 원본 보호)
+            execution_globals = {"__builtins__": self.safe_builtins, **ALLOWED_MODULES}
+            for key in script.names:
+                if key in self.allowed_vars:
+                    value = self.allowed_vars[key]
+                    execution_globals[key] = value.copy() if key in script.mutated else value
             execution_locals = {}
 
             with redirect_stdout(self.output_buffer):
-                exec(code, self.execution_globals, execution_locals)
+                exec(script.code, execution_globals, execution_locals)
 
             updated_vars = {}
-            for key in self.allowed_vars.keys():
+            for key, value in self.allowed_vars.items():
                 if key in execution_locals:
                     updated_vars[key] = execution_locals[key]
-                elif key in self.execution_globals:
-                    updated_vars[key] = self.execution_globals[key]
+                elif key in execution_globals:
+                    updated_vars[key] = execution_globals[key]
+                else:
+                    updated_vars[key] = value
 
             final_all_tags = set(updated_vars.get('prefix_tags', [])) | \
                              set(updated_vars.get('main_tags', [])) | \
@@ -110,4 +201,4 @@ class SafeExecutor:
             return output, updated_vars, True
 
         except Exception as e:
-            return f"실행 중 오류 발생: {e}", None, False
\ No newline at end of file
+            return f"실행 중 오류 발생: {e}", None, False
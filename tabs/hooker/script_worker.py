@@ -0,0 +1,176 @@
+import multiprocessing
+import signal
+from typing import Dict, Optional
+
+from tabs.hooker.safe_executer import SafeExecutor, compile_script
+
+# Hooker 스크립트를 별도 프로세스에서 실행하는 백엔드 (Qt 비의존).
+# 미리 띄워 둔 워커 프로세스 하나가 요청을 순서대로 처리합니다.
+# - 필터 사전처럼 큰 공유 변수는 set_shared_variables로 한 번만 보내 워커에 보관하고,
+#   호출마다는 태그 리스트 등 스테이지 변수만 주고받습니다.
+# - 워커 안에서는 호출별 CPU 시간 제한을 걸고(ITIMER_PROF 지원 플랫폼),
+#   부모는 제한 시간 + 여유 시간 안에 응답이 없으면 워커를 종료하고 새로 띄웁니다.
+# - spawn된 워커는 메인 모듈(PyQt6, pandas 등)을 다시 임포트하느라 뜨는 데 시간이 걸리므로,
+#   준비가 끝나면 ('ready',)를 보내고 부모는 이를 받은 뒤에만 제한 시간을 재기 시작합니다.
+
+# 부모 쪽 대기 시간에 더하는 여유 (직렬화/전송 지연 및 CPU 타이머를 쓸 수 없는 플랫폼 대비)
+_RESPONSE_GRACE = 1.0
+# 워커가 ('ready',)를 보낼 때까지 기다리는 최대 시간 (느린 디스크/백신 검사 대비)
+_STARTUP_TIMEOUT = 60.0
+
+class ScriptTimeoutError(Exception):
+    """워커 안에서 스크립트가 CPU 시간 제한을 넘었을 때 발생"""
+
+def _raise_timeout(signum, frame):
+    raise ScriptTimeoutError("CPU 시간 제한 초과")
+
+def _worker_main(conn):
+    """워커 프로세스 본체: ('shared', 변수) / ('run', 코드, 변수, CPU 제한) / ('stop',) 메시지를 처리"""
+    # GUI 프로세스의 Ctrl+C는 부모가 처리
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    has_cpu_timer = hasattr(signal, 'setitimer') and hasattr(signal, 'ITIMER_PROF')
+    if has_cpu_timer:
+        signal.signal(signal.SIGPROF, _raise_timeout)
+    conn.send(('ready',))
+
+    shared_vars = {}
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+
+        kind = message[0]
+        if kind == 'stop':
+            break
+        if kind == 'shared':
+            shared_vars = message[1]
+            continue
+
+        _, code, variables, cpu_time_limit = message
+        try:
+            if has_cpu_timer and cpu_time_limit:
+                signal.setitimer(signal.ITIMER_PROF, cpu_time_limit)
+            try:
+                output, updated_vars, success = SafeExecutor({**shared_vars, **variables}).execute(code)
+            finally:
+                if has_cpu_timer:
+                    signal.setitimer(signal.ITIMER_PROF, 0)
+        except ScriptTimeoutError as e:
+            output, updated_vars, success = f"실행 중 오류 발생: {e}", None, False
+
+        # 공유 변수는 돌려보내지 않음 (부모가 가진 원본으로 채움)
+        if updated_vars is not None:
+            updated_vars = {key: value for key, value in updated_vars.items()
+                            if key in variables or key not in shared_vars}
+        try:
+            conn.send((output, updated_vars, success))
+        except Exception as e:
+            # 직렬화할 수 없는 값(제너레이터 등)을 변수에 넣은 경우
+            conn.send((f"실행 중 오류 발생: 결과를 전달할 수 없습니다. ({e})", None, False))
+
+class IsolatedScriptRunner:
+    """
+    Hooker 스크립트를 미리 띄워 둔 워커 프로세스에서 실행합니다.
+    execute()는 SafeExecutor.execute와 같은 (출력, 변경된 변수, 성공 여부)를 반환하며,
+    무한 루프 등으로 제한 시간을 넘기거나 워커가 죽으면 오류를 반환하고 워커를 다시 띄웁니다.
+    """
+
+    def __init__(self, cpu_time_limit: float = 2.0):
+        self.cpu_time_limit = cpu_time_limit
+        self.shared_vars: Dict = {}
+        # Qt가 떠 있는 프로세스에서 fork하지 않도록 spawn 사용
+        self._mp_context = multiprocessing.get_context('spawn')
+        self._process = None
+        self._conn = None
+        self._ready = False
+
+    def start(self, wait_ready: bool = True):
+        """
+        워커 프로세스를 띄웁니다. (이미 실행 중이면 무시)
+        wait_ready가 True면 워커가 준비를 마칠 때까지 최대 _STARTUP_TIMEOUT초 기다리며,
+        시간 안에 준비되지 않으면 워커를 정리하고 OSError를 발생시킵니다.
+        (GUI에서 미리 띄워 둘 때는 False로 호출하고, 첫 execute()가 준비 완료를 기다림)
+        """
+        if self._process is None or not self._process.is_alive():
+            self._terminate()
+            parent_conn, child_conn = self._mp_context.Pipe()
+            self._process = self._mp_context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+            self._process.start()
+            child_conn.close()
+            self._conn = parent_conn
+            if self.shared_vars:
+                self._conn.send(('shared', self.shared_vars))
+            print(f"🧪 Hooker 스크립트 워커 시작 (PID {self._process.pid})")
+        if wait_ready and not self._ready:
+            self._wait_ready()
+
+    def _wait_ready(self):
+        """워커의 ('ready',) 메시지를 기다립니다."""
+        try:
+            self._ready = self._conn.poll(_STARTUP_TIMEOUT) and self._conn.recv() == ('ready',)
+        except (EOFError, OSError):
+            self._ready = False
+        if not self._ready:
+            self._terminate()
+            raise OSError(f"워커가 {_STARTUP_TIMEOUT:g}초 안에 준비되지 않았습니다.")
+
+    def restart(self, wait_ready: bool = True):
+        self._terminate()
+        self.start(wait_ready)
+
+    def shutdown(self):
+        """워커 프로세스 종료"""
+        if self._conn is not None:
+            try:
+                self._conn.send(('stop',))
+            except (OSError, ValueError):
+                pass
+        if self._process is not None:
+            self._process.join(timeout=1.0)
+        self._terminate()
+
+    def _terminate(self):
+        if self._process is not None and self._process.is_alive():
+            self._process.terminate()
+            self._process.join(timeout=1.0)
+        if self._conn is not None:
+            self._conn.close()
+        self._process = None
+        self._conn = None
+        self._ready = False
+
+    def set_shared_variables(self, shared_vars: Dict):
+        """모든 호출이 공유하는 변수(필터 사전 등)를 워커에 한 번 보내 둡니다."""
+        self.shared_vars = dict(shared_vars)
+        if self._conn is not None:
+            try:
+                self._conn.send(('shared', self.shared_vars))
+            except (OSError, ValueError):
+                self.restart(wait_ready=False)
+
+    def execute(self, code: str, variables: Dict, cpu_time_limit: Optional[float] = None):
+        """스테이지 변수(variables)와 공유 변수로 코드를 실행합니다."""
+        # 블랙리스트/문법 오류는 워커까지 보내지 않고 바로 반환 (검사 결과는 캐시됨)
+        script = compile_script(code)
+        if script.error is not None:
+            return script.error, None, False
+
+        limit = self.cpu_time_limit if cpu_time_limit is None else cpu_time_limit
+        try:
+            self.start()
+        except OSError as e:
+            return f"실행 중 오류 발생: 워커 프로세스를 시작할 수 없습니다. ({e})", None, False
+        try:
+            self._conn.send(('run', code, variables, limit))
+            if not self._conn.poll(limit + _RESPONSE_GRACE):
+                self.restart(wait_ready=False)
+                return f"실행 중 오류 발생: 제한 시간({limit:g}초) 안에 응답이 없어 워커를 재시작했습니다.", None, False
+            output, updated_vars, success = self._conn.recv()
+        except (EOFError, OSError, ValueError) as e:
+            self.restart(wait_ready=False)
+            return f"실행 중 오류 발생: 워커 프로세스 오류로 재시작했습니다. ({e})", None, False
+
+        if updated_vars is not None:
+            updated_vars = {**self.shared_vars, **updated_vars}
+        return output, updated_vars, success
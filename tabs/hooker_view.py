@@ -1,6 +1,7 @@
 # ui/hooker_view.py
 import os, json
 from tabs.hooker.safe_executer import SafeExecutor
+from tabs.hooker.script_worker import IsolatedScriptRunner
 from PyQt6.Qsci import QsciScintilla, QsciLexerPython
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QScrollArea, QLabel, 
@@ -9,6 +10,7 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, pyqtSignal, QUrl
 from PyQt6.QtGui import QFont, QColor, QDesktopServices
 from core.prompt_context import PromptContext
+from core.pipeline_tracer import INPUT_STAGE, TRACED_TAG_LISTS, StageEvent
 from typing import Dict, List, Any, Optional
 from PyQt6.QtWidgets import QDialog, QLineEdit, QDialogButtonBox
 from ui.theme import get_dynamic_styles
@@ -16,6 +18,20 @@ from ui.scaling_manager import get_scaled_font_size
 from interfaces.base_tab_module import BaseTabModule
 import copy
 
+# PromptProcessor 추적 단계 -> Hooker 단계 이름 (해당 단계 직후 사용자 코드 실행)
+TRACED_STAGES = {
+    'fit_resolution': "Pre-process",
+    'post_processing': "Post-process",
+    'expand_wildcards': "After-wildcard",
+    'final_hookpoint': "Final-process",
+}
+# 새 태그 강조 시 비교할 이전 Hooker 단계
+PREVIOUS_STAGES = {
+    "Post-process": "Pre-process",
+    "After-wildcard": "Post-process",
+    "Final-process": "After-wildcard",
+}
+
 class HookerTabModule(BaseTabModule):
     """'Hooker' 탭을 위한 모듈"""
 
@@ -29,6 +45,9 @@ class HookerTabModule(BaseTabModule):
     def get_tab_order(self) -> int:
         return 4
 
+    def should_defer_widget(self) -> bool:
+        return True  # 첫 활성화 시 위젯 생성
+
     def create_widget(self, parent: QWidget) -> QWidget:
         if self.hooker_widget is None:
             # HookerView는 AppContext를 필요로 하므로, initialize_with_context에서 주입받은 것을 사용
@@ -449,8 +468,7 @@ class PipelineStageWidget(QWidget):
             self.result_output.setText(variable_info_text + "정보: 실행할 코드를 입력하세요.")
             return
 
-        executor = SafeExecutor(allowed_vars)
-        output, updated_vars, success = executor.execute(code)
+        output, updated_vars, success = self.hooker_view._run_user_script(code, allowed_vars)
 
         if success:
             result_text = "--- 실행 출력 ---\n"
@@ -539,8 +557,11 @@ class HookerView(QWidget):
         self.is_monitoring = False
         self.captured_contexts = {}  # 단계별 컨텍스트 저장
         
-        # 원본 파이프라인 메서드 참조 저장
-        self.original_methods = {}
+        # PipelineTracer에 등록한 단계 훅 (추적 단계 이름 -> 훅 함수)
+        self._stage_hooks = {}
+        self.tracer = None
+        # 단계 이벤트의 변화로 복원한 현재 실행의 태그 리스트
+        self._traced_tag_lists = {}
         self._is_syncing = False
         # ⬇️ 스크립트 관리용 변수 및 경로 추가
         self.save_dir = "ui/hooker/save"
@@ -551,6 +572,8 @@ class HookerView(QWidget):
         self.is_naid4_mode = False
         self.char_module = None
         self.filter_variables = {}
+        # 격리 실행 백엔드 (활성화 시에만 워커 프로세스 생성)
+        self.script_runner: Optional[IsolatedScriptRunner] = None
         
         # API payload 저장용
         self.last_payload = None
@@ -721,6 +744,13 @@ class HookerView(QWidget):
         self.enable_hooking_checkbox.toggled.connect(self._on_enable_hooking_toggled)
         layout.addWidget(self.enable_hooking_checkbox)
 
+        # 스크립트를 별도 프로세스에서 실행 (무한 루프 등으로 앱이 멈추지 않도록 시간 제한 적용)
+        self.isolated_execution_checkbox = QCheckBox("격리 프로세스에서 실행")
+        self.isolated_execution_checkbox.setStyleSheet(dynamic_styles['dark_checkbox'])
+        self.isolated_execution_checkbox.setToolTip("스크립트를 별도 워커 프로세스에서 CPU 시간 제한(2초)을 두고 실행합니다.")
+        self.isolated_execution_checkbox.toggled.connect(self._on_isolated_execution_toggled)
+        layout.addWidget(self.isolated_execution_checkbox)
+
         layout.addStretch()
 
         # 2. 스크립트 선택 UI
@@ -787,10 +817,8 @@ class HookerView(QWidget):
             return
         
         try:
-            # PromptProcessor 인스턴스 찾기
+            # 메인 윈도우(프롬프트 생성 컨트롤러) 준비 여부 확인
             if hasattr(self.app_context, 'main_window') and hasattr(self.app_context.main_window, 'prompt_gen_controller'):
-                processor = self.app_context.main_window.prompt_gen_controller.processor
-
                 # ⬇️ NAI D4 모드 체크 및 캐릭터 모듈 참조 저장 (1회 실행)
                 try:
                     self.is_naid4_mode = (self.app_context.get_api_mode() == "NAI" and 
@@ -808,8 +836,8 @@ class HookerView(QWidget):
                 for widget in self.stage_widgets.values():
                     widget.set_character_display_visibility(self.is_naid4_mode)
                 
-                # 원본 메서드들을 후킹
-                self.hook_processor_methods(processor)
+                # 파이프라인 추적기에 단계 훅/이벤트 구독 등록
+                self.register_pipeline_tracing(self.app_context.pipeline_tracer)
                 
                 self.is_monitoring = True
                 self.enable_hooking_checkbox.setChecked(True) # ⬅️ UI 동기화
@@ -821,8 +849,8 @@ class HookerView(QWidget):
     def stop_monitoring(self):
         """파이프라인 감시 중지"""
         try:
-            # 원본 메서드들 복원
-            self.restore_original_methods()
+            # 단계 훅/이벤트 구독 해제
+            self.unregister_pipeline_tracing()
             
             self.is_monitoring = False
             self.enable_hooking_checkbox.setChecked(False) # ⬅️ UI 동기화
@@ -831,96 +859,48 @@ class HookerView(QWidget):
         except Exception as e:
             print(f"❌ 파이프라인 감시 중지 실패: {e}")
     
-    def hook_processor_methods(self, processor):
-        """PromptProcessor의 메서드들을 후킹"""
-        # 원본 메서드들 저장
-        self.original_methods = {
-            '_step_2_fit_resolution': processor._step_2_fit_resolution,
-            '_run_hooks': processor._run_hooks,
-            '_step_3_expand_wildcards': processor._step_3_expand_wildcards
-        }
-        
-        # 후킹된 메서드들로 교체
-        processor._step_2_fit_resolution = self.hooked_step_2_fit_resolution
-        processor._run_hooks = self.hooked_run_hooks
-        processor._step_3_expand_wildcards = self.hooked_step_3_expand_wildcards
-        
-        # processor 참조 저장
-        self.processor = processor
+    def register_pipeline_tracing(self, tracer):
+        """PipelineTracer에 단계별 사용자 코드 훅과 단계 이벤트 구독을 등록"""
+        self.unregister_pipeline_tracing()
+        self.tracer = tracer
+        for stage, stage_name in TRACED_STAGES.items():
+            hook = lambda context, stage_name=stage_name: self._execute_user_script_for_stage(stage_name, context)
+            self._stage_hooks[stage] = hook
+            tracer.add_stage_hook(stage, hook)
+        tracer.subscribe(self.on_stage_event)
     
-    def restore_original_methods(self):
-        """원본 메서드들 복원"""
-        if hasattr(self, 'processor') and self.original_methods:
-            for method_name, original_method in self.original_methods.items():
-                setattr(self.processor, method_name, original_method)
+    def unregister_pipeline_tracing(self):
+        """등록한 단계 훅과 이벤트 구독 해제"""
+        tracer = self.tracer
+        if tracer is None:
+            return
+        for stage, hook in self._stage_hooks.items():
+            tracer.remove_stage_hook(stage, hook)
+        self._stage_hooks.clear()
+        tracer.unsubscribe(self.on_stage_event)
+        self.tracer = None
     
-    def hooked_step_2_fit_resolution(self, context):
-        """_step_2_fit_resolution 후킹"""
-        # 1. 원본 메서드 실행
-        result = self.original_methods['_step_2_fit_resolution'](context)
-        
-        # 2. Pre-process 단계의 사용자 코드 실행 및 결과 적용
-        modified_context = self._execute_user_script_for_stage("Pre-process", result)
-        
-        # 3. 최종 결과를 UI에 캡처
-        self.capture_context("Pre-process", modified_context)
+    def on_stage_event(self, event: StageEvent):
+        """단계 이벤트의 태그 리스트 변화를 누적해 Hooker 단계 결과를 UI에 캡처"""
+        if event.stage == INPUT_STAGE:
+            self._traced_tag_lists = {name: [] for name in TRACED_TAG_LISTS}
+        self._traced_tag_lists = event.apply(self._traced_tag_lists)
+        
+        stage_name = TRACED_STAGES.get(event.stage)
+        if stage_name is None:
+            return
         
-        # 4. 다음 단계로 수정된 컨텍스트 전달
-        return modified_context
-    
-    def hooked_run_hooks(self, hook_point, context):
-        """_run_hooks 후킹"""
+        # UI 표시에 필요한 태그 리스트만 담은 컨텍스트 (source_row/settings 복사 없음)
+        context = PromptContext(source_row=None, settings={},
+                                **{name: list(tags) for name, tags in self._traced_tag_lists.items()})
+        previous_context = self.captured_contexts.get(PREVIOUS_STAGES.get(stage_name))
+        self.capture_context(stage_name, context, previous_context)
         
-        # 1. 처리할 훅 포인트가 아니면 원본 메서드만 실행하고 반환
-        if hook_point not in ["post_processing", "final_hookpoint"]:
-            return self.original_methods['_run_hooks'](hook_point, context)
-            
-        # 2. 훅 포인트에 해당하는 원본 메서드 실행
-        result = self.original_methods['_run_hooks'](hook_point, context)
-        
-        # 3. 훅 포인트에 따라 분기하여 처리
-        if hook_point == "post_processing":
-            # "Post-process" 단계의 사용자 코드 실행 및 결과 적용
-            stage_name = "Post-process"
-            previous_context = self.captured_contexts.get("Pre-process")
-            modified_context = self._execute_user_script_for_stage(stage_name, result)
-
-            # 최종 결과를 UI에 캡처
-            self.capture_context(stage_name, modified_context, previous_context)
-            
-            # 다음 단계로 수정된 컨텍스트 전달
-            return modified_context
-
-        elif hook_point == "final_hookpoint":
-            # "Final-process" 단계의 사용자 코드 실행 및 결과 적용
-            stage_name = "Final-process"
-            previous_context = self.captured_contexts.get("After-wildcard")
-            modified_context = self._execute_user_script_for_stage(stage_name, result)
-
-            # 최종 결과를 UI에 캡처
-            self.capture_context(stage_name, modified_context, previous_context)
-
-            # ⬇️ 최종 단계가 끝난 후, 캐릭터 모듈의 UI 업데이트 메서드 호출
+        # ⬇️ 최종 단계가 끝난 후, 캐릭터 모듈의 UI 업데이트 메서드 호출
+        if stage_name == "Final-process":
             if self.is_naid4_mode and self.char_module and not self.char_module.reroll_on_generate_checkbox.isChecked():
                 print("🔄️ Hooker 파이프라인 완료. 캐릭터 모듈 UI를 최종 갱신합니다.")
                 self.char_module.hooker_update_prompt()
-
-            # 다음 단계로 수정된 컨텍스트 전달
-            return modified_context
-    
-    def hooked_step_3_expand_wildcards(self, context):
-        """_step_3_expand_wildcards 후킹"""
-        # 1. 원본 메서드 실행
-        result = self.original_methods['_step_3_expand_wildcards'](context)
-        
-        # 2. After-wildcard 단계의 사용자 코드 실행 및 결과 적용
-        modified_context = self._execute_user_script_for_stage("After-wildcard", result)
-
-        # 3. 최종 결과를 UI에 캡처
-        self.capture_context("After-wildcard", modified_context, self.captured_contexts.get("Post-process"))
-        
-        # 4. 다음 단계로 수정된 컨텍스트 전달
-        return modified_context
     
     def capture_context(self, stage_name: str, context: PromptContext, previous_context: PromptContext = None):
         """특정 단계의 컨텍스트 캡처 및 UI 업데이트"""
@@ -987,8 +967,7 @@ class HookerView(QWidget):
 
             widget.result_output.clear()
 
-            executor = SafeExecutor(allowed_vars)
-            output, updated_vars, success = executor.execute(code)
+            output, updated_vars, success = self._run_user_script(code, allowed_vars)
 
             if success:
                 context.prefix_tags = updated_vars['prefix_tags']
@@ -1034,6 +1013,29 @@ class HookerView(QWidget):
                 except Exception as e:
                     print(f"❌ 필터 파일 '{filename}' 로드 실패: {e}")
 
+        if self.script_runner is not None:
+            self.script_runner.set_shared_variables(self.filter_variables)
+
+    def _on_isolated_execution_toggled(self, checked):
+        """'격리 프로세스에서 실행' 체크박스 토글 시 워커 프로세스 시작/종료"""
+        if checked:
+            if self.script_runner is None:
+                self.script_runner = IsolatedScriptRunner()
+                self.script_runner.set_shared_variables(self.filter_variables)
+                # GUI를 멈추지 않도록 준비 완료는 기다리지 않음 (첫 실행 때 기다림)
+                self.script_runner.start(wait_ready=False)
+        elif self.script_runner is not None:
+            self.script_runner.shutdown()
+            self.script_runner = None
+
+    def _run_user_script(self, code: str, allowed_vars: dict):
+        """사용자 코드 실행 (격리 실행이 켜져 있으면 워커 프로세스, 아니면 현재 프로세스)"""
+        if self.script_runner is not None:
+            # 필터 변수는 워커에 미리 보내 두었으므로 스테이지 변수만 전달
+            variables = {k: v for k, v in allowed_vars.items() if k not in self.filter_variables}
+            return self.script_runner.execute(code, variables)
+        return SafeExecutor(allowed_vars).execute(code)
+
     def _on_enable_hooking_toggled(self, checked):
         """'후킹 기능 활성화' 체크박스 토글 시 호출"""
         if checked:
@@ -1235,4 +1237,8 @@ class HookerView(QWidget):
         """리소스 정리"""
         if hasattr(self, 'api_payload_timer'):
             self.api_payload_timer.stop()
-            print("🧹 API payload 타이머 정리 완료")
\ No newline at end of file
+            print("🧹 API payload 타이머 정리 완료")
+        if self.script_runner is not None:
+            self.script_runner.shutdown()
+            self.script_runner = None
+            print("🧹 Hooker 스크립트 워커 종료 완료")
\ No newline at end of file
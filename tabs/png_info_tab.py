@@ -33,6 +33,9 @@ class PngInfoTabModule(BaseTabModule):
     def get_tab_order(self) -> int:
         return 3 # 탭 순서 정의
 
+    def should_defer_widget(self) -> bool:
+        return True  # 첫 활성화 시 위젯 생성
+
     def create_widget(self, parent: QWidget) -> QWidget:
         # 위젯이 아직 생성되지 않았을 때만 생성
         if self.png_info_widget is None:
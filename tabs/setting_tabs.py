@@ -475,10 +475,11 @@ class SettingsWidget(QWidget):
             hasattr(self.app_context.main_window.image_window, 'tab_controller')):
             
             tab_controller = self.app_context.main_window.image_window.tab_controller
-            for tab_id, instance in tab_controller.module_instances.items():
+            # 지연 생성 탭은 아직 인스턴스가 없을 수 있으므로 tab_index_map 기준으로 순회
+            for tab_id in list(tab_controller.tab_index_map):
                 # 숨길 수 있는 탭인지 확인
-                if instance.__class__.__name__ in hideable_tabs:
-                    checkbox = QCheckBox(instance.get_tab_title())
+                if tab_id in hideable_tabs:
+                    checkbox = QCheckBox(tab_controller.get_tab_title(tab_id))
                     checkbox.setStyleSheet(DARK_STYLES['dark_checkbox'])
                     
                     # 현재 가시성 상태 확인
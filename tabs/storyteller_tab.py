@@ -75,6 +75,7 @@ class StorytellerTabModule(BaseTabModule):
     def get_tab_title(self) -> str: return "📖 Storyteller"
     def get_tab_order(self) -> int: return 5
     def get_tab_type(self) -> str: return 'core'
+    def should_defer_widget(self) -> bool: return True  # 첫 활성화 시 위젯 생성
     def create_widget(self, parent: QWidget) -> QWidget:
         if self.widget is None: self.widget = StorytellerTab(self.app_context, parent)
         return self.widget
@@ -24,6 +24,9 @@ class BrowserTabModule(BaseTabModule):
     def get_tab_order(self) -> int:
         return 2
 
+    def should_defer_widget(self) -> bool:
+        return True  # 첫 활성화 시 위젯 생성
+
     def create_widget(self, parent: QWidget) -> QWidget:
         if self.browser_widget is None:
             self.browser_widget = BrowserTab(parent)
@@ -80,31 +80,31 @@ class RightView(QWidget):
             tab_widget=self.tab_widget,
             parent=self
         )
+        # 탭 인스턴스는 지연 생성될 수 있으므로 생성 시점(tab_added)에 시그널 연결
+        self.tab_controller.tab_added.connect(self._on_tab_added)
         self.tab_controller.initialize_tabs()
-        
-        # ✅ ImageViewerModule 인스턴스를 컨트롤러로부터 가져와 시그널 연결
-        image_viewer_module = self.tab_controller.get_tab_instance('ImageViewerModule')
-        if image_viewer_module:
-            # ImageViewerModule의 시그널을 RightView의 시그널에 다시 연결
-            if hasattr(image_viewer_module, 'instant_generation_requested'):
-                image_viewer_module.instant_generation_requested.connect(self.instant_generation_requested)
-            if hasattr(image_viewer_module, 'load_prompt_to_main_ui'):
-                image_viewer_module.load_prompt_to_main_ui.connect(self.load_prompt_to_main_ui)
-            if hasattr(image_viewer_module.image_window_widget, 'send_to_inpaint_requested'):
-                image_viewer_module.image_window_widget.send_to_inpaint_requested.connect(self.send_to_inpaint_requested)
-        else:
+
+        if self.tab_controller.get_tab_instance('ImageViewerModule') is None:
             print("⚠️ ImageViewerModule 인스턴스를 찾을 수 없어 시그널 연결에 실패했습니다.")
 
+    def _on_tab_added(self, tab_id: str, instance):
+        """탭 인스턴스가 생성되면 RightView의 시그널에 연결합니다."""
+        # ✅ ImageViewerModule의 시그널을 RightView의 시그널에 다시 연결
+        if tab_id == 'ImageViewerModule':
+            if hasattr(instance, 'instant_generation_requested'):
+                instance.instant_generation_requested.connect(self.instant_generation_requested)
+            if hasattr(instance, 'load_prompt_to_main_ui'):
+                instance.load_prompt_to_main_ui.connect(self.load_prompt_to_main_ui)
+            if hasattr(instance.image_window_widget, 'send_to_inpaint_requested'):
+                instance.image_window_widget.send_to_inpaint_requested.connect(self.send_to_inpaint_requested)
+
         # Browser Tab
-        browser_module = self.tab_controller.get_tab_instance('BrowserTabModule')
-        if browser_module:
-            if hasattr(browser_module, 'instant_generation_requested'):
-                browser_module.instant_generation_requested.connect(self.instant_generation_requested)
+        elif tab_id == 'BrowserTabModule':
+            if hasattr(instance, 'instant_generation_requested'):
+                instance.instant_generation_requested.connect(self.instant_generation_requested)
                 print("✅ BrowserTabModule의 instant_generation_requested 시그널이 연결되었습니다.")
-            if hasattr(browser_module, 'generate_with_image_requested'):
-                browser_module.generate_with_image_requested.connect(self.generate_with_image_requested)
-        else:
-            print("⚠️ BrowserTabModule 인스턴스를 찾을 수 없어 시그널 연결에 실패했습니다.")
+            if hasattr(instance, 'generate_with_image_requested'):
+                instance.generate_with_image_requested.connect(self.generate_with_image_requested)
 
 
     def init_ui(self):
@@ -126,6 +126,12 @@ class RightView(QWidget):
             self.detached_windows[tab_index].activateWindow()
             return
             
+        # 아직 생성되지 않은 지연 탭이라면 분리 전에 실제 위젯을 생성
+        for tab_id, index in self.tab_controller.tab_index_map.items():
+            if index == tab_index:
+                self.tab_controller.ensure_tab_widget(tab_id)
+                break
+
         widget = self.tab_widget.widget(tab_index)
         tab_title = self.tab_widget.tabText(tab_index)
         
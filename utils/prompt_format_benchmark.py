@@ -0,0 +1,111 @@
+# utils/prompt_format_benchmark.py
+"""
+최종 프롬프트 포맷팅 마이크로 벤치마크.
+
+    python -m utils.prompt_format_benchmark [컨텍스트 개수]
+
+단일 패스 포맷터 이전의 _step_final_format(아래 _legacy_final_format, 비교용 참조 구현)과
+core.prompt_formatter.format_final_prompt()를 같은 합성 컨텍스트로 실행하여
+결과 문자열과 갱신된 prefix/main 태그가 같은지 확인하고 처리 시간을 비교합니다.
+"""
+
+import gc
+import random
+import sys
+import time
+
+import pandas as pd
+
+from core.prompt_context import PromptContext
+from core.prompt_formatter import format_final_prompt
+
+def build_sample_contexts(count: int, seed: int = 0) -> list:
+    """인물 태그/변환 대상/중복/'#' 태그가 섞인 합성 컨텍스트"""
+    rng = random.Random(seed)
+    words = [f"tag{i}" for i in range(3000)]
+    specials = ['1girl', '2girls', '1boy', '1other', 'v', 'double v', 'tachi-e', ':|', '#section', 'multi\n\nline']
+    contexts = []
+    for _ in range(count):
+        context = PromptContext(source_row=pd.Series(dtype=object), settings={})
+        context.prefix_tags = rng.sample(words, 3) + ['masterpiece']
+        context.main_tags = rng.sample(words, 25) + rng.sample(specials, 4) + rng.sample(words[:50], 3)
+        rng.shuffle(context.main_tags)
+        context.postfix_tags = ['best quality', rng.choice(words), 'masterpiece']
+        context.global_append_tags = rng.sample(words[:100], 3)
+        contexts.append(context)
+    return contexts
+
+def _legacy_final_format(context: PromptContext) -> str:
+    """단일 패스 포맷터 도입 이전의 PromptProcessor._step_final_format (비교 기준용 참조 구현)"""
+    if context.global_append_tags:
+        context.main_tags.extend(context.global_append_tags)
+    person_sets = {
+        "boys": {"1boy", "2boys", "3boys", "4boys", "5boys", "6+boys"},
+        "girls": {"1girl", "2girls", "3girls", "4girls", "5girls", "6+girls"},
+        "others": {"1other", "2others", "3others", "4others", "5others", "6+others"}
+    }
+    all_person_tags = person_sets["boys"] | person_sets["girls"] | person_sets["others"]
+    person_tags_found = []
+    new_main_tags = []
+    for tag in context.main_tags:
+        if tag in all_person_tags:
+            person_tags_found.append(tag)
+        else:
+            new_main_tags.append(tag)
+    sorted_person_tags = sorted(person_tags_found, key=lambda tag:
+                                0 if tag in person_sets["boys"] else
+                                1 if tag in person_sets["girls"] else 2)
+    tag_conversion_map = {
+        'v': 'peace sign', 'double v': 'double peace', '|_|': 'bar eyes',
+        '\\||/': 'open \\m/', ':|': 'neutral face', ';|': 'neutral face',
+        'eyepatch bikini': 'square bikini', 'tachi-e': 'character image'
+    }
+    converted_main_tags = [tag_conversion_map.get(tag, tag) for tag in new_main_tags]
+    context.main_tags = converted_main_tags
+    context.prefix_tags = sorted_person_tags + context.prefix_tags
+    all_tags = context.get_all_tags()
+    seen = set()
+    final_tags = []
+    for tag in all_tags:
+        if '\n\n' in tag or tag not in seen:
+            final_tags.append(tag)
+            if '\n\n' not in tag:
+                seen.add(tag)
+    formatted_prompt = []
+    for tag in final_tags:
+        if tag.startswith('#'):
+            formatted_prompt.append(f"\n{tag.strip()}\n")
+        elif tag == "\n\n":
+            formatted_prompt.append("\n\n")
+        else:
+            formatted_prompt.append(tag)
+    return ', '.join(formatted_prompt)
+
+def _run(formatter, count: int, repeat: int = 5):
+    """새 컨텍스트로 repeat번 실행하여 가장 빠른 시간과 마지막 실행 결과를 반환 (포맷터가 컨텍스트를 수정하므로 매번 새로 생성)"""
+    best = float('inf')
+    for _ in range(repeat):
+        contexts = build_sample_contexts(count)
+        gc.collect()
+        start = time.perf_counter()
+        outputs = [formatter(context) for context in contexts]
+        best = min(best, time.perf_counter() - start)
+    return best, outputs, contexts
+
+def main(count: int = 10000):
+    legacy_time, legacy_out, legacy_contexts = _run(_legacy_final_format, count)
+    new_time, new_out, contexts = _run(format_final_prompt, count)
+
+    # 기존 구현은 prefix/main 끝에 구분자("\n\n")를 남기므로 제외하고 비교
+    same = legacy_out == new_out and all(
+        old.prefix_tags[:-1] == new.prefix_tags and old.main_tags[:-1] == new.main_tags
+        for old, new in zip(legacy_contexts, contexts)
+    )
+    print(f"결과 일치: {'✅' if same else '❌'}")
+    print(f"기존 포맷터     : {legacy_time * 1000:8.1f} ms ({count:,}개 컨텍스트, 5회 중 최소)")
+    print(f"단일 패스 포맷터: {new_time * 1000:8.1f} ms ({count:,}개 컨텍스트, 5회 중 최소)")
+    print(f"속도 향상: {legacy_time / new_time:.2f}x")
+    return same
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,163 @@
+# utils/wildcard_benchmark.py
+"""
+와일드카드 확장 마이크로 벤치마크.
+
+    python -m utils.wildcard_benchmark [반복 횟수]
+
+컴파일 이전의 문자열 파싱 방식(아래 _LegacyExpander, 비교용 참조 구현)과
+현재 WildcardProcessor(캐시된 AST 트리 순회)를 같은 시드의 컨텍스트로 실행하여
+결과가 같은지 확인하고 초당 확장 횟수를 비교합니다.
+마지막으로 expand_batch()로 10,000개 프롬프트를 한 번에 생성하는 시간을
+중첩 템플릿(프롬프트별 트리 순회)과 단순 템플릿(열 단위 NumPy 경로)으로 나눠 측정합니다.
+"""
+
+import random
+import re
+import sys
+import time
+from types import SimpleNamespace
+
+import pandas as pd
+
+from core.prompt_context import PromptContext
+from core.wildcard_processor import WildcardProcessor
+from core.wildcard_template import is_literal
+
+def build_sample_wildcards(size: int = 200) -> dict:
+    """벤치마크용 와일드카드 사전 (순차/종속/중첩/복합 구문 포함)"""
+    rng = random.Random(0)
+    words = [f"tag{i}" for i in range(2000)]
+    tree = {
+        'hair': [f"{rng.choice(words)} hair, *{rng.choice(words)}" for _ in range(size)],
+        'outfit': [f"{rng.choice(words)}, {rng.choice(words)}, <hair>" for _ in range(size)],
+        'place': [f"{rng.choice(words)} background" for _ in range(size)],
+        'pose': [f"<{rng.choice(words)}|{rng.choice(words)}|{rng.choice(words)}>" for _ in range(size)],
+        'season': ['spring', 'summer', 'autumn', 'winter'],
+        'weather': ['sunny', 'rain', 'snow'],
+    }
+    return tree
+
+SAMPLE_TAGS = [
+    '1girl', 'solo', '<hair>', '<outfit>', '<red|blue|green> eyes',
+    '<red|blue|green>', '__place__ at night', '<pose>', '<*season>', '<$season:weather>',
+    'masterpiece', 'best quality', 'from __place__ with __hair__',
+]
+
+# 중첩 와일드카드가 없는 템플릿 (expand_batch 열 단위 경로 측정용)
+FLAT_TAGS = ['1girl', 'solo', '<hair>', '<place>', '<red|blue|green>', '<*season>', 'masterpiece']
+
+def _new_context() -> PromptContext:
+    return PromptContext(source_row=pd.Series(dtype=object), settings={})
+
+class _LegacyExpander:
+    """컴파일 도입 이전의 _expand_recursive 동작 (비교 기준용 참조 구현)"""
+
+    def __init__(self, processor: WildcardProcessor):
+        self.processor = processor
+
+    def expand_tags(self, tag_list, context):
+        expanded_list = []
+        for tag in tag_list:
+            expanded_list.extend(self._expand_recursive(tag, context))
+        return expanded_list
+
+    def _expand_recursive(self, tag, context, depth=0):
+        if depth > 10: return [tag]
+        if tag.startswith('<') and tag.endswith('>'):
+            wildcard_name = tag[1:-1]
+            if '|' in wildcard_name:
+                options = wildcard_name.split('|')
+                chosen_option = options[self.processor.pick_index(len(options), context)].strip()
+                return self._expand_recursive(chosen_option, context, depth + 1)
+            line = self.processor._get_wildcard_line(wildcard_name, context)
+            if line is None: return [tag]
+            resolved_tags = self._expand_recursive(line, context, depth + 1)
+            final_tags_in_place = []
+            for resolved_tag in resolved_tags:
+                sub_tags = [t.strip() for t in resolved_tag.split(',')]
+                tags_to_keep = [t[1:] for t in sub_tags if t.startswith('*')]
+                tags_to_append = [t for t in sub_tags if not t.startswith('*')]
+                if tags_to_keep:
+                    final_tags_in_place.extend(tags_to_keep)
+                    context.global_append_tags.extend(tags_to_append)
+                elif tags_to_append:
+                    final_tags_in_place.append(tags_to_append[0])
+                    context.global_append_tags.extend(tags_to_append[1:])
+            return final_tags_in_place if final_tags_in_place else []
+        if '__' in tag:
+            parts = re.split(r'(__.*?__)', tag)
+            result_parts = []
+            for part in parts:
+                if not part:
+                    continue
+                if part.startswith('__') and part.endswith('__'):
+                    line = self.processor._get_wildcard_line(part[2:-2], context)
+                    if line is not None:
+                        all_tags = []
+                        for expanded_part in self._expand_recursive(line, context, depth + 1):
+                            all_tags.extend(t.strip() for t in expanded_part.split(','))
+                        result_parts.append(', '.join(all_tags))
+                    else:
+                        result_parts.append(part)
+                else:
+                    result_parts.append(part)
+            return [''.join(result_parts)]
+        return [tag]
+
+def _run(expander, iterations: int, seed: int = 1234):
+    context = _new_context()
+    WildcardProcessor.seed_context(context, seed)
+    outputs = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        outputs.append(expander.expand_tags(SAMPLE_TAGS, context))
+    elapsed = time.perf_counter() - start
+    return elapsed, outputs, context
+
+def main(iterations: int = 20000):
+    # 샘플 사전에는 가중치 라인이 없으므로 alias 테이블 없음
+    tree = build_sample_wildcards()
+    # WildcardManager처럼 로드 시점에 중첩 와일드카드가 없는 파일을 미리 판별
+    literal_files = {name: lines for name, lines in tree.items() if all(is_literal(line) for line in lines)}
+    manager = SimpleNamespace(wildcard_dict_tree=tree,
+                              get_alias_table=lambda name, lines: None,
+                              is_literal_file=lambda name, lines: literal_files.get(name) is lines)
+    processor = WildcardProcessor(manager)
+    legacy = _LegacyExpander(processor)
+
+    # 워밍업 (컴파일 캐시 채우기)
+    _run(processor, 100)
+
+    legacy_time, legacy_out, legacy_ctx = _run(legacy, iterations)
+    compiled_time, compiled_out, compiled_ctx = _run(processor, iterations)
+
+    same = (legacy_out == compiled_out and
+            legacy_ctx.global_append_tags == compiled_ctx.global_append_tags and
+            legacy_ctx.sequential_counters == compiled_ctx.sequential_counters)
+    print(f"결과 일치: {'✅' if same else '❌'}")
+    print(f"문자열 파싱 방식 : {iterations / legacy_time:10,.0f} 회/초 ({legacy_time:.3f}s)")
+    print(f"컴파일된 AST 방식: {iterations / compiled_time:10,.0f} 회/초 ({compiled_time:.3f}s)")
+    print(f"속도 향상: {legacy_time / compiled_time:.2f}x")
+
+    # 배치 API: 같은 템플릿으로 독립 프롬프트 10,000개를 한 번에 생성
+    batch_size = 10000
+    start = time.perf_counter()
+    batch = processor.expand_batch(SAMPLE_TAGS, batch_size, seed=42)
+    batch_time = time.perf_counter() - start
+    repeat = processor.expand_batch(SAMPLE_TAGS, batch_size, seed=42)
+    reproducible = [p.to_prompt() for p in batch] == [p.to_prompt() for p in repeat]
+    print(f"expand_batch({batch_size:,}): {batch_time * 1000:.1f} ms "
+          f"({batch_size / batch_time:,.0f} 프롬프트/초, 같은 시드 재현: {'✅' if reproducible else '❌'})")
+
+    # 중첩 와일드카드가 없는 템플릿은 열 단위(NumPy) 경로로 처리됨
+    start = time.perf_counter()
+    flat_batch = processor.expand_batch(FLAT_TAGS, batch_size, seed=42)
+    flat_time = time.perf_counter() - start
+    flat_repeat = processor.expand_batch(FLAT_TAGS, batch_size, seed=42)
+    flat_reproducible = [p.to_prompt() for p in flat_batch] == [p.to_prompt() for p in flat_repeat]
+    print(f"expand_batch({batch_size:,}, 단순 템플릿): {flat_time * 1000:.1f} ms "
+          f"({batch_size / flat_time:,.0f} 프롬프트/초, 같은 시드 재현: {'✅' if flat_reproducible else '❌'})")
+    return same and reproducible and flat_reproducible
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)